@@ -0,0 +1,138 @@
+// Dispense event log kept in an EEPROM ring.
+//
+// Include after rtc_clock.h. The sketch provides dispenseFood(portionMs);
+// call dispenseAndLog() instead of dispenseFood() so every run is recorded.
+//
+// Each record is 12 bytes (little-endian, as stored in EEPROM):
+//   uint32 seq        increasing sequence number, never reused
+//   uint32 timestamp  RTC time of the dispense, seconds since 1970
+//   uint8  trigger    0 = schedule, 1 = manual
+//   uint8  check      LOG_CHECK_SEED XOR the other 11 bytes, catches torn/blank slots
+//   uint16 amount     portion in milliseconds (auger / chute run time)
+// Record seq is stored in slot (seq % LOG_SLOTS), so the newest entry
+// overwrites the oldest and no separate head pointer has to be written.
+//
+// Command:
+//   LOGDUMP since=<seq>  -> [LOGDUMP] from=<seq> next=<seq>
+//                           [LOG] <24 hex digits>   (one per record)
+//                           [LOGEND] <count>
+
+#ifndef PAWFEEDER_DISPENSE_LOG_H
+#define PAWFEEDER_DISPENSE_LOG_H
+
+#include <EEPROM.h>
+#include <stddef.h>
+
+#ifndef LOG_BASE
+#define LOG_BASE 0
+#endif
+
+// Non-zero, so an erased (all-zero) slot does not pass the check.
+#define LOG_CHECK_SEED 0xA5
+
+#define LOG_TRIGGER_SCHEDULE 0
+#define LOG_TRIGGER_MANUAL   1
+
+struct DispenseRecord {
+  uint32_t seq;
+  uint32_t timestamp;
+  uint8_t trigger;
+  uint8_t check;
+  uint16_t amount;
+};
+
+#define LOG_SLOTS ((E2END + 1 - LOG_BASE) / sizeof(DispenseRecord))
+
+void dispenseFood(unsigned long portionMs);
+
+uint32_t logNextSeq = 0;
+
+uint8_t logChecksum(const DispenseRecord &rec) {
+  const uint8_t *bytes = (const uint8_t *)&rec;
+  uint8_t check = LOG_CHECK_SEED;
+  for (uint8_t i = 0; i < sizeof(DispenseRecord); i++) {
+    if (i != offsetof(DispenseRecord, check)) check ^= bytes[i];
+  }
+  return check;
+}
+
+bool logReadSlot(uint16_t slot, DispenseRecord &rec) {
+  EEPROM.get(LOG_BASE + slot * sizeof(DispenseRecord), rec);
+  return rec.seq != 0xFFFFFFFFUL && rec.check == logChecksum(rec);
+}
+
+// Find the newest record so numbering continues after a reset.
+void logInit() {
+  bool found = false;
+  uint32_t newest = 0;
+  DispenseRecord rec;
+  for (uint16_t slot = 0; slot < LOG_SLOTS; slot++) {
+    if (logReadSlot(slot, rec) && rec.seq % LOG_SLOTS == slot && (!found || rec.seq > newest)) {
+      newest = rec.seq;
+      found = true;
+    }
+  }
+  logNextSeq = found ? newest + 1 : 0;
+  Serial.print("[SYSTEM] Dispense log ready, next seq ");
+  Serial.println(logNextSeq);
+}
+
+void logDispense(uint8_t trigger, unsigned long amount) {
+  myRTC.updateTime();
+  DispenseRecord rec;
+  rec.seq = logNextSeq;
+  rec.timestamp = rtcEpoch();
+  rec.trigger = trigger;
+  rec.amount = amount > 65535UL ? 65535 : amount;
+  rec.check = logChecksum(rec);
+  EEPROM.put(LOG_BASE + (rec.seq % LOG_SLOTS) * sizeof(DispenseRecord), rec);
+  logNextSeq++;
+}
+
+// Run the sketch's dispense sequence and record the portion it ran.
+void dispenseAndLog(uint8_t trigger, unsigned long portionMs) {
+  if (portionMs == 0) portionMs = DEFAULT_PORTION_MS;
+  dispenseFood(portionMs);
+  logDispense(trigger, portionMs);
+}
+
+void printLogRecord(const DispenseRecord &rec) {
+  const uint8_t *bytes = (const uint8_t *)&rec;
+  Serial.print("[LOG] ");
+  for (uint8_t i = 0; i < sizeof(DispenseRecord); i++) {
+    if (bytes[i] < 0x10) Serial.print('0');
+    Serial.print(bytes[i], HEX);
+  }
+  Serial.println();
+}
+
+// Handle LOGDUMP. Returns true if the command was consumed.
+bool handleLogCommand(String incoming) {
+  if (!incoming.startsWith("LOGDUMP")) return false;
+
+  uint32_t since = 0;
+  int at = incoming.indexOf("since=");
+  if (at >= 0) since = (uint32_t)incoming.substring(at + 6).toInt();
+
+  uint32_t oldest = logNextSeq > LOG_SLOTS ? logNextSeq - LOG_SLOTS : 0;
+  uint32_t from = since > oldest ? since : oldest;
+
+  Serial.print("[LOGDUMP] from=");
+  Serial.print(from);
+  Serial.print(" next=");
+  Serial.println(logNextSeq);
+
+  uint16_t count = 0;
+  DispenseRecord rec;
+  for (uint32_t seq = from; seq < logNextSeq; seq++) {
+    if (logReadSlot(seq % LOG_SLOTS, rec) && rec.seq == seq) {
+      printLogRecord(rec);
+      count++;
+    }
+  }
+  Serial.print("[LOGEND] ");
+  Serial.println(count);
+  return true;
+}
+
+#endif
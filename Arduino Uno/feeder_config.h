@@ -0,0 +1,172 @@
+// Build configuration for pawfeeder.cpp.
+//
+// Pick one preset, or leave them all commented out and edit the defaults
+// below. Each preset takes its pins, motor port, servo angles and timings
+// from the sketch it replaces, so flashing it dispenses the same amount.
+// The dispense sequence is the shared one (open, wiggle, close, auger,
+// clear), so pauses between the steps can differ from the old sketch.
+
+#ifndef PAWFEEDER_FEEDER_CONFIG_H
+#define PAWFEEDER_FEEDER_CONFIG_H
+
+// #define PRESET_SERVO_ONLY     // old pawfeeder.cpp: servo on 10, RTC RST on 4, 5 s open
+// #define PRESET_DCMOTOR        // old dcmotor.cpp: servo on 11 at 150, auger on M3, 1.2 s
+// #define PRESET_MAY21          // old may21: servo on 11 at 90, auger on M1, 1.5 s
+// #define PRESET_DOUBLER        // old DOUBLER: servo on 11 at 150, auger on M1, 1.2 s
+// #define PRESET_UPDATED        // old updated.cpp: servo on 9 at 150, auger on M1 at speed 130
+
+#if defined(PRESET_SERVO_ONLY)
+  #define FEATURE_SERVO 1
+  #define FEATURE_AUGER 0
+  #define SERVO_PIN 10
+  #define RTC_RST_PIN 4
+  #define FEED_POSITION 90
+  #define SERVO_OPEN_MS 5000
+  #define WIGGLE_DEGREES 0
+  #define AUTO_AT_BOOT 1
+#elif defined(PRESET_DCMOTOR)
+  #define FEATURE_SERVO 1
+  #define FEATURE_AUGER 1
+  #define SERVO_PIN 11
+  #define AUGER_MOTOR_PORT 3
+  #define FEED_POSITION 150
+  #define SERVO_OPEN_MS 3000
+  #define WIGGLE_DEGREES 50
+  #define AUGER_SPEED 255
+  #define AUGER_RUN_MS 1200
+  #define AUGER_CLEAR_MS 1200
+  #define AUTO_AT_BOOT 0
+#elif defined(PRESET_MAY21)
+  #define FEATURE_SERVO 1
+  #define FEATURE_AUGER 1
+  #define SERVO_PIN 11
+  #define AUGER_MOTOR_PORT 1      // its "motor3" is AF_DCMotor(1), port M1
+  #define FEED_POSITION 90
+  #define SERVO_OPEN_MS 2000
+  #define WIGGLE_DEGREES 10
+  #define AUGER_SPEED 255
+  #define AUGER_RUN_MS 1500
+  #define AUGER_CLEAR_MS 500
+  #define AUTO_AT_BOOT 1          // it had no mode and always followed the schedule
+#elif defined(PRESET_DOUBLER)
+  #define FEATURE_SERVO 1
+  #define FEATURE_AUGER 1
+  #define SERVO_PIN 11
+  #define AUGER_MOTOR_PORT 1
+  #define FEED_POSITION 150
+  #define SERVO_OPEN_MS 2000
+  #define WIGGLE_DEGREES 50
+  #define AUGER_SPEED 255
+  #define AUGER_RUN_MS 1200
+  #define AUGER_CLEAR_MS 1200
+  #define AUTO_AT_BOOT 0
+#elif defined(PRESET_UPDATED)
+  #define FEATURE_SERVO 1
+  #define FEATURE_AUGER 1
+  #define SERVO_PIN 9
+  #define AUGER_MOTOR_PORT 1
+  #define FEED_POSITION 150
+  #define SERVO_OPEN_MS 3000
+  #define WIGGLE_DEGREES 50
+  #define AUGER_SPEED 130
+  #define AUGER_RUN_MS 500
+  #define AUGER_CLEAR_MS 500
+  #define AUGER_DISPENSE_DIR FORWARD  // it ran forward first, then back
+  #define AUGER_CLEAR_DIR BACKWARD
+  #define AUTO_AT_BOOT 0
+#endif
+
+// --- Features ---
+#ifndef FEATURE_SERVO
+#define FEATURE_SERVO 1           // gate servo that opens the food chute
+#endif
+#ifndef FEATURE_AUGER
+#define FEATURE_AUGER 1           // DC auger motor on the Adafruit Motor Shield
+#endif
+#ifndef FEATURE_LOW_POWER
+#define FEATURE_LOW_POWER 0       // sleep between events (battery-backed units)
+#endif
+
+// --- Pins and ports ---
+#ifndef SERVO_PIN
+#define SERVO_PIN 11
+#endif
+#ifndef AUGER_MOTOR_PORT
+#define AUGER_MOTOR_PORT 3        // M1..M4 on the motor shield
+#endif
+#ifndef RTC_CLK_PIN
+#define RTC_CLK_PIN 2
+#endif
+#ifndef RTC_DAT_PIN
+#define RTC_DAT_PIN 3
+#endif
+#ifndef RTC_RST_PIN
+#define RTC_RST_PIN 6
+#endif
+
+// --- Dispense timing ---
+#ifndef REST_POSITION
+#define REST_POSITION 0
+#endif
+#ifndef FEED_POSITION
+#define FEED_POSITION 90
+#endif
+#ifndef SERVO_OPEN_MS
+#define SERVO_OPEN_MS 2000        // how long the chute stays open
+#endif
+#ifndef WIGGLE_DEGREES
+#define WIGGLE_DEGREES 10         // shake around FEED_POSITION to free food; 0 = none
+#endif
+#ifndef AUGER_SPEED
+#define AUGER_SPEED 255
+#endif
+#ifndef AUGER_RUN_MS
+#define AUGER_RUN_MS 1500         // default auger run time per dispense
+#endif
+#ifndef AUGER_CLEAR_MS
+#define AUGER_CLEAR_MS 500        // short reverse spin to clear the auger
+#endif
+#ifndef AUGER_DISPENSE_DIR
+#define AUGER_DISPENSE_DIR BACKWARD
+#endif
+#ifndef AUGER_CLEAR_DIR
+#define AUGER_CLEAR_DIR FORWARD
+#endif
+
+// --- Mode ---
+// Whether a schedule runs before the host sends AUTO or a schedule.
+// The auger sketches started in manual mode; the schedule is in RAM and
+// every SCHEDULE command turns automatic mode on, so this only matters
+// for a schedule set before a MANUAL.
+#ifndef AUTO_AT_BOOT
+#define AUTO_AT_BOOT 1
+#endif
+
+// --- Low power ---
+#ifndef HOST_ACTIVE_MS
+#define HOST_ACTIVE_MS 60000      // stay out of power-down this long after serial input
+#endif
+
+// --- Limits ---
+#ifndef MAX_SCHEDULE
+#define MAX_SCHEDULE 10
+#endif
+#ifndef MIN_PORTION_MS
+#define MIN_PORTION_MS 100
+#endif
+#ifndef MAX_PORTION_MS
+#define MAX_PORTION_MS 20000      // one DISPENSE or scheduled portion, in ms
+#endif
+
+// Portion used by "D" and by schedule entries without @ms
+#if FEATURE_AUGER
+#define DEFAULT_PORTION_MS AUGER_RUN_MS
+#else
+#define DEFAULT_PORTION_MS SERVO_OPEN_MS
+#endif
+
+// --- Identification (reported by CAPS) ---
+#define FIRMWARE_VERSION "2.2.0"
+#define PROTOCOL_VERSIONS "1,2"  // 2: DISPENSE <ms> and SCHEDULE @ms portions
+
+#endif
@@ -1,142 +1,471 @@
+// PawFeeder firmware.
+//
+// One source for every feeder build: servo-only, servo + auger on any
+// motor shield port. Select the hardware in feeder_config.h.
+//
+// Serial commands (one per line):
+//   SCHEDULE:HH:MM:SS[@ms],...       replace the feeding schedule; the optional
+//                                    @ms sets that feed's portion (protocol 2)
+//   RESETSCH                         clear the feeding schedule
+//   D / FEED                         dispense the default portion now
+//   DISPENSE <ms>                    dispense a portion of <ms> now (protocol 2)
+//   AUTO / MANUAL                    enable / pause scheduled feeding
+//   GETTIME, SETTIME:...             see rtc_clock.h
+//   LOGDUMP since=<seq>              see dispense_log.h
+//   CAPS                             report version, features and limits
+//   POWER                            report sleep counters
+//   M<port>F / M<port>B / M<port>S   run the auger forward / back / stop
+
+#include "feeder_config.h"
+
+#if FEATURE_SERVO
 #include <Servo.h>
+#endif
+#if FEATURE_AUGER
+#include <AFMotor.h>
+#endif
 #include <virtuabotixRTC.h>
-
-
-#define SERVO_PIN 10
-
-
+#if FEATURE_LOW_POWER
+#include <avr/interrupt.h>
+#include <avr/sleep.h>
+#include <avr/wdt.h>
+#endif
+#include "sleep_plan.h"
+
+// Function declarations
+void tick();
+void pollSerial();
+void handleCommand();
+void printCapabilities();
+void printPowerStats();
+void rest();
+void dispenseFood(unsigned long portionMs);
+void parseSchedule(String timesStr);
+
+virtuabotixRTC myRTC(RTC_CLK_PIN, RTC_DAT_PIN, RTC_RST_PIN);
+#include "rtc_clock.h"            // GETTIME / SETTIME
+#include "dispense_log.h"         // LOGDUMP, EEPROM dispense ring
+
+#if FEATURE_SERVO
 Servo foodServo;
-virtuabotixRTC myRTC(2, 3, 4);  // CLK, DAT, RST
-
-
-String scheduleTimes[10];       // Store up to 10 feeding times
+#endif
+#if FEATURE_AUGER
+AF_DCMotor auger(AUGER_MOTOR_PORT);
+#endif
+
+// Feeding times as seconds since midnight, with their portion (0 = default)
+long scheduleTimes[MAX_SCHEDULE];
+unsigned int schedulePortions[MAX_SCHEDULE];
 int scheduleCount = 0;
-String lastActivatedTime = "";  // Track last activated time to prevent re-triggering
-
-
-int restPosition = 0;
-int feedPosition = 90;
-
+long lastCheckedTime = -1;      // Time of the last schedule check, seconds since midnight
+bool automaticMode = AUTO_AT_BOOT;
+
+// Serial commands are read without blocking, so the host gets an answer
+// within milliseconds instead of waiting for the next 1-second tick.
+String serialLine = "";
+unsigned long lastSerialByte = 0;
+bool serialSeen = false;
+#define SERIAL_IDLE_MS 50       // a command without newline (e.g. "D") ends after this
+
+unsigned long lastTick = 0;
+
+// Power-state counters, reported by POWER
+unsigned long idleSleeps = 0;
+unsigned long powerDowns = 0;
+unsigned long wdtWakes = 0;
+unsigned long serialWakes = 0;
+unsigned long asleepMs = 0;     // nominal watchdog time spent powered down
+volatile bool wokeBySerial = false;
 
 void setup() {
   Serial.begin(9600);
 
+#if FEATURE_AUGER
+  auger.setSpeed(AUGER_SPEED);
+  auger.run(RELEASE);
+#endif
 
+#if FEATURE_SERVO
   pinMode(SERVO_PIN, OUTPUT);
   digitalWrite(SERVO_PIN, LOW);
-
+  foodServo.attach(SERVO_PIN);
+  foodServo.write(REST_POSITION);
+#endif
 
   myRTC.updateTime();
   delay(1000);
 
+  // The RTC is set by the host with SETTIME (see rtc_clock.h).
+  logInit();
 
-  foodServo.attach(SERVO_PIN);
-  foodServo.write(restPosition);
-
+  Serial.print("[SYSTEM] Dog Feeder Initialized. Firmware ");
+  Serial.println(FIRMWARE_VERSION);
+  lastTick = millis();
+}
 
-  // OPTIONAL: Set RTC time ONCE, then comment out!
-  //myRTC.setDS1302Time(0, 5, 23, 7, 23, 3, 2025);  // sec, min, hour, DOW, day, month, year
+void loop() {
+  pollSerial();
 
+  if (millis() - lastTick >= 1000) {
+    lastTick += 1000;
+    tick();
+  }
 
-  Serial.println("[SYSTEM] Dog Feeder Initialized.");
+#if FEATURE_LOW_POWER
+  rest();
+#endif
 }
 
+bool hostActive() {
+  return serialSeen && millis() - lastSerialByte < HOST_ACTIVE_MS;
+}
 
-void loop() {
+// Once per second: read the RTC and run any scheduled feed that is due.
+void tick() {
   myRTC.updateTime();
 
-
   int hour = myRTC.hours;
   int minute = myRTC.minutes;
   int second = myRTC.seconds;
 
-
   if (hour < 0 || hour > 23 || minute > 59 || second > 59) {
-    Serial.println("[ERROR] Invalid RTC time detected.");
+    Serial.println("[ERROR] Invalid RTC time detected. Check RTC module and wiring.");
     return;
   }
 
+  // Low-power builds only report the time while the host is listening.
+  if (!FEATURE_LOW_POWER || hostActive()) {
+    char currentTime[9];
+    sprintf(currentTime, "%02d:%02d:%02d", hour, minute, second);
+    Serial.print("[RTC] Current Time: ");
+    Serial.println(currentTime);
+  }
 
-  char currentTime[9];
-  sprintf(currentTime, "%02d:%02d:%02d", hour, minute, second);
-  String currentTimeStr = String(currentTime);
-
-
-  Serial.print("[RTC] Time: ");
-  Serial.println(currentTimeStr);
-
+  // Check every time since the previous check, so feeds are not lost
+  // while a dispense blocks or the board sleeps (see sleep_plan.h).
+  long now = hour * 3600L + minute * 60L + second;
+  long previous = lastCheckedTime;
+  lastCheckedTime = now;
+  if (!automaticMode) return;
 
   for (int i = 0; i < scheduleCount; i++) {
-    if (scheduleTimes[i] == currentTimeStr && lastActivatedTime != currentTimeStr) {
-      Serial.println("[MATCH] Feeding time matched!");
-      dispenseFood();
-      lastActivatedTime = currentTimeStr;
-      break;
+    if (isDue(scheduleTimes[i], previous, now)) {
+      Serial.println("[MATCH] Scheduled feeding time matched!");
+      dispenseAndLog(LOG_TRIGGER_SCHEDULE, schedulePortions[i]);
+      // Dispensing blocks for several seconds; resync the tick.
+      lastTick = millis();
     }
   }
+}
 
+#if FEATURE_LOW_POWER
+ISR(WDT_vect) {
+  wdt_disable();
+}
 
-  if (Serial.available()) {
-    String incoming = Serial.readStringUntil('\n');
-    incoming.trim();
-
+ISR(PCINT2_vect) {
+  wokeBySerial = true;
+}
 
-    Serial.print("[SERIAL INPUT] ");
-    Serial.println(incoming);
+// Sleep in power-down until the watchdog fires or a byte starts arriving
+// on RX (pin change on D0). The byte that wakes us is lost, so the host
+// sends a newline first and waits briefly (see FeederLink.wake_delay).
+void powerDown(int prescaler) {
+  Serial.flush();
+
+  uint8_t bits = (prescaler & 7) | ((prescaler & 8) ? (1 << WDP3) : 0);
+  cli();
+  MCUSR &= ~(1 << WDRF);
+  WDTCSR = (1 << WDCE) | (1 << WDE);
+  WDTCSR = (1 << WDIE) | bits;
+  wokeBySerial = false;
+  PCMSK2 |= (1 << PCINT16);
+  PCIFR |= (1 << PCIF2);
+  PCICR |= (1 << PCIE2);
+  sei();
+
+  set_sleep_mode(SLEEP_MODE_PWR_DOWN);
+  sleep_enable();
+  sleep_cpu();
+  sleep_disable();
+
+  PCICR &= ~(1 << PCIE2);
+  wdt_disable();
+
+  powerDowns++;
+  if (wokeBySerial) {
+    serialWakes++;
+    serialSeen = true;
+    lastSerialByte = millis();
+  } else {
+    wdtWakes++;
+    asleepMs += wdtPeriodMs(prescaler);
+  }
+}
 
+// Called once per loop: idle until the next interrupt, or power down when
+// nothing is due for a while and the host is quiet.
+void rest() {
+  if (serialLine.length() || Serial.available()) return;
+
+  long until = automaticMode ? secondsUntilNext(scheduleTimes, scheduleCount, lastCheckedTime) : -1;
+  int prescaler = planPowerDown(until, hostActive());
+  if (prescaler < 0) {
+    set_sleep_mode(SLEEP_MODE_IDLE);
+    sleep_enable();
+    sleep_cpu();
+    sleep_disable();
+    idleSleeps++;
+    return;
+  }
 
-    if (incoming.startsWith("SCHEDULE:")) {
-      String timesStr = incoming.substring(9);
-      parseSchedule(timesStr);
-    } else if (incoming == "GETTIME") {
-      Serial.println(currentTimeStr);
-    } else if (incoming == "D" || incoming == "FEED") {
-      Serial.println("[MANUAL] Dispensing food now...");
-      dispenseFood();
+  powerDown(prescaler);
+  // millis() stood still while powered down; re-read the RTC right away.
+  tick();
+  lastTick = millis();
+}
+#endif
+
+void pollSerial() {
+  while (Serial.available()) {
+    char c = Serial.read();
+    lastSerialByte = millis();
+    serialSeen = true;
+    if (c == '\n' || c == '\r') {
+      if (serialLine.length()) handleCommand();
+    } else {
+      serialLine += c;
     }
   }
+  if (serialLine.length() && millis() - lastSerialByte >= SERIAL_IDLE_MS) {
+    handleCommand();
+  }
+}
 
+void handleCommand() {
+  String incoming = serialLine;
+  serialLine = "";
+  incoming.trim();
+
+  Serial.print("[SERIAL INPUT] Received: ");
+  Serial.println(incoming);
+
+  if (incoming.startsWith("SCHEDULE:")) {
+    parseSchedule(incoming.substring(9));
+    automaticMode = true;
+  } else if (incoming == "RESETSCH") {
+    scheduleCount = 0;
+    Serial.println("[SCHEDULE] Schedule cleared.");
+  } else if (handleClockCommand(incoming)) {
+    // GETTIME / SETTIME answered by rtc_clock.h
+  } else if (handleLogCommand(incoming)) {
+    // LOGDUMP answered by dispense_log.h
+  } else if (incoming == "CAPS") {
+    printCapabilities();
+  } else if (incoming == "POWER") {
+    printPowerStats();
+  } else if (incoming == "D" || incoming == "FEED") {
+    Serial.println("[MANUAL] Dispensing food now...");
+    dispenseAndLog(LOG_TRIGGER_MANUAL, 0);
+    lastTick = millis();
+  } else if (incoming.startsWith("DISPENSE ")) {
+    long portionMs = incoming.substring(9).toInt();
+    if (portionMs < MIN_PORTION_MS || portionMs > MAX_PORTION_MS) {
+      Serial.print("[ERROR] DISPENSE out of range: ");
+      Serial.println(incoming.substring(9));
+    } else {
+      Serial.print("[DISPENSE] start ");
+      Serial.println(portionMs);
+      dispenseAndLog(LOG_TRIGGER_MANUAL, portionMs);
+      Serial.print("[DISPENSE] done ");
+      Serial.println(portionMs);
+    }
+    lastTick = millis();
+  } else if (incoming == "AUTO") {
+    automaticMode = true;
+    Serial.println("[MODE] Automatic mode enabled.");
+  } else if (incoming == "MANUAL") {
+    automaticMode = false;
+    Serial.println("[MODE] Automatic mode disabled.");
+  }
+#if FEATURE_AUGER
+  else if (incoming == String("M") + AUGER_MOTOR_PORT + "F") {
+    auger.run(FORWARD);
+    Serial.println("[MOTOR] Auger forward.");
+  } else if (incoming == String("M") + AUGER_MOTOR_PORT + "B") {
+    auger.run(BACKWARD);
+    Serial.println("[MOTOR] Auger backward.");
+  } else if (incoming == String("M") + AUGER_MOTOR_PORT + "S") {
+    auger.run(RELEASE);
+    Serial.println("[MOTOR] Auger stopped.");
+  }
+#endif
+  else {
+    Serial.print("[ERROR] Unknown command: ");
+    Serial.println(incoming);
+  }
+}
 
-  delay(1000);
+// Rough length of one dispense sequence, so the host knows how long to wait.
+unsigned long dispenseDurationMs() {
+  unsigned long total = 0;
+#if FEATURE_SERVO
+  total += SERVO_OPEN_MS + (WIGGLE_DEGREES ? 750 : 0) + 1000;
+#endif
+#if FEATURE_AUGER
+  total += AUGER_RUN_MS + 1000 + AUGER_CLEAR_MS + 1000;
+#endif
+  return total;
 }
 
+// [CAPS] fw=<version> proto=<list> features=<list> max_sched=<n> ...
+void printCapabilities() {
+  Serial.print("[CAPS] fw=");
+  Serial.print(FIRMWARE_VERSION);
+  Serial.print(" proto=");
+  Serial.print(PROTOCOL_VERSIONS);
+  Serial.print(" features=rtc,settime,log,modes,portion,power");
+#if FEATURE_LOW_POWER
+  Serial.print(",lowpower");
+#endif
+#if FEATURE_SERVO
+  Serial.print(",servo");
+#endif
+#if FEATURE_AUGER
+  Serial.print(",auger");
+#endif
+  Serial.print(" max_sched=");
+  Serial.print(MAX_SCHEDULE);
+  Serial.print(" log_slots=");
+  Serial.print((unsigned int)LOG_SLOTS);
+  Serial.print(" dispense_ms=");
+  Serial.print(dispenseDurationMs());
+  Serial.print(" portion_ms=");
+  Serial.print(DEFAULT_PORTION_MS);
+  Serial.print(" min_portion_ms=");
+  Serial.print(MIN_PORTION_MS);
+  Serial.print(" max_portion_ms=");
+  Serial.print(MAX_PORTION_MS);
+#if FEATURE_SERVO
+  Serial.print(" servo_pin=");
+  Serial.print(SERVO_PIN);
+#endif
+#if FEATURE_AUGER
+  Serial.print(" motor_port=");
+  Serial.print(AUGER_MOTOR_PORT);
+#endif
+  Serial.println();
+}
 
-void dispenseFood() {
-  Serial.println("[ACTION] Moving servo to feed position...");
-  foodServo.write(feedPosition);
-  delay(5000);
-  foodServo.write(restPosition);
-  Serial.println("[ACTION] Dog Food dispensed.");
+// [POWER] mode=<on|off> idle=<n> pdown=<n> wdt_wakes=<n> serial_wakes=<n> asleep_ms=<n> awake_ms=<n>
+void printPowerStats() {
+  Serial.print("[POWER] mode=");
+  Serial.print(FEATURE_LOW_POWER ? "on" : "off");
+  Serial.print(" idle=");
+  Serial.print(idleSleeps);
+  Serial.print(" pdown=");
+  Serial.print(powerDowns);
+  Serial.print(" wdt_wakes=");
+  Serial.print(wdtWakes);
+  Serial.print(" serial_wakes=");
+  Serial.print(serialWakes);
+  Serial.print(" asleep_ms=");
+  Serial.print(asleepMs);
+  Serial.print(" awake_ms=");
+  Serial.println(millis());
 }
 
+// Run one dispense. The portion is the auger run time, or the chute open
+// time on servo-only builds; 0 uses DEFAULT_PORTION_MS.
+void dispenseFood(unsigned long portionMs) {
+  if (portionMs == 0) portionMs = DEFAULT_PORTION_MS;
+  Serial.println("[ACTION] Starting food dispensing sequence...");
+
+#if FEATURE_SERVO
+  Serial.println("[SERVO] Moving to feed position...");
+  foodServo.write(FEED_POSITION);
+#if FEATURE_AUGER
+  delay(SERVO_OPEN_MS);
+#else
+  delay(portionMs);
+#endif
+
+#if WIGGLE_DEGREES
+  // Quick wiggles to help dislodge food
+  foodServo.write(FEED_POSITION - WIGGLE_DEGREES);
+  delay(250);
+  foodServo.write(FEED_POSITION + WIGGLE_DEGREES);
+  delay(250);
+  foodServo.write(FEED_POSITION);
+  delay(250);
+#endif
+
+  Serial.println("[SERVO] Moving to rest position...");
+  foodServo.write(REST_POSITION);
+  delay(1000);
+#endif
+
+#if FEATURE_AUGER
+  Serial.println("[MOTOR] Running auger...");
+  auger.run(AUGER_DISPENSE_DIR);
+  delay(portionMs);
+  auger.run(RELEASE);
+  delay(1000);
+
+  // Brief reverse spin to clear the auger
+  auger.run(AUGER_CLEAR_DIR);
+  delay(AUGER_CLEAR_MS);
+  auger.run(RELEASE);
+  delay(1000);
+#endif
+
+  Serial.println("[ACTION] Food dispensing sequence complete.");
+}
 
 void parseSchedule(String timesStr) {
   scheduleCount = 0;
   int start = 0;
 
+  Serial.println("[SCHEDULE] Parsing new schedule...");
 
   while (start < timesStr.length()) {
     int commaIndex = timesStr.indexOf(',', start);
     if (commaIndex == -1) commaIndex = timesStr.length();
 
-
     String t = timesStr.substring(start, commaIndex);
     t.trim();
 
+    // Optional portion: "HH:MM:SS@ms"
+    long portionMs = 0;
+    int at = t.indexOf('@');
+    if (at >= 0) {
+      portionMs = t.substring(at + 1).toInt();
+      t = t.substring(0, at);
+      if (portionMs < MIN_PORTION_MS || portionMs > MAX_PORTION_MS) portionMs = 0;
+    }
 
-    if (t.length() == 8 && t.indexOf(':') == 2 && t.lastIndexOf(':') == 5) {
-      scheduleTimes[scheduleCount++] = t;
-      Serial.print("[DEBUG] Time added: ");
-      Serial.println(t);
+    if (t.length() == 8 && t.charAt(2) == ':' && t.charAt(5) == ':') {
+      scheduleTimes[scheduleCount] = t.substring(0, 2).toInt() * 3600L
+                                   + t.substring(3, 5).toInt() * 60L
+                                   + t.substring(6, 8).toInt();
+      schedulePortions[scheduleCount] = portionMs;
+      scheduleCount++;
+      Serial.print("[SCHEDULE] Added: ");
+      Serial.print(t);
+      Serial.print(" portion ");
+      Serial.println(portionMs ? portionMs : DEFAULT_PORTION_MS);
     } else {
-      Serial.print("[ERROR] Invalid time format: ");
+      Serial.print("[ERROR] Invalid time format detected, skipping: ");
       Serial.println(t);
     }
 
-
     start = commaIndex + 1;
-    if (scheduleCount >= 10) break;
+    if (scheduleCount >= MAX_SCHEDULE) {
+      Serial.print("[WARNING] Maximum schedule times reached: ");
+      Serial.println(MAX_SCHEDULE);
+      break;
+    }
   }
+  Serial.print("[SCHEDULE] Total schedules loaded: ");
+  Serial.println(scheduleCount);
 }
-
-
@@ -0,0 +1,95 @@
+// Shared DS1302 clock helpers for the feeder sketches.
+//
+// The sketch must define the RTC object before including this file:
+//   virtuabotixRTC myRTC(2, 3, 6);
+//   #include "rtc_clock.h"
+//
+// Commands handled here:
+//   GETTIME                                -> [GETTIME] YYYY-MM-DD HH:MM:SS
+//   SETTIME:YYYY-MM-DD HH:MM:SS,DOW        -> [SETTIME] OK YYYY-MM-DD HH:MM:SS
+// DOW is 1=Sunday ... 7=Saturday, as expected by setDS1302Time().
+
+#ifndef PAWFEEDER_RTC_CLOCK_H
+#define PAWFEEDER_RTC_CLOCK_H
+
+#include <virtuabotixRTC.h>
+
+extern virtuabotixRTC myRTC;
+
+// Print the current RTC date and time as "YYYY-MM-DD HH:MM:SS".
+void printRtcDateTime() {
+  char buf[20];
+  sprintf(buf, "%04d-%02d-%02d %02d:%02d:%02d",
+          myRTC.year, myRTC.month, myRTC.dayofmonth,
+          myRTC.hours, myRTC.minutes, myRTC.seconds);
+  Serial.println(buf);
+}
+
+// Seconds since 1970-01-01 00:00:00 for the last RTC reading.
+unsigned long rtcEpoch() {
+  long y = myRTC.year;
+  int m = myRTC.month;
+  int d = myRTC.dayofmonth;
+  y -= m <= 2;
+  long era = y / 400;
+  long yoe = y - era * 400;
+  long doy = (153L * (m + (m > 2 ? -3 : 9)) + 2) / 5 + d - 1;
+  long doe = yoe * 365 + yoe / 4 - yoe / 100 + doy;
+  long days = era * 146097L + doe - 719468L;
+  return (unsigned long)days * 86400UL
+       + (unsigned long)myRTC.hours * 3600UL
+       + (unsigned long)myRTC.minutes * 60UL
+       + (unsigned long)myRTC.seconds;
+}
+
+// Parse "YYYY-MM-DD HH:MM:SS,DOW" and write it to the DS1302.
+bool setRtcFromString(String value) {
+  value.trim();
+  if (value.length() != 21 || value.charAt(4) != '-' || value.charAt(7) != '-' ||
+      value.charAt(10) != ' ' || value.charAt(13) != ':' || value.charAt(16) != ':' ||
+      value.charAt(19) != ',') {
+    return false;
+  }
+
+  int year = value.substring(0, 4).toInt();
+  int month = value.substring(5, 7).toInt();
+  int day = value.substring(8, 10).toInt();
+  int hour = value.substring(11, 13).toInt();
+  int minute = value.substring(14, 16).toInt();
+  int second = value.substring(17, 19).toInt();
+  int dow = value.substring(20).toInt();
+
+  if (year < 2000 || month < 1 || month > 12 || day < 1 || day > 31 ||
+      hour > 23 || minute > 59 || second > 59 || dow < 1 || dow > 7) {
+    return false;
+  }
+
+  myRTC.setDS1302Time(second, minute, hour, dow, day, month, year);
+  return true;
+}
+
+// Handle GETTIME / SETTIME. Returns true if the command was consumed.
+bool handleClockCommand(String incoming) {
+  if (incoming == "GETTIME") {
+    // Read the RTC again so the reply reflects the moment the command was
+    // processed, not the start of the loop iteration.
+    myRTC.updateTime();
+    Serial.print("[GETTIME] ");
+    printRtcDateTime();
+    return true;
+  }
+  if (incoming.startsWith("SETTIME:")) {
+    if (setRtcFromString(incoming.substring(8))) {
+      myRTC.updateTime();
+      Serial.print("[SETTIME] OK ");
+      printRtcDateTime();
+    } else {
+      Serial.print("[ERROR] Invalid SETTIME value: ");
+      Serial.println(incoming.substring(8));
+    }
+    return true;
+  }
+  return false;
+}
+
+#endif
@@ -0,0 +1,148 @@
+// Host-native simulation of the low-power loop in pawfeeder.cpp.
+//
+// Runs the real planning code from sleep_plan.h against a simulated RTC,
+// a watchdog with per-board bias and per-sleep jitter, dispenses that block
+// for several seconds, and occasional serial wakes from the host. Checks
+// that every scheduled feed fires exactly once per day and reports how
+// late it fired and how much of the time was spent powered down.
+//
+// Build and run from this folder:
+//   g++ -std=c++11 -O2 -I.. sleep_sim.cpp -o sleep_sim && ./sleep_sim
+
+#include <cstdio>
+#include <cstdlib>
+#include <random>
+#include <vector>
+#include <algorithm>
+
+#include "sleep_plan.h"
+
+const int DAYS = 14;
+const int RUNS = 200;
+const int MAX_SCHEDULE = 10;
+const unsigned long DISPENSE_MS = 7250;     // default servo + auger sequence
+const unsigned long HOST_ACTIVE_MS = 60000;
+const double SERIAL_WAKES_PER_DAY = 20;
+const unsigned long MAX_LATENCY_MS = 1100;
+
+struct Stats {
+  long fired = 0, missed = 0, doubled = 0;
+  unsigned long maxLatencyMs = 0;
+  double latencySumMs = 0;
+  double asleepMs = 0, totalMs = 0;
+  long powerDowns = 0, serialWakes = 0;
+};
+
+void runOnce(std::mt19937 &rng, Stats &stats) {
+  std::uniform_real_distribution<double> unit(0.0, 1.0);
+
+  // Schedule: 1..MAX_SCHEDULE distinct times, at least a dispense apart.
+  std::vector<long> times;
+  int count = 1 + rng() % MAX_SCHEDULE;
+  while ((int)times.size() < count) {
+    long t = rng() % SECONDS_PER_DAY;
+    bool clash = false;
+    for (long other : times) {
+      long d = labs(other - t);
+      if (std::min(d, SECONDS_PER_DAY - d) < 60) clash = true;
+    }
+    if (!clash) times.push_back(t);
+  }
+
+  double wdtBias = (unit(rng) * 2 - 1) * 0.10;       // board-specific, +-10%
+  double trueMs = unit(rng) * 1000.0;                // real time since day 0
+  unsigned long millisNow = 0, lastTick = 0;
+  unsigned long lastSerial = 0;
+  bool everSerial = false;
+  long lastChecked = -1;
+  std::vector<std::vector<int>> firedOn(DAYS + 1, std::vector<int>(count, 0));
+
+  const double endMs = DAYS * SECONDS_PER_DAY * 1000.0;
+  double nextSerial = -1;
+  auto scheduleSerial = [&]() {
+    double mean = SECONDS_PER_DAY * 1000.0 / SERIAL_WAKES_PER_DAY;
+    nextSerial = trueMs + std::exponential_distribution<double>(1.0 / mean)(rng);
+  };
+  scheduleSerial();
+
+  auto tick = [&]() {
+    long day = (long)(trueMs / 1000.0) / SECONDS_PER_DAY;
+    long now = (long)(trueMs / 1000.0) % SECONDS_PER_DAY;
+    for (int i = 0; i < count; i++) {
+      if (!isDue(times[i], lastChecked, now)) continue;
+      long eventDay = times[i] <= now ? day : day - 1;
+      double eventMs = (eventDay * SECONDS_PER_DAY + times[i]) * 1000.0;
+      unsigned long latency = (unsigned long)(trueMs - eventMs);
+      if (eventDay >= 0 && eventDay < DAYS) {
+        firedOn[eventDay][i]++;
+        stats.maxLatencyMs = std::max(stats.maxLatencyMs, latency);
+        stats.latencySumMs += latency;
+      }
+      trueMs += DISPENSE_MS;
+      millisNow += DISPENSE_MS;
+      lastTick = millisNow;
+    }
+    lastChecked = now;
+  };
+
+  while (trueMs < endMs) {
+    if (nextSerial >= 0 && trueMs >= nextSerial) {
+      lastSerial = millisNow;
+      everSerial = true;
+      scheduleSerial();
+    }
+    if (millisNow - lastTick >= 1000) {
+      lastTick += 1000;
+      tick();
+      continue;
+    }
+
+    bool hostActive = everSerial && millisNow - lastSerial < HOST_ACTIVE_MS;
+    int prescaler = planPowerDown(secondsUntilNext(times.data(), count, lastChecked), hostActive);
+    if (prescaler < 0) {
+      // Idle: time and millis() advance together until the next tick.
+      unsigned long step = lastTick + 1000 - millisNow;
+      trueMs += step;
+      millisNow += step;
+      continue;
+    }
+
+    double jitter = (unit(rng) * 2 - 1) * 0.01;
+    double sleptMs = wdtPeriodMs(prescaler) * (1.0 + wdtBias + jitter);
+    stats.powerDowns++;
+    if (nextSerial >= 0 && trueMs + sleptMs > nextSerial) {
+      sleptMs = nextSerial - trueMs;           // woken by the RX pin change
+      stats.serialWakes++;
+    }
+    trueMs += sleptMs;                        // millis() stands still
+    stats.asleepMs += sleptMs;
+    tick();
+    lastTick = millisNow;
+  }
+  stats.totalMs += trueMs;
+
+  for (int day = 1; day < DAYS; day++) {      // day 0 may start mid-way
+    for (int i = 0; i < count; i++) {
+      if (firedOn[day][i] == 0) stats.missed++;
+      if (firedOn[day][i] > 1) stats.doubled++;
+      stats.fired += firedOn[day][i];
+    }
+  }
+}
+
+int main() {
+  std::mt19937 rng(20250521);
+  Stats stats;
+  for (int run = 0; run < RUNS; run++) runOnce(rng, stats);
+
+  printf("runs=%d days=%d feeds=%ld missed=%ld doubled=%ld\n",
+         RUNS, DAYS, stats.fired, stats.missed, stats.doubled);
+  printf("latency: mean=%.0f ms max=%lu ms (limit %lu ms)\n",
+         stats.fired ? stats.latencySumMs / stats.fired : 0.0, stats.maxLatencyMs, MAX_LATENCY_MS);
+  printf("power-down: %.1f%% of time, %ld sleeps, %ld serial wakes\n",
+         100.0 * stats.asleepMs / stats.totalMs, stats.powerDowns, stats.serialWakes);
+
+  bool ok = stats.missed == 0 && stats.doubled == 0 && stats.maxLatencyMs <= MAX_LATENCY_MS;
+  printf("%s\n", ok ? "PASS" : "FAIL");
+  return ok ? 0 : 1;
+}
@@ -0,0 +1,71 @@
+// Sleep planning for the low-power build.
+//
+// Plain C++ with no Arduino or AVR dependencies, so the same code runs in
+// the firmware and in the host-native simulation (sim/sleep_sim.cpp).
+// Times are seconds since midnight; -1 means "unknown" or "none".
+
+#ifndef PAWFEEDER_SLEEP_PLAN_H
+#define PAWFEEDER_SLEEP_PLAN_H
+
+#define SECONDS_PER_DAY 86400L
+
+// The watchdog oscillator is only accurate to about +-10%, so power-down
+// periods are planned against the slowest case and the RTC is read again
+// after every wake.
+#define WDT_TOLERANCE_PCT 15
+// Stop powering down this many seconds before an event and wait for it in
+// idle mode, where the 1-second tick is exact.
+#define WAKE_GUARD_S 2
+// Longest gap between two checks that still fires the events skipped in
+// between (e.g. during a dispense). Larger jumps are clock changes.
+#define MAX_CATCHUP_S 120
+
+// Seconds from now until the next scheduled time, or -1 if none.
+long secondsUntilNext(const long *times, int count, long now) {
+  if (now < 0 || count <= 0) return -1;
+  long best = -1;
+  for (int i = 0; i < count; i++) {
+    long wait = times[i] - now;
+    if (wait <= 0) wait += SECONDS_PER_DAY;
+    if (best < 0 || wait < best) best = wait;
+  }
+  return best;
+}
+
+// Whether an event at time t falls in (previous, now], allowing for
+// midnight. A first check (previous < 0) or a clock jump only fires an
+// exact match.
+bool isDue(long t, long previous, long now) {
+  if (previous < 0) return t == now;
+  long gap = now - previous;
+  if (gap < 0) gap += SECONDS_PER_DAY;
+  if (gap == 0) return false;
+  if (gap > MAX_CATCHUP_S) return t == now;
+  long since = t - previous;
+  if (since <= 0) since += SECONDS_PER_DAY;
+  return since <= gap;
+}
+
+// Nominal watchdog period for prescaler 0..9: 16 ms * 2^prescaler.
+unsigned long wdtPeriodMs(int prescaler) {
+  return 16UL << prescaler;
+}
+
+// Pick the watchdog prescaler for the next power-down, or -1 to stay in
+// idle mode (host talking to us, or the next event is too close).
+int planPowerDown(long secondsUntil, bool hostActive) {
+  if (hostActive) return -1;
+  unsigned long budgetMs;
+  if (secondsUntil < 0) {
+    budgetMs = wdtPeriodMs(9);
+  } else {
+    if (secondsUntil <= WAKE_GUARD_S) return -1;
+    budgetMs = (unsigned long)(secondsUntil - WAKE_GUARD_S) * 1000UL * 100UL / (100UL + WDT_TOLERANCE_PCT);
+  }
+  for (int prescaler = 9; prescaler >= 0; prescaler--) {
+    if (wdtPeriodMs(prescaler) <= budgetMs) return prescaler;
+  }
+  return -1;
+}
+
+#endif
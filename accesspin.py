@@ -1,18 +1,15 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, PhotoImage
-import pickle
-import os
-import random
-import smtplib
-import subprocess
-from email.message import EmailMessage
-from dotenv import load_dotenv
-import time
-import re
-import hashlib
+from tkinter import ttk, messagebox
+import threading
 
+from pawfeeder.assets import assets
+from pawfeeder.credentials import credentials
+from pawfeeder.state import state
+from pawfeeder.timers import timers
+from pawfeeder.uidispatch import UiDispatcher
 
-load_dotenv()
+# pawfeeder.otp and pawfeeder.mailer are imported by the registration and
+# recovery screens that use them, so a PIN login does not load them.
 
 try:
     from ctypes import windll
@@ -21,19 +18,8 @@ except ImportError:
     pass
 
 # Constants
-PIN_FILE = "pkl/pin_code.pkl"
-OTP_FILE = "pkl/otp.pkl"
-EMAIL_FILE = "pkl/email.pkl"
-TERMS_ACCEPTED_FILE = "pkl/terms_accepted.pkl"
-OTP_EXPIRY = 120  # 2 minutes
 RECOVERY_WAIT_TIME = 120 # 2 minutes
 
-EMAIL_ADDRESS = os.environ.get('EMAIL_ADDRESS')
-EMAIL_PASSWORD = os.environ.get('EMAIL_PASSWORD')
-
-if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
-    print("Error: EMAIL_ADDRESS and EMAIL_PASSWORD environment variables not set.")
-
 # UI Constants
 APP_WIDTH, APP_HEIGHT = 500, 600
 BACKGROUND_COLOR = "#F0F4F8"
@@ -48,83 +34,62 @@ SMALL_FONT = ("Segoe UI", 12)
 
 
 # --- Data Handling ---
-def load_data(filename):
-    if os.path.exists(filename):
-        with open(filename, "rb") as file:
-            return pickle.load(file)
-    return None
-
-def save_data(data, filename):
-    with open(filename, "wb") as file:
-        pickle.dump(data, file)
-
-def hash_pin(pin):
-    return hashlib.sha256(pin.encode()).hexdigest()
+# PIN, email and terms live in the shared state store (pkl/state.pkl),
+# which serves repeated reads from memory; the PIN as an scrypt hash
+# (pawfeeder.credentials), pending OTPs in pawfeeder.otp.
 
 
 # --- Email Sending ---
-def send_otp_email(to_email, otp):
-    if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
-        messagebox.showerror("Error", "Email configuration not found.")
-        return
-
+def send_otp_email(ui, to_email, otp, on_done):
+    """Queue the OTP mail; on_done(error) runs on the Tk thread once it is sent or given up."""
     subject = 'PawFeeder: OTP Verification'
     body = f'Your One-Time Password (OTP) is: {otp}\n\nThis OTP will expire in 2 minutes.'
-
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-
-        msg = EmailMessage()
-        msg['Subject'] = subject
-        msg['From'] = EMAIL_ADDRESS
-        msg['To'] = to_email
-        msg.set_content(body)
-
-        server.send_message(msg)
-        messagebox.showinfo("Success", "OTP sent to your email address.")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to send OTP email: {e}")
-    finally:
-        if 'server' in locals():
-            server.quit()
+    from pawfeeder.mailer import outbox
+    outbox.send(to_email, subject, body, on_done=lambda error: ui.post(on_done, error))
 
 
 # --- App Launcher ---
 def show_pin_verification():
-    """Launch the main application window."""
-    terms_accepted = load_data(TERMS_ACCEPTED_FILE)
-    if not terms_accepted:
-        try:
-            subprocess.Popen(["python", "terms.py"])
-            return False  # Prevent login if terms not accepted
-        except Exception as e:
-            print(f"Failed to start terms.py: {e}")
-            messagebox.showerror("Error", "Terms and conditions file not found.  Please ensure terms.py is in the same directory.")
-            return False
+    """Show the terms (until accepted) and the PIN screens in one window.
 
+    Returns True if the user logged in.
+    """
+    credentials.upgrade_plain()
     root = tk.Tk()
-    app = App(root)
+    apps = []
+    if state.get("terms_accepted"):
+        apps.append(App(root))
+    else:
+        from terms import TermsFrame  # terms imports App from here
+        TermsFrame(root, on_accept=lambda: apps.append(App(root)))
     root.mainloop()
-    return app.login_success
+    print("[ASSETS]", assets.report())
+    return bool(apps) and apps[0].login_success
 
 
 # --- App ---
 class App:
-    def __init__(self, master):
+    """Email, PIN and recovery screens inside ``master``.
+
+    With ``on_success`` the screens are removed after login and
+    ``on_success()`` is called, leaving the window to the caller;
+    without it the window is closed.
+    """
+
+    def __init__(self, master, on_success=None):
         self.master = master
+        self.on_success = on_success
         self.master.geometry(f"{APP_WIDTH}x{APP_HEIGHT}")
         self.master.title("PawFeeder: Access")
         self.master.configure(bg=BACKGROUND_COLOR)
         self.master.resizable(False, False)
         self.center_window()
+        # Mail results come back from the outbox's thread through here.
+        self.ui = UiDispatcher(self.master)
+        self.ui.start()
 
-        try:
-            img = tk.PhotoImage(file='icons/pawfeeder.png')
-            self.master.iconphoto(False, img)
-        except Exception as e:
-            print("Icon not found:", e)
+        assets.set_window_icon(self.master)
+        assets.preload(self.master)
 
         self.current_frame = None
         self.login_success = False
@@ -145,19 +110,23 @@ class App:
         self.current_frame.pack(expand=True, fill="both")
 
     def show_login_or_set_pin(self):
-        stored_email = load_data(EMAIL_FILE)
-        stored_pin = load_data(PIN_FILE)
+        stored_email = state.get("email")
         if stored_email is None:
             self.show_frame(RegisterEmailScreen)
-        elif stored_pin is None:
+        elif not credentials.is_set():
             self.show_frame(SetPinScreen)
         else:
             self.show_frame(LoginScreen)
 
     def login_successful(self):
         self.login_success = True
-        self.master.destroy()
-        subprocess.Popen(["python", "Pawfeeder.py"])
+        self.ui.stop()
+        if self.on_success is None:
+            self.master.destroy()
+            return
+        self.current_frame.destroy()
+        self.current_frame = None
+        self.on_success()
 
 
 # --- Base Frame ---
@@ -238,6 +207,7 @@ class RegisterEmailScreen(BaseFrame):
         self.verify_otp_button.pack_forget()
 
         self.resend_timer = None  # To store the timer ID
+        self.pending_key = None
 
     def register_email(self):
         email = self.email_entry.get()
@@ -245,54 +215,56 @@ class RegisterEmailScreen(BaseFrame):
             messagebox.showerror("Error", "Please enter your email address.")
             return
 
-        otp = "".join(str(random.randint(0, 9)) for _ in range(6))
-        expiry_time = time.time() + OTP_EXPIRY
-        save_data({"otp": otp, "expiry": expiry_time, "email": email}, OTP_FILE)
-        try:
-            send_otp_email(email, otp)
-            self.otp_label.pack(pady=5, ipadx=0, ipady=0, anchor=tk.W)
-            self.otp_entry.pack(fill="x", pady=5, anchor=tk.W)
-            self.verify_otp_button.pack(pady=10, anchor=tk.CENTER)
-            self.register_button.config(state="disabled", text="Resend OTP (2:00)")
-            self.start_resend_timer(RECOVERY_WAIT_TIME) # Start timer
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to send OTP. Please check your internet connection or try again later. Error: {e}")
+        from pawfeeder.otp import otps
+        otp = otps.issue(f"register:{email}", {"email": email})
+        self.pending_key = f"register:{email}"
+        self.register_button.config(state="disabled", text="Sending...")
+        send_otp_email(self.app.ui, email, otp, self.otp_sent)
+
+    def otp_sent(self, error):
+        if not self.winfo_exists():
+            return  # the user left this screen meanwhile
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to send OTP. Please check your internet connection or try again later. Error: {error}")
             self.enable_resend_button() #re-enable button
-
-    def verify_email(self):
-        entered_otp = self.otp_entry.get()
-        stored_otp_data = load_data(OTP_FILE)
-
-        if not stored_otp_data:
-            messagebox.showerror("Error", "No OTP found. Please register again.")
-            self.enable_resend_button()
             return
+        messagebox.showinfo("Success", "OTP sent to your email address.")
+        self.otp_label.pack(pady=5, ipadx=0, ipady=0, anchor=tk.W)
+        self.otp_entry.pack(fill="x", pady=5, anchor=tk.W)
+        self.verify_otp_button.pack(pady=10, anchor=tk.CENTER)
+        self.register_button.config(state="disabled", text="Resend OTP (2:00)")
+        self.start_resend_timer(RECOVERY_WAIT_TIME) # Start timer
 
-        if time.time() > stored_otp_data["expiry"]:
-            messagebox.showerror("Error", "OTP expired. Please register again.")
-            os.remove(OTP_FILE)
-            self.enable_resend_button()
-            return
+    def verify_email(self):
+        from pawfeeder.otp import otps, VALID, WRONG, EXPIRED, LOCKED
+        result, data = otps.verify(self.pending_key, self.otp_entry.get())
 
-        if entered_otp == stored_otp_data["otp"]:
-            save_data(stored_otp_data["email"], EMAIL_FILE)
+        if result == VALID:
+            state.set("email", data["email"])
             messagebox.showinfo("Success", "Email verified!")
             self.app.show_login_or_set_pin()
+        elif result == WRONG:
+            messagebox.showerror("Error", f"Incorrect OTP. {otps.attempts_left(self.pending_key)} attempt(s) left.")
         else:
-            messagebox.showerror("Error", "Incorrect OTP.")
+            if result == EXPIRED:
+                messagebox.showerror("Error", "OTP expired. Please register again.")
+            elif result == LOCKED:
+                messagebox.showerror("Error", "Too many incorrect attempts. Please request a new OTP.")
+            else:
+                messagebox.showerror("Error", "No OTP found. Please register again.")
+            self.enable_resend_button()
 
     def start_resend_timer(self, duration):
         self.remaining_time = duration
         self.update_resend_button_text()
-        self.resend_timer = self.master.after(1000, self.update_timer)
+        # Cancelled by enable_resend_button() or when this screen is destroyed.
+        self.resend_timer = timers.every(self, 1000, self.update_timer)
 
     def update_timer(self):
         self.remaining_time -= 1
         self.update_resend_button_text()
         if self.remaining_time <= 0:
             self.enable_resend_button()
-        else:
-            self.resend_timer = self.master.after(1000, self.update_timer)
 
     def update_resend_button_text(self):
         minutes = self.remaining_time // 60
@@ -301,13 +273,8 @@ class RegisterEmailScreen(BaseFrame):
 
     def enable_resend_button(self):
         self.register_button.config(state="normal", text="Resend OTP", command=self.register_email)
-        if self.resend_timer:
-            self.master.after_cancel(self.resend_timer)
-            self.resend_timer = None
-
-    def is_valid_email(email):
-        return re.match(r"[^@]+@[^@]+\.[^@]+", email)
-
+        timers.cancel(self.resend_timer)
+        self.resend_timer = None
 
 
 class SetPinScreen(BaseFrame):
@@ -328,8 +295,8 @@ class SetPinScreen(BaseFrame):
                                   highlightthickness=1, highlightbackground="#ccc", highlightcolor="#3AA6B9", justify='center', validate="key", validatecommand=vcmd)
         self.pin_entry.pack(side="left", fill="x", expand=True, pady=10, padx=10)
 
-        self.eye_icon = PhotoImage(file="icons/visibility_off.png")
-        self.eye_icon_open = PhotoImage(file="icons/visibility.png")
+        self.eye_icon = assets.image(self, "visibility_off")
+        self.eye_icon_open = assets.image(self, "visibility")
 
         self.eye_button = tk.Button(pin_frame, image=self.eye_icon, command=self.toggle_password, bd=0, bg="#F0F4F8", activebackground="#F0F4F8")
         self.eye_button.pack(side="right", padx=5)
@@ -350,7 +317,8 @@ class SetPinScreen(BaseFrame):
         self.ceye_button.pack(side="right", padx=5)
 
         # Save Button
-        self.create_button("Save PIN", self.save_new_pin).pack(pady=10, anchor=tk.CENTER)
+        self.save_button = self.create_button("Save PIN", self.save_new_pin)
+        self.save_button.pack(pady=10, anchor=tk.CENTER)
 
     def toggle_password(self):
         if self.pin_entry.cget("show") == "*":
@@ -369,6 +337,8 @@ class SetPinScreen(BaseFrame):
             self.ceye_button.config(image=self.eye_icon)
 
     def save_new_pin(self):
+        if self.save_button.cget("state") == "disabled":
+            return
         pin = self.pin_entry.get()
         confirm = self.confirm_entry.get()
 
@@ -379,7 +349,14 @@ class SetPinScreen(BaseFrame):
             messagebox.showerror("Mismatch", "PIN entries do not match.")
             return
 
-        save_data(pin, PIN_FILE)
+        # Calibrating and hashing takes about half a second; keep the window responsive.
+        self.save_button.config(state="disabled", text="Saving...")
+        threading.Thread(target=lambda: (credentials.set_pin(pin), self.app.ui.post(self.pin_saved)),
+                         daemon=True).start()
+
+    def pin_saved(self):
+        if not self.winfo_exists():
+            return
         messagebox.showinfo("Success", "PIN set successfully!")
         self.app.show_login_or_set_pin()
 
@@ -408,8 +385,8 @@ class LoginScreen(BaseFrame):
         self.pin_entry.bind('<Return>', lambda event: self.check_pin())  # Bind Enter key to login
         
         # Eye icon images for show/hide toggle
-        self.eye_icon = PhotoImage(file="icons/visibility_off.png")
-        self.eye_icon_open = PhotoImage(file="icons/visibility.png")
+        self.eye_icon = assets.image(self, "visibility_off")
+        self.eye_icon_open = assets.image(self, "visibility")
         
         # Eye toggle button to show/hide PIN
         self.eye_button = tk.Button(pin_frame, image=self.eye_icon, command=self.toggle_password, bd=0, 
@@ -442,9 +419,21 @@ class LoginScreen(BaseFrame):
         return new_value.isdigit() and len(new_value) <= 6
 
     def check_pin(self):
-        if load_data(PIN_FILE) == self.pin_entry.get():
+        # scrypt takes a noticeable moment; keep the window responsive.
+        if self.login_button.cget("state") == "disabled":
+            return
+        self.login_button.config(state="disabled", text="Checking...")
+        pin = self.pin_entry.get()
+        threading.Thread(target=lambda: self.app.ui.post(self.pin_checked, credentials.check(pin)),
+                         daemon=True).start()
+
+    def pin_checked(self, ok):
+        if not self.winfo_exists():
+            return
+        if ok:
             self.app.login_successful()
         else:
+            self.login_button.config(state="normal", text="Login")
             messagebox.showerror("Incorrect", "Wrong PIN.")
 
     def show_forgot_pin(self):
@@ -479,35 +468,40 @@ class ForgotPasswordScreen(BaseFrame):
 
     def send_verification_otp(self):
         email = self.email_entry.get()
-        stored_email = load_data(EMAIL_FILE)
+        stored_email = state.get("email")
         if email != stored_email:
             messagebox.showerror("Error", "Email does not match registered.")
             return
-        otp = "".join(str(random.randint(0, 9)) for _ in range(6))
-        save_data({"otp": otp, "expiry": time.time() + OTP_EXPIRY}, OTP_FILE)
-        try:
-            send_otp_email(email, otp)
-            self.otp_label.pack(pady=5, ipadx=0, ipady=0, anchor=tk.W)
-            self.otp_entry.pack(fill="x", pady=5, anchor=tk.W)
-            self.verify_otp_button.pack(pady=10)
-            self.send_otp_button.config(state="disabled", text="Resend OTP (2:00)")
-            self.start_resend_timer(RECOVERY_WAIT_TIME)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to send OTP. Please check your internet connection or try again later. Error: {e}")
+        from pawfeeder.otp import otps
+        otp = otps.issue(f"recover:{email}")
+        self.send_otp_button.config(state="disabled", text="Sending...")
+        send_otp_email(self.app.ui, email, otp, self.otp_sent)
+
+    def otp_sent(self, error):
+        if not self.winfo_exists():
+            return  # the user left this screen meanwhile
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to send OTP. Please check your internet connection or try again later. Error: {error}")
             self.enable_resend_button()  # Enable the button if sending fails
+            return
+        messagebox.showinfo("Success", "OTP sent to your email address.")
+        self.otp_label.pack(pady=5, ipadx=0, ipady=0, anchor=tk.W)
+        self.otp_entry.pack(fill="x", pady=5, anchor=tk.W)
+        self.verify_otp_button.pack(pady=10)
+        self.send_otp_button.config(state="disabled", text="Resend OTP (2:00)")
+        self.start_resend_timer(RECOVERY_WAIT_TIME)
 
     def start_resend_timer(self, duration):
         self.remaining_time = duration
         self.update_resend_button_text()
-        self.resend_timer = self.master.after(1000, self.update_timer)
+        # Cancelled by enable_resend_button() or when this screen is destroyed.
+        self.resend_timer = timers.every(self, 1000, self.update_timer)
 
     def update_timer(self):
         self.remaining_time -= 1
         self.update_resend_button_text()
         if self.remaining_time <= 0:
             self.enable_resend_button()
-        else:
-            self.resend_timer = self.master.after(1000, self.update_timer)
 
     def update_resend_button_text(self):
         minutes = self.remaining_time // 60
@@ -516,31 +510,27 @@ class ForgotPasswordScreen(BaseFrame):
 
     def enable_resend_button(self):
         self.send_otp_button.config(state="normal", text="Resend OTP", command=self.send_verification_otp)
-        if self.resend_timer:
-            self.master.after_cancel(self.resend_timer)
-            self.resend_timer = None
+        timers.cancel(self.resend_timer)
+        self.resend_timer = None
 
     def verify_otp(self):
-        entered_otp = self.otp_entry.get()
-        otp_data = load_data(OTP_FILE)
-        if not otp_data or "otp" not in otp_data or "expiry" not in otp_data:
-            messagebox.showerror("Error", "No OTP found or OTP expired.")
-            self.enable_resend_button()
-            return
-
-        stored_otp = otp_data["otp"]
-        expiry_time = otp_data["expiry"]
-
-        if time.time() > expiry_time:
-            messagebox.showerror("Error", "OTP has expired.")
-            self.enable_resend_button()
-            return
+        from pawfeeder.otp import otps, VALID, WRONG, EXPIRED, LOCKED
+        key = f"recover:{state.get('email')}"
+        result, _ = otps.verify(key, self.otp_entry.get())
 
-        if entered_otp == stored_otp:
+        if result == VALID:
             messagebox.showinfo("Success", "Email verified successfully!")
             self.app.show_frame(ResetPinScreen)
+        elif result == WRONG:
+            messagebox.showerror("Error", f"Invalid OTP. {otps.attempts_left(key)} attempt(s) left.")
         else:
-            messagebox.showerror("Error", "Invalid OTP.")
+            if result == EXPIRED:
+                messagebox.showerror("Error", "OTP has expired.")
+            elif result == LOCKED:
+                messagebox.showerror("Error", "Too many incorrect attempts. Please request a new OTP.")
+            else:
+                messagebox.showerror("Error", "No OTP found or OTP expired.")
+            self.enable_resend_button()
 
     def go_back(self):
         self.app.show_login_or_set_pin()
@@ -566,8 +556,8 @@ class ResetPinScreen(BaseFrame):
                                        justify='center', validate="key", validatecommand=vcmd)
         self.resetpin_entry.pack(side="left", fill="x", expand=True, pady=10, padx=10)
 
-        self.eye_icon = PhotoImage(file="icons/visibility_off.png")
-        self.eye_icon_open = PhotoImage(file="icons/visibility.png")
+        self.eye_icon = assets.image(self, "visibility_off")
+        self.eye_icon_open = assets.image(self, "visibility")
 
         self.eye_button = tk.Button(resetpin_frame, image=self.eye_icon, command=self.toggle_password,
                                     bd=0, bg="#F0F4F8", activebackground="#F0F4F8")
@@ -591,7 +581,8 @@ class ResetPinScreen(BaseFrame):
         self.ceye_button.pack(side="right", padx=5)
 
         # Reset Button
-        self.create_button("Reset PIN", self.reset_pin).pack(pady=20)
+        self.reset_button = self.create_button("Reset PIN", self.reset_pin)
+        self.reset_button.pack(pady=20)
 
     def toggle_password(self):
         if self.resetpin_entry.cget("show") == "*":
@@ -610,6 +601,8 @@ class ResetPinScreen(BaseFrame):
             self.ceye_button.config(image=self.eye_icon)
 
     def reset_pin(self):
+        if self.reset_button.cget("state") == "disabled":
+            return
         new = self.resetpin_entry.get()
         confirm = self.confirmr_entry.get()
 
@@ -620,11 +613,14 @@ class ResetPinScreen(BaseFrame):
             messagebox.showerror("Mismatch", "PINs do not match.")
             return
 
-        save_data(new, PIN_FILE)
-
-        if os.path.exists(OTP_FILE):
-            os.remove(OTP_FILE)
+        # Calibrating and hashing takes about half a second; keep the window responsive.
+        self.reset_button.config(state="disabled", text="Saving...")
+        threading.Thread(target=lambda: (credentials.set_pin(new), self.app.ui.post(self.pin_reset)),
+                         daemon=True).start()
 
+    def pin_reset(self):
+        if not self.winfo_exists():
+            return
         messagebox.showinfo("Success", "PIN reset successfully!")
         self.app.show_login_or_set_pin()
 
@@ -0,0 +1,5 @@
+"""Host side of PawFeeder.
+
+Importing the package loads nothing heavy: the Tk view lives in
+``pawfeeder.gui`` and pyserial is only imported when a link is opened.
+"""
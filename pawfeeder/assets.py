@@ -0,0 +1,75 @@
+import time
+import tkinter as tk
+
+from .profiler import profiler
+
+# Constants
+ICON_DIR = "icons"
+APP_ICON = "pawfeeder"
+FIRST_SCREEN_IMAGES = (APP_ICON, "visibility", "visibility_off")
+
+
+class AssetCache:
+    """PNG icons decoded once per process and kept alive.
+
+    Tk frees a PhotoImage as soon as Python drops the last reference, so
+    screens used to keep their own copies and decode them again every time
+    they were rebuilt. Images here live as long as the Tk root. A new root
+    (the old one was destroyed) starts an empty cache, since images belong
+    to the interpreter that created them.
+    """
+
+    def __init__(self, icon_dir=ICON_DIR):
+        self.icon_dir = icon_dir
+        self.images = {}
+        self.root = None
+        self.decoded = 0
+        self.hits = 0
+        self.decode_ms = 0.0
+
+    def image(self, master, name, factor=1):
+        """icons/<name>.png, subsampled by factor. Raises tk.TclError if missing."""
+        root = master._root()
+        if root is not self.root:
+            self.images = {}
+            self.root = root
+
+        key = (name, factor)
+        if key in self.images:
+            self.hits += 1
+            return self.images[key]
+
+        base = self.image(root, name) if factor != 1 else None
+        started = time.perf_counter()
+        with profiler.phase("image decode", name=name, factor=factor):
+            if base is None:
+                image = tk.PhotoImage(master=root, file=f"{self.icon_dir}/{name}.png")
+            else:
+                image = base.subsample(factor)
+        self.decode_ms += (time.perf_counter() - started) * 1000
+        self.decoded += 1
+        self.images[key] = image
+        return image
+
+    def preload(self, master, names=FIRST_SCREEN_IMAGES):
+        for name in names:
+            try:
+                self.image(master, name)
+            except tk.TclError as e:
+                print("[ASSETS] Cannot load", name, e)
+
+    def set_window_icon(self, window):
+        try:
+            window.iconphoto(False, self.image(window, APP_ICON))
+        except tk.TclError as e:
+            print("Icon not found:", e)
+
+    def report(self):
+        """Images loaded and an estimate of the time the reuses saved."""
+        average = self.decode_ms / self.decoded if self.decoded else 0.0
+        return (f"{self.decoded} image(s) loaded in {self.decode_ms:.1f} ms, {self.hits} reuse(s) "
+                f"saved about {self.hits * average:.1f} ms")
+
+
+# One cache per process
+assets = AssetCache()
@@ -0,0 +1,113 @@
+import re
+import time
+
+from .writebehind import store
+
+# Constants
+CALIBRATION_FILE = "pkl/calibration.pkl"
+GRAMS_PER_CUP = 100          # average dry kibble; adjust for the food in use
+CALIBRATION_RUNS_MS = (1000, 2000, 3000)
+DISPENSE_TIMEOUT = 30.0      # on top of the portion itself
+
+
+# --- Portion Parsing ---
+def parse_cups(text):
+    """Turn '1/2-1 cup' or '2-3 cups' into the middle of the range, in cups."""
+    values = []
+    for part in re.findall(r"\d+/\d+|\d+(?:\.\d+)?", text):
+        if "/" in part:
+            num, den = part.split("/")
+            values.append(int(num) / int(den))
+        else:
+            values.append(float(part))
+    if not values:
+        return None
+    return (min(values) + max(values)) / 2
+
+def portion_to_grams(text):
+    cups = parse_cups(text)
+    return None if cups is None else cups * GRAMS_PER_CUP
+
+
+# --- Calibration Model ---
+def fit_line(samples):
+    """Least-squares fit of grams = slope * ms + intercept.
+
+    The intercept absorbs the food that falls regardless of run time (or
+    the dead time before the auger bites). With one sample, or samples all
+    at the same run time, the line goes through the origin.
+    """
+    n = len(samples)
+    if n == 0:
+        return None
+    mean_ms = sum(ms for ms, _ in samples) / n
+    mean_g = sum(g for _, g in samples) / n
+    var = sum((ms - mean_ms) ** 2 for ms, _ in samples)
+    if var == 0:
+        total_ms = sum(ms for ms, _ in samples)
+        return {"slope": sum(g for _, g in samples) / total_ms, "intercept": 0.0, "r2": None}
+
+    slope = sum((ms - mean_ms) * (g - mean_g) for ms, g in samples) / var
+    intercept = mean_g - slope * mean_ms
+    ss_tot = sum((g - mean_g) ** 2 for _, g in samples)
+    ss_res = sum((g - (slope * ms + intercept)) ** 2 for ms, g in samples)
+    r2 = 1 - ss_res / ss_tot if ss_tot else 1.0
+    return {"slope": slope, "intercept": intercept, "r2": r2}
+
+def load_model(device_id):
+    return store.get(CALIBRATION_FILE, {}).get(device_id)
+
+def save_samples(device_id, samples):
+    """Fit and store the model for a device from (ms, grams) samples."""
+    model = fit_line(samples)
+    if model is None or model["slope"] <= 0:
+        return None
+    model.update({"samples": list(samples), "fitted_at": time.time()})
+    store.update(CALIBRATION_FILE, device_id, model)
+    return model
+
+def grams_to_ms(model, grams, caps=None):
+    """Run time that dispenses the given grams, clamped to the device limits."""
+    ms = (grams - model["intercept"]) / model["slope"]
+    caps = caps or {}
+    low = caps.get("min_portion_ms", 100)
+    high = caps.get("max_portion_ms", 20000)
+    return int(round(min(high, max(low, ms))))
+
+def ms_to_grams(model, ms):
+    return max(0.0, model["slope"] * ms + model["intercept"])
+
+
+# --- Device Commands ---
+def dispense_ms(link, ms):
+    """Run one DISPENSE and wait until the Arduino reports it finished."""
+    reply = link.request(f"DISPENSE {int(ms)}", ("[DISPENSE] done", "[ERROR]"), ms / 1000 + DISPENSE_TIMEOUT)
+    return reply is not None and reply[0].startswith("[DISPENSE] done")
+
+def dispense_grams(link, device_id, grams, caps=None):
+    """Dispense a weight using the device's calibration. False if uncalibrated."""
+    model = load_model(device_id)
+    if model is None:
+        return False
+    return dispense_ms(link, grams_to_ms(model, grams, caps))
+
+def run_calibration(link, device_id, weigh, runs_ms=CALIBRATION_RUNS_MS):
+    """Dispense a few test portions and fit the grams-per-ms model.
+
+    ``weigh(ms)`` is called after each run and returns the grams that came
+    out, or None to abort. Returns the fitted model, or None.
+    """
+    samples = []
+    for ms in runs_ms:
+        if not dispense_ms(link, ms):
+            print(f"[CALIBRATION] DISPENSE {ms} failed on {device_id}")
+            return None
+        grams = weigh(ms)
+        if grams is None:
+            return None
+        samples.append((ms, grams))
+    model = save_samples(device_id, samples)
+    if model:
+        print(f"[CALIBRATION] {device_id}: {model['slope'] * 1000:.1f} g/s, "
+              f"offset {model['intercept']:+.1f} g")
+    return model
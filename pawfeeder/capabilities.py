@@ -0,0 +1,90 @@
+import threading
+
+from .writebehind import store
+
+# Constants
+CAPS_FILE = "pkl/capabilities.pkl"
+CAPS_TIMEOUT = 2.0
+CAPS_RETRIES = 3        # unanswered CAPS before cached caps are dropped
+
+# What a sketch without CAPS support (before firmware 2.0.0) can do.
+LEGACY_CAPS = {
+    "firmware": None,
+    "protocols": [1],
+    "features": ["servo"],
+    "max_schedule": 10,
+    "dispense_ms": 5000,
+}
+
+
+def parse_caps(line):
+    """Parse '[CAPS] fw=2.0.0 proto=1 features=a,b max_sched=10 ...'."""
+    fields = dict(part.split("=", 1) for part in line.split()[1:] if "=" in part)
+    caps = dict(LEGACY_CAPS)
+    caps["firmware"] = fields.pop("fw", None)
+    if "proto" in fields:
+        caps["protocols"] = [int(v) for v in fields.pop("proto").split(",") if v]
+    if "features" in fields:
+        caps["features"] = [v for v in fields.pop("features").split(",") if v]
+    if "max_sched" in fields:
+        caps["max_schedule"] = int(fields.pop("max_sched"))
+    for key, value in fields.items():
+        caps[key] = int(value) if value.isdigit() else value
+    return caps
+
+
+def query_caps(link):
+    """Ask the device for its capabilities; None if it does not answer."""
+    reply = link.request("CAPS", "[CAPS]", CAPS_TIMEOUT)
+    if reply is None:
+        return None
+    return parse_caps(reply[0])
+
+
+def refresh_caps(link, device_id, attempts=1):
+    """Query the device and update the cache. Returns the fresh capabilities.
+
+    A device that does not answer any of ``attempts`` queries is taken
+    to be legacy firmware.
+    """
+    caps = None
+    for _ in range(attempts):
+        caps = query_caps(link)
+        if caps is not None:
+            break
+    if caps is None:
+        print(f"[CAPS] {device_id} did not answer CAPS; treating it as legacy firmware")
+        caps = dict(LEGACY_CAPS)
+    if store.get(CAPS_FILE, {}).get(device_id) != caps:
+        store.update(CAPS_FILE, device_id, caps)
+        print(f"[CAPS] {device_id}: firmware {caps['firmware'] or 'legacy'}, "
+              f"features {', '.join(caps['features'])}")
+    return caps
+
+
+def load_caps(link, device_id, on_update=None, revalidate=True):
+    """Return the capabilities of a device, using the cache when possible.
+
+    A cached entry is returned immediately and, with ``revalidate``,
+    checked again in the background (the firmware may have been
+    reflashed); ``on_update`` is called with the new capabilities if they
+    changed. Without a cache entry the device is queried synchronously.
+    """
+    cached = store.get(CAPS_FILE, {}).get(device_id)
+    if cached is None:
+        return refresh_caps(link, device_id)
+    if not revalidate:
+        return cached
+
+    def revalidate_in_background():
+        # One missed reply (a busy or sleeping device) is not a reflash.
+        caps = refresh_caps(link, device_id, attempts=CAPS_RETRIES)
+        if caps != cached and on_update:
+            on_update(caps)
+
+    threading.Thread(target=revalidate_in_background, daemon=True).start()
+    return cached
+
+
+def has_feature(caps, feature):
+    return feature in caps.get("features", [])
@@ -0,0 +1,193 @@
+"""Command line and daemon mode for a feeder, without Tk.
+
+    python -m pawfeeder [--port COM3] status
+    python -m pawfeeder schedule set 7:00AM 18:00 [--grams 40]
+    python -m pawfeeder schedule list | reset
+    python -m pawfeeder dispense [--grams 40]
+    python -m pawfeeder sync-time
+    python -m pawfeeder monitor
+    python -m pawfeeder --daemon
+"""
+import argparse
+import time
+
+from .capabilities import has_feature
+from .controller import FeederController, DEFAULT_PORT, DEFAULT_BAUDRATE, parse_time, load_schedules
+from .usage import ProcessUsage
+from .writebehind import store
+
+# Constants
+DAEMON_STATS_INTERVAL = 600
+DAEMON_LOG_SYNC_INTERVAL = 3600
+DAEMON_POLL_INTERVAL = 5       # seconds between checks that the feeder is still there
+
+
+def connect(args):
+    controller = FeederController(args.port, args.baudrate)
+    # One-shot commands get the port to themselves.
+    controller.connect(services=args.daemon)
+    return controller
+
+
+def cmd_status(controller, args):
+    caps = controller.caps
+    print(f"Device:        {controller.device_id}")
+    print(f"Firmware:      {caps['firmware'] or 'legacy'} (protocols {', '.join(map(str, caps['protocols']))})")
+    print(f"Features:      {', '.join(sorted(caps['features']))}")
+
+    reply = controller.link.request("GETTIME", "[GETTIME]")
+    print(f"Device time:   {reply[0].split(']', 1)[1].strip() if reply else 'no answer'}")
+
+    print(f"Schedule:      {', '.join(controller.schedule) or 'none'}")
+    history = controller.history()
+    if history:
+        last = history[-1]
+        print(f"Last dispense: {last['time']:%Y-%m-%d %H:%M:%S} ({last['trigger']}, {last['portion_ms']} ms)")
+
+    if has_feature(caps, "power"):
+        power = controller.power_stats()
+        if power:
+            print(f"Power:         {power['mode']}, asleep {power['asleep_ratio'] * 100:.1f}% of the time")
+    return 0
+
+
+def cmd_schedule(controller, args):
+    if args.action == "list":
+        entries = load_schedules().get(args.port, [])
+        for entry in entries:
+            print(entry)
+        if not entries:
+            print("No schedule saved for", args.port)
+        return 0
+
+    if args.action == "reset":
+        controller.reset_schedule()
+        return 0
+
+    times = [parse_time(t) for t in args.times]
+    if not times or None in times:
+        print("[ERROR] Give feeding times like 7:00AM, 18:00 or 18:00:00")
+        return 2
+    portion_ms = None
+    if args.grams is not None:
+        portion_ms = controller.portion_ms(args.grams)
+        if portion_ms is None:
+            print(f"[WARN] {controller.device_id} cannot dispense by weight; using its default portion")
+    controller.set_schedule(sorted(set(times)), portion_ms)
+    return 0
+
+
+def cmd_dispense(controller, args):
+    if args.grams is None:
+        time.sleep(controller.dispense())
+        return 0
+    if controller.dispense_grams(args.grams):
+        print(f"[DISPENSE] {args.grams:g} g dispensed")
+        return 0
+    print(f"[ERROR] {controller.device_id} cannot dispense by weight (calibrate it first)")
+    return 1
+
+
+def cmd_sync_time(controller, args):
+    return 0 if controller.sync_time() else 1
+
+
+def cmd_monitor(controller, args):
+    # The link prints every line it reads; just keep the process alive.
+    print(f"[MONITOR] Listening on {controller.device_id}, Ctrl+C to stop")
+    while True:
+        time.sleep(1)
+
+
+def run_daemon(controller, args):
+    """Keep the connection, clock sync and schedule alive until stopped."""
+    usage = ProcessUsage()
+    print(f"[DAEMON] Running on {controller.device_id}, Ctrl+C to stop")
+    next_stats = time.monotonic() + args.stats_interval
+    next_log_sync = time.monotonic() + DAEMON_LOG_SYNC_INTERVAL
+    while True:
+        time.sleep(max(0, min(next_stats, next_log_sync, time.monotonic() + DAEMON_POLL_INTERVAL)
+                          - time.monotonic()))
+        if not controller.connected:
+            # Exit non-zero so a service manager restarts us once it is back.
+            print(f"[DAEMON] {controller.device_id} went away; stopping")
+            return 1
+        now = time.monotonic()
+        if now >= next_log_sync:
+            if has_feature(controller.caps, "log"):
+                controller.sync_log()
+            next_log_sync = now + DAEMON_LOG_SYNC_INTERVAL
+        if now >= next_stats:
+            print("[DAEMON]", usage.report())
+            next_stats = now + args.stats_interval
+
+
+COMMANDS = {
+    "status": cmd_status,
+    "schedule": cmd_schedule,
+    "dispense": cmd_dispense,
+    "sync-time": cmd_sync_time,
+    "monitor": cmd_monitor,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pawfeeder", description="Control a PawFeeder without the GUI.")
+    parser.add_argument("--port", default=DEFAULT_PORT, help=f"serial port (default {DEFAULT_PORT})")
+    parser.add_argument("--baudrate", type=int, default=DEFAULT_BAUDRATE)
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay connected and keep the clock and dispense log in sync")
+    parser.add_argument("--stats-interval", type=float, default=DAEMON_STATS_INTERVAL,
+                        help="seconds between CPU/memory reports in daemon mode")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("status", help="show firmware, clock, schedule and last dispense")
+
+    schedule = commands.add_parser("schedule", help="set, list or reset the feeding schedule")
+    actions = schedule.add_subparsers(dest="action", required=True)
+    set_parser = actions.add_parser("set", help="replace the schedule")
+    set_parser.add_argument("times", nargs="+", help="feeding times, e.g. 7:00AM 18:00")
+    set_parser.add_argument("--grams", type=float, help="portion per feed (needs calibration)")
+    actions.add_parser("list", help="show the saved schedule")
+    actions.add_parser("reset", help="clear the schedule")
+
+    dispense = commands.add_parser("dispense", help="dispense one portion now")
+    dispense.add_argument("--grams", type=float, help="portion in grams (needs calibration)")
+
+    commands.add_parser("sync-time", help="set the feeder clock from this computer")
+    commands.add_parser("monitor", help="print everything the feeder sends")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.daemon and args.command is not None:
+        parser.error("--daemon cannot be combined with a command")
+    if not args.daemon and args.command is None:
+        parser.print_help()
+        return 2
+
+    # Listing the saved schedule does not need the feeder.
+    if args.command == "schedule" and args.action == "list":
+        return cmd_schedule(None, args)
+
+    try:
+        controller = connect(args)
+    except ConnectionError as e:
+        print("[ERROR]", e)
+        return 1
+    except ImportError as e:
+        if e.name != "serial":
+            raise
+        print("[ERROR] pyserial is not installed; install it with: pip install pyserial")
+        return 1
+    try:
+        if args.daemon:
+            return run_daemon(controller, args)
+        return COMMANDS[args.command](controller, args)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        controller.close()
+        store.flush(timeout=10)
@@ -0,0 +1,84 @@
+import time
+import tkinter as tk
+from collections import deque
+
+from .timers import timers
+
+# Constants
+TIME_FORMAT = "%I:%M:%S %p"
+DATE_FORMAT = "%A, %B %d, %Y"
+LATENESS_SAMPLES = 600
+
+
+class ClockService:
+    """The window's clock: one tick per wall-clock second for all pages.
+
+    Time and date are formatted once per tick into shared StringVars. Only
+    the labels of the visible page are bound to them, so hidden pages are
+    not redrawn. Each tick is scheduled for the next whole second rather
+    than 1000 ms after the last one, so the callback's own run time and
+    Tk's timer slack do not add up.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.time_var = tk.StringVar(root)
+        self.date_var = tk.StringVar(root)
+        self._labels = ()
+        self._timer = None
+        self._target = None
+        self._shown = None
+        self.lateness_ms = deque(maxlen=LATENESS_SAMPLES)
+        self.ticks = 0
+        self.skipped = 0
+
+    def start(self):
+        self._tick()
+
+    def stop(self):
+        timers.cancel(self._timer)
+        self._timer = None
+
+    def bind(self, time_label=None, date_label=None):
+        """Show the clock on these labels only; no arguments hides it."""
+        for label in self._labels:
+            label.config(textvariable="")
+        self._labels = tuple(label for label in (time_label, date_label) if label is not None)
+        if time_label is not None:
+            time_label.config(textvariable=self.time_var)
+        if date_label is not None:
+            date_label.config(textvariable=self.date_var)
+
+    def _tick(self):
+        now = time.time()
+        second = int(now)
+        if self._target is not None:
+            self.lateness_ms.append((now - self._target) * 1000)
+            if self._shown is not None and second - self._shown > 1:
+                self.skipped += second - self._shown - 1
+        self._shown = second
+        self.ticks += 1
+
+        local = time.localtime(now)
+        self.time_var.set(time.strftime(TIME_FORMAT, local))
+        date = time.strftime(DATE_FORMAT, local)
+        if date != self.date_var.get():
+            self.date_var.set(date)
+
+        # Next whole second; +1 ms so rounding never lands just before it.
+        self._target = second + 1
+        delay_ms = int((self._target - time.time()) * 1000) + 1
+        self._timer = timers.after(self.root, max(delay_ms, 1), self._tick)
+
+    def stats(self):
+        """How late ticks fired after the second boundary, and seconds skipped."""
+        samples = sorted(self.lateness_ms)
+        if not samples:
+            return None
+        return {
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "mean_ms": sum(samples) / len(samples),
+            "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+            "max_ms": samples[-1],
+        }
@@ -0,0 +1,287 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .calibration import load_model, portion_to_grams, grams_to_ms, run_calibration, dispense_ms
+from .capabilities import LEGACY_CAPS, load_caps, has_feature
+from .dispenselog import sync_dispense_log, load_history
+from .link import FeederLink
+from .power import WAKE_DELAY, query_power
+from .profiler import profiler
+from .rtcsync import RtcSyncScheduler, sync_device
+from .writebehind import store
+
+# Constants
+DEFAULT_PORT = "COM3"
+DEFAULT_BAUDRATE = 9600
+SCHEDULE_FILE = "pkl/schedules.pkl"
+
+# Connection states
+DISCONNECTED = "disconnected"
+CONNECTING = "connecting"
+CONNECTED = "connected"
+OFFLINE = "offline"         # the last connect attempt failed, or the device went away
+
+# Portion support, as reported by FeederController.portion_support()
+PORTION_OK = "ok"
+PORTION_FIXED = "fixed"                 # firmware cannot take portions
+PORTION_UNCALIBRATED = "uncalibrated"   # no grams-per-ms model yet
+
+
+# --- Convert to 24h Format for RTC Schedule ---
+def convert_to_24h_format(t):
+    t = t.strip().upper().replace(" ", "")
+    try:
+        dt = datetime.strptime(t, "%I:%M%p")
+        return dt.strftime("%H:%M:%S")
+    except ValueError:
+        print(f"[ERROR] Invalid time format: {t}")
+        return None
+
+
+def parse_time(t):
+    """Accept '7:00 PM', '19:00' or '19:00:00'; return 'HH:MM:SS' or None."""
+    if t.strip().upper().endswith(("AM", "PM")):
+        return convert_to_24h_format(t)
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.strptime(t.strip(), fmt).strftime("%H:%M:%S")
+        except ValueError:
+            pass
+    print(f"[ERROR] Invalid time format: {t}")
+    return None
+
+
+def load_schedules():
+    return store.get(SCHEDULE_FILE, {})
+
+
+class FeederController:
+    """Connection, schedule, dispensing and state for one feeder.
+
+    Has no UI: views call these methods and show the results. Creating a
+    controller does not touch the serial port; ``connect()`` does.
+    ``on_change(controller)`` is called, from any thread, whenever the
+    values in ``status()`` may have changed.
+    """
+
+    def __init__(self, port=DEFAULT_PORT, baudrate=DEFAULT_BAUDRATE, on_line=None, on_change=None):
+        self.link = FeederLink(port, baudrate, on_line, on_disconnect=self._disconnected)
+        self.caps = dict(LEGACY_CAPS)
+        self.state = DISCONNECTED
+        self.on_change = on_change
+        # Entries last sent, "HH:MM:SS" or "HH:MM:SS@ms". The Arduino keeps
+        # its schedule in RAM and resets when the port opens, so this is
+        # sent again on every connect.
+        self.schedule = load_schedules().get(self.device_id, [])
+        self.last_dispense = None   # host time of the last dispense we requested
+        self._rtc_sync = RtcSyncScheduler(self.link)
+        self._services = set()
+        self._run_services = True
+
+    @property
+    def device_id(self):
+        return self.link.device_id
+
+    @property
+    def connected(self):
+        return self.state == CONNECTED
+
+    @property
+    def max_schedule(self):
+        return self.caps["max_schedule"]
+
+    @property
+    def dispense_seconds(self):
+        """How long one default dispense sequence takes on this feeder."""
+        return self.caps["dispense_ms"] / 1000
+
+    # --- Connection ---
+    def connect(self, services=True):
+        """Open the serial port and start the services the firmware supports.
+
+        With ``services=False`` (one-shot commands) the clock sync, log
+        sync and background capability check are not started, so nothing
+        else talks to the port while the command runs.
+        Raises ConnectionError if the Arduino cannot be reached.
+        """
+        self._run_services = services
+        self._set_state(CONNECTING)
+        try:
+            self.link.open()
+        except ConnectionError:
+            self._set_state(OFFLINE)
+            raise
+        # Every line from the Arduino goes to on_line from the reader thread.
+        self.link.start()
+        self._set_state(CONNECTED)
+
+        with profiler.phase("GETTIME", port=self.device_id):
+            if self.link.request("GETTIME", "[GETTIME]") is None:
+                print("[WARN] Arduino did not answer GETTIME")
+
+        with profiler.phase("capabilities", port=self.device_id):
+            self.apply_capabilities(load_caps(self.link, self.device_id, on_update=self.apply_capabilities,
+                                              revalidate=services))
+
+        if self.schedule:
+            self.link.send("SCHEDULE:" + ",".join(self.schedule))
+            print(f"[INFO] Restored {len(self.schedule)} feeding times on {self.device_id}")
+
+    def close(self):
+        self._stop_services()
+        self.link.close()
+        self._set_state(DISCONNECTED)
+
+    def _disconnected(self, error):
+        # Called from the reader thread; the link has closed the port.
+        self._stop_services()
+        self._set_state(OFFLINE)
+
+    def _stop_services(self):
+        # Started again by apply_capabilities() on the next connect.
+        self._rtc_sync.stop()
+        self._services.clear()
+
+    def _set_state(self, state):
+        self.state = state
+        self._changed()
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change(self)
+
+    # --- Status ---
+    def next_feed(self, now=None):
+        """When the next scheduled feed is due, as a datetime, or None."""
+        now = now or datetime.now()
+        upcoming = []
+        for entry in self.schedule:
+            at = datetime.strptime(entry.split("@")[0], "%H:%M:%S").time()
+            when = datetime.combine(now.date(), at)
+            if when <= now:
+                when += timedelta(days=1)
+            upcoming.append(when)
+        return min(upcoming, default=None)
+
+    def last_dispense_time(self):
+        """Latest dispense we sent or the device logged, as a datetime, or None."""
+        times = [event["time"] for event in self.history()[-1:]]
+        if self.last_dispense is not None:
+            times.append(datetime.fromtimestamp(self.last_dispense))
+        return max(times, default=None)
+
+    def status(self):
+        return {
+            "device": self.device_id,
+            "state": self.state,
+            "next_feed": self.next_feed(),
+            "last_dispense": self.last_dispense_time(),
+        }
+
+    def apply_capabilities(self, caps):
+        """Adapt to what the connected firmware supports."""
+        self.caps = caps
+
+        # Low-power firmware needs a wake-up byte before each command.
+        self.link.wake_delay = WAKE_DELAY if has_feature(caps, "lowpower") else 0
+        if not self._run_services:
+            return
+
+        # Keep the Arduino clock in sync; the interval adapts to its measured drift.
+        if has_feature(caps, "settime") and "rtc_sync" not in self._services:
+            self._services.add("rtc_sync")
+            self._rtc_sync.start()
+
+        # Fetch the feeds the Arduino ran while no host was connected.
+        if has_feature(caps, "log") and "log_sync" not in self._services:
+            self._services.add("log_sync")
+            threading.Thread(target=self.sync_log, daemon=True).start()
+
+    # --- Schedule ---
+    def portion_support(self):
+        if not has_feature(self.caps, "portion") or 2 not in self.caps["protocols"]:
+            return PORTION_FIXED
+        if load_model(self.device_id) is None:
+            return PORTION_UNCALIBRATED
+        return PORTION_OK
+
+    def portion_ms(self, grams):
+        """Run time for a portion in grams, or None if it cannot be applied."""
+        if grams is None or self.portion_support() != PORTION_OK:
+            return None
+        return grams_to_ms(load_model(self.device_id), grams, self.caps)
+
+    def portion_ms_for_text(self, portion_text):
+        """Run time for a guide portion such as '1/2-1 cup', or None."""
+        return self.portion_ms(portion_to_grams(portion_text))
+
+    def set_schedule(self, times, portion_ms=None):
+        """Send feeding times ("HH:MM:SS") to the Arduino, one portion for all.
+
+        Times beyond the firmware's table size are dropped. Returns the
+        number of dropped times.
+        """
+        return self.set_schedule_entries([(t, portion_ms) for t in times])
+
+    def set_schedule_entries(self, entries):
+        """Send (time, portion_ms) pairs; a portion of None is the default."""
+        limit = self.max_schedule
+        dropped = max(0, len(entries) - limit)
+        if dropped:
+            print(f"[WARN] Arduino holds {limit} times; ignoring {dropped}.")
+        entries = [t + (f"@{ms}" if ms else "") for t, ms in entries[:limit]]
+
+        command = "SCHEDULE:" + ",".join(entries)
+        self.link.send(command)
+        print("[INFO] Sent to Arduino:", command)
+        self.save_schedule(entries)
+        return dropped
+
+    def reset_schedule(self):
+        self.link.send("RESETSCH")
+        print("[INFO] Sent 'RESETSCH' to Arduino")
+        self.save_schedule([])
+
+    def save_schedule(self, entries):
+        self.schedule = entries
+        store.update(SCHEDULE_FILE, self.device_id, entries)
+        self._changed()
+
+    # --- Dispensing ---
+    def dispense(self):
+        """Dispense the default portion. Returns the expected duration in seconds."""
+        self.link.send("D")
+        print("[MANUAL] Sent 'D' to Arduino")
+        self.last_dispense = time.time()
+        self._changed()
+        return self.dispense_seconds
+
+    def dispense_grams(self, grams):
+        """Dispense a weighed portion and wait for it. False if not possible."""
+        ms = self.portion_ms(grams)
+        if ms is None:
+            return False
+        self.last_dispense = time.time()
+        self._changed()
+        return dispense_ms(self.link, ms)
+
+    def calibrate(self, weigh):
+        """Run the calibration routine; see calibration.run_calibration()."""
+        return run_calibration(self.link, self.device_id, weigh)
+
+    # --- Device services ---
+    def sync_time(self):
+        return sync_device(self.link, self.device_id)
+
+    def sync_log(self):
+        events = sync_dispense_log(self.link, self.device_id)
+        if events:
+            self._changed()
+        return events
+
+    def power_stats(self):
+        return query_power(self.link)
+
+    def history(self):
+        return load_history(self.device_id)
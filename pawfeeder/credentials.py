@@ -0,0 +1,226 @@
+"""PIN hashing with scrypt, calibrated to this machine.
+
+    python -m pawfeeder.credentials [--target-ms 200] [--runs 10]
+
+calibrates and prints the chosen parameters and the verify latency,
+without touching the saved PIN.
+"""
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .state import state
+
+# Constants
+PIN_KEY = "pin_code"
+PARAMS_KEY = "pin_kdf"          # calibrated scrypt parameters for this machine
+TARGET_VERIFY_MS = 200          # how long one PIN check should take
+RECALIBRATE_AFTER = 90 * 86400  # seconds; hardware changes
+SCRYPT_R = 8
+SCRYPT_P = 1
+MIN_N = 2 ** 14                 # the floor, however slow the machine
+MAX_N = 2 ** 20
+SALT_BYTES = 16
+KEY_BYTES = 32
+CACHE_SIZE = 4
+TIMING_SAMPLES = 100
+
+
+class PinCredentials:
+    """The app PIN, stored as an scrypt hash in the state store.
+
+    The cost parameter N is calibrated at setup so one check takes about
+    TARGET_VERIFY_MS here, and again in the background after a login
+    once the calibration is RECALIBRATE_AFTER old. A login with a hash
+    made with a smaller N (or a PIN saved in plain text by older
+    versions) rehashes it with the current parameters in the background.
+    Successful checks are remembered for the session under a keyed digest
+    of the PIN, so the same PIN is not run through scrypt twice; failures
+    are never cached.
+    """
+
+    def __init__(self, key=PIN_KEY, target_ms=TARGET_VERIFY_MS):
+        self.key = key
+        self.target_ms = target_ms
+        self.checks = 0
+        self.cache_hits = 0
+        self.upgrades = 0
+        self.check_ms = deque(maxlen=TIMING_SAMPLES)
+        self._cache = OrderedDict()
+        self._cache_key = os.urandom(32)    # never leaves this process
+        self._lock = threading.Lock()
+
+    def is_set(self):
+        return state.get(self.key) is not None
+
+    def generation(self):
+        """When the PIN was last set; unchanged by rehashing. None for old PINs."""
+        record = state.get(self.key)
+        return record.get("set_at") if isinstance(record, dict) else None
+
+    def set_pin(self, pin):
+        """Hash and save a new PIN, recalibrating first. Slow; call off the Tk thread."""
+        params = self.calibrate()
+        record = hash_pin(pin, params)
+        record["set_at"] = time.time()
+        state.set(self.key, record)
+        with self._lock:
+            self._cache.clear()
+
+    def upgrade_plain(self):
+        """Hash a PIN saved in plain text by older versions, in the background."""
+        record = state.get(self.key)
+        if isinstance(record, str):
+            threading.Thread(target=self._upgrade, args=(record, record), daemon=True).start()
+
+    def check(self, pin):
+        """True if pin matches. Takes about TARGET_VERIFY_MS; call off the Tk thread."""
+        record = state.get(self.key)
+        if record is None:
+            return False
+        started = time.perf_counter()
+        self.checks += 1
+        tag = self._tag(record, pin)
+        with self._lock:
+            if tag in self._cache:
+                self._cache.move_to_end(tag)
+                self.cache_hits += 1
+                return True
+
+        ok = verify_pin(pin, record)
+        self.check_ms.append((time.perf_counter() - started) * 1000)
+        if ok:
+            self._remember(tag)
+            if self._outdated(record):
+                threading.Thread(target=self._upgrade, args=(pin, record), daemon=True).start()
+        return ok
+
+    def _tag(self, record, pin):
+        record_id = record if isinstance(record, str) else record["hash"]
+        return record_id, hmac.new(self._cache_key, pin.encode(), "sha256").digest()
+
+    def _remember(self, tag):
+        with self._lock:
+            self._cache[tag] = True
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _outdated(self, record):
+        params = state.get(PARAMS_KEY)
+        return (not isinstance(record, dict) or params is None or record["n"] < params["n"]
+                or time.time() - params["calibrated_at"] > RECALIBRATE_AFTER)
+
+    def _upgrade(self, pin, record):
+        params = state.get(PARAMS_KEY)
+        if params is None or time.time() - params["calibrated_at"] > RECALIBRATE_AFTER:
+            params = self.calibrate()
+        if isinstance(record, dict) and record["n"] >= params["n"]:
+            return
+        upgraded = hash_pin(pin, params)
+        upgraded["set_at"] = record.get("set_at") if isinstance(record, dict) else None
+        # Skip if the PIN was changed while hashing.
+        if state.get(self.key) is record:
+            state.set(self.key, upgraded)
+            self._remember(self._tag(upgraded, pin))
+            self.upgrades += 1
+            print(f"[PIN] Rehashed the PIN with scrypt N={params['n']}")
+
+    def calibrate(self):
+        """Pick N for TARGET_VERIFY_MS on this machine and save it."""
+        params = calibrate(self.target_ms)
+        state.set(PARAMS_KEY, params)
+        print(f"[PIN] Calibrated scrypt N={params['n']} ({params['verify_ms']:.0f} ms per check)")
+        return params
+
+    def stats(self):
+        samples = sorted(self.check_ms)
+        return {
+            "checks": self.checks,
+            "cache_hits": self.cache_hits,
+            "upgrades": self.upgrades,
+            "p50_ms": samples[int(0.50 * (len(samples) - 1))] if samples else None,
+            "max_ms": samples[-1] if samples else None,
+        }
+
+
+# --- Hashing ---
+def scrypt(pin, salt, n, r=SCRYPT_R, p=SCRYPT_P):
+    # scrypt needs about 128 * r * n bytes; the default limit is 32 MiB.
+    return hashlib.scrypt(pin.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * r * n + 2 ** 20, dklen=KEY_BYTES)
+
+
+def hash_pin(pin, params):
+    salt = os.urandom(SALT_BYTES)
+    return {"kdf": "scrypt", "n": params["n"], "r": params["r"], "p": params["p"],
+            "salt": salt, "hash": scrypt(pin, salt, params["n"], params["r"], params["p"])}
+
+
+def verify_pin(pin, record):
+    """Constant-time comparison against a hash record or a legacy plain PIN."""
+    if isinstance(record, str):
+        return hmac.compare_digest(record.encode(), pin.encode())
+    derived = scrypt(pin, record["salt"], record["n"], record["r"], record["p"])
+    return hmac.compare_digest(derived, record["hash"])
+
+
+def time_scrypt(n, runs=2):
+    """Fastest of runs scrypt calls with cost n, in ms."""
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        scrypt("000000", b"calibration-salt", n)
+        took = (time.perf_counter() - started) * 1000
+        best = took if best is None else min(best, took)
+    return best
+
+
+def calibrate(target_ms=TARGET_VERIFY_MS):
+    """scrypt parameters whose check takes close to, and not over, target_ms.
+
+    Time scales linearly with N, so one measurement at MIN_N gives the
+    power of two to use; that choice is timed again to report it.
+    """
+    n = MIN_N
+    took = time_scrypt(n)
+    while n < MAX_N and took * 2 <= target_ms:
+        n *= 2
+        took *= 2
+    return {"n": n, "r": SCRYPT_R, "p": SCRYPT_P, "verify_ms": time_scrypt(n, runs=1),
+            "calibrated_at": time.time()}
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m pawfeeder.credentials",
+                                     description="Calibrate scrypt and time PIN checks.")
+    parser.add_argument("--target-ms", type=float, default=TARGET_VERIFY_MS)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    params = calibrate(args.target_ms)
+    print(f"[PIN] Calibration took {(time.perf_counter() - started) * 1000:.0f} ms: "
+          f"N={params['n']} r={params['r']} p={params['p']}")
+
+    record = hash_pin("123456", params)
+    samples = []
+    for i in range(args.runs):
+        started = time.perf_counter()
+        verify_pin("123456" if i % 2 else "654321", record)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    print(f"[PIN] Verify over {args.runs} runs: p50 {samples[len(samples) // 2]:.0f} ms, "
+          f"max {samples[-1]:.0f} ms (target {args.target_ms:.0f} ms)")
+    return 0
+
+
+# One PIN per app
+credentials = PinCredentials()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+from .controller import DEFAULT_PORT
+from .writebehind import store
+
+# Constants
+DEVICES_FILE = "pkl/devices.pkl"
+
+
+def load_devices():
+    """Serial ports of the known feeders, in the order they were added."""
+    return store.get(DEVICES_FILE, [DEFAULT_PORT])
+
+
+def add_device(port):
+    devices = load_devices()
+    if port not in devices:
+        devices = devices + [port]
+        store.put(DEVICES_FILE, devices)
+    return devices
@@ -0,0 +1,109 @@
+import struct
+from datetime import datetime, timedelta
+
+from .writebehind import store
+
+# Constants
+HISTORY_FILE = "pkl/dispense_history.pkl"
+RECORD_FORMAT = "<IIBBH"   # seq, timestamp, trigger, check, amount (see dispense_log.h)
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+TRIGGERS = {0: "schedule", 1: "manual"}
+DUMP_TIMEOUT = 15.0
+EPOCH = datetime(1970, 1, 1)
+CHECK_SEED = 0xA5           # so an all-zero slot does not pass (LOG_CHECK_SEED)
+HISTORY_DAYS = 365          # older events are dropped from the host history
+MAX_EVENTS = 10000          # and never more than this many per device
+
+
+def parse_record(line):
+    """Decode one '[LOG] <hex>' line into an event dict, or None if corrupt."""
+    try:
+        raw = bytes.fromhex(line.split("]", 1)[1].strip())
+    except (IndexError, ValueError):
+        return None
+    if len(raw) != RECORD_SIZE:
+        return None
+
+    check = CHECK_SEED
+    for i, byte in enumerate(raw):
+        if i != 9:
+            check ^= byte
+    seq, timestamp, trigger, stored_check, amount = struct.unpack(RECORD_FORMAT, raw)
+    if check != stored_check:
+        return None
+
+    return {
+        "seq": seq,
+        # The RTC keeps local wall-clock time, so the timestamp is naive.
+        "time": EPOCH + timedelta(seconds=timestamp),
+        "trigger": TRIGGERS.get(trigger, str(trigger)),
+        "portion_ms": amount,
+    }
+
+
+def parse_header(line):
+    """Read 'from' and 'next' out of a '[LOGDUMP] from=<n> next=<n>' line."""
+    fields = dict(part.split("=", 1) for part in line.split()[1:] if "=" in part)
+    return int(fields.get("from", 0)), int(fields.get("next", 0))
+
+
+def dump_log(link, since):
+    """Ask the Arduino for every record from sequence number since on."""
+    lines = link.collect(f"LOGDUMP since={since}", ("[LOGDUMP]", "[LOG] "), "[LOGEND]", DUMP_TIMEOUT)
+    if not lines or not lines[0].startswith("[LOGDUMP]"):
+        return None
+    first, next_seq = parse_header(lines[0])
+    events = [event for event in map(parse_record, lines[1:-1]) if event]
+    return first, next_seq, events
+
+
+def sync_dispense_log(link, device_id):
+    """Pull new dispense records from the device into the host history.
+
+    Only records after the last synced sequence number are requested. If
+    the device reports a lower sequence than we have seen, its EEPROM was
+    cleared (or the board swapped), so the log is read again from zero.
+    """
+    entry = dict(store.get(HISTORY_FILE, {}).get(device_id, {"next_seq": 0, "events": [], "missed": 0}))
+
+    result = dump_log(link, entry["next_seq"])
+    if result is None:
+        print(f"[LOG SYNC] No LOGDUMP reply from {device_id}")
+        return None
+
+    first, next_seq, events = result
+    if next_seq < entry["next_seq"]:
+        print(f"[LOG SYNC] {device_id} log restarted at {next_seq}, reading it again")
+        entry["next_seq"] = 0
+        result = dump_log(link, 0)
+        if result is None:
+            return None
+        first, next_seq, events = result
+
+    if first > entry["next_seq"]:
+        # The ring wrapped while we were away; these records are gone.
+        entry["missed"] += first - entry["next_seq"]
+
+    new_events = [event for event in events if event["seq"] >= entry["next_seq"]]
+    entry["events"] = trim_history(entry["events"] + new_events)
+    entry["next_seq"] = next_seq
+    store.update(HISTORY_FILE, device_id, entry)
+
+    print(f"[LOG SYNC] {device_id}: {len(new_events)} new dispense event(s), next seq {next_seq}")
+    return new_events
+
+
+def trim_history(events):
+    """Keep the last HISTORY_DAYS (counted from the newest event) and MAX_EVENTS."""
+    if not events:
+        return events
+    cutoff = events[-1]["time"] - timedelta(days=HISTORY_DAYS)
+    start = max(len(events) - MAX_EVENTS, 0)
+    while start < len(events) and events[start]["time"] < cutoff:
+        start += 1
+    return events[start:]
+
+
+def load_history(device_id):
+    """Return the dispense events synced so far for a device."""
+    return store.get(HISTORY_FILE, {}).get(device_id, {}).get("events", [])
@@ -0,0 +1,69 @@
+"""Reduce long (x, y) series to what a chart can show.
+
+Both functions take parallel lists ``xs`` and ``ys`` with ``xs`` sorted
+and return the indices of the points to keep, in order.
+"""
+from bisect import bisect_left
+
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets: keep the shape of a line.
+
+    The first and last points are always kept. Each bucket in between
+    keeps the point that makes the largest triangle with the point kept
+    before it and the average of the next bucket.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    keep = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+
+        # Average of the next bucket (the last point for the final bucket)
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+
+    keep.append(n - 1)
+    return keep
+
+
+def min_max(xs, ys, buckets):
+    """Keep the lowest and highest point of each of ``buckets`` equal x spans.
+
+    Cheaper than LTTB and never hides a spike, which suits event plots.
+    """
+    n = len(xs)
+    if n <= buckets * 2 or buckets < 1:
+        return list(range(n))
+
+    x0 = xs[0]
+    width = (xs[-1] - x0) / buckets
+    keep = []
+    lo = 0
+    for b in range(1, buckets + 1):
+        hi = n if b == buckets else bisect_left(xs, x0 + b * width, lo)
+        if hi > lo:
+            part = ys[lo:hi]
+            low = lo + part.index(min(part))
+            high = lo + part.index(max(part))
+            keep.extend(sorted({low, high}))
+        lo = hi
+    return keep
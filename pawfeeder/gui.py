@@ -0,0 +1,491 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+import time
+import threading
+from collections import OrderedDict
+
+from .assets import assets, APP_ICON
+from .clock import ClockService
+from .controller import FeederController, CONNECTED, CONNECTING, OFFLINE, DISCONNECTED
+from .devices import load_devices, add_device
+from .guide import FeedingGuide, load_guide
+from .panel import DevicePanel
+from .slots import SlotModel
+from .timers import timers
+from .uidispatch import UiDispatcher
+from .usage import ProcessUsage
+from .writebehind import store
+
+
+# Main Style
+BACKGROUND_COLOR = "#134B70"
+BUTTON_COLOR = "#508C9B"
+WHITE = "#ffffff"
+TEXT_COLOR = "white"
+BUTTON_FONT = ("Arial", 12, "bold")
+HEADER_FONT = ("Arial", 20, "bold")
+SMALL_FONT = ("Arial", 12)
+TABLE_FONT = ("Arial", 10)
+
+# Feeders dashboard
+MAX_PANELS = 3              # feeder panels kept built; the least recently used go first
+STATUS_REFRESH_MS = 60000   # "next feed" moves on even when nothing else changes
+DEVICE_COLUMNS = ("Feeder", "Status", "Next Feed", "Last Dispense")
+DEVICE_WIDTHS = (160, 140, 190, 190)
+STATE_TEXT = {
+    CONNECTED: "Connected",
+    CONNECTING: "Connecting...",
+    OFFLINE: "Offline",
+    DISCONNECTED: "Disconnected",
+}
+
+
+class PawFeederApp:
+    """The PawFeeder window: welcome page, sidebar and feeders dashboard.
+
+    Each feeder's pages live in a DevicePanel built when the feeder is
+    first opened. At most MAX_PANELS are kept; older ones are destroyed
+    and rebuilt on demand.
+    """
+
+    def __init__(self, root, controllers, started=None):
+        self.root = root
+        # Worker threads update widgets only through the dispatcher.
+        self.ui = UiDispatcher(root)
+
+        root.geometry('1000x600')
+        root.title("PawFeeder: Automatic Dog Food Dispenser")
+        root.pack_propagate(False)
+        root.resizable(True, True)
+
+        assets.set_window_icon(root)
+
+        screen_width = root.winfo_screenwidth()
+        screen_height = root.winfo_screenheight()
+        width, height = 1000, 600
+        root.geometry(f"{width}x{height}+{(screen_width - width) // 2}+{(screen_height - height) // 2}")
+
+        # Main frame for the content area
+        self.main_frame = tk.Frame(root)
+        self.main_frame.pack(side=tk.RIGHT, fill="both", expand=True)
+
+        self.controllers = OrderedDict()
+        self.slot_models = {}           # kept when a panel is evicted
+        self.panels = OrderedDict()     # device id -> DevicePanel, most recently used last
+        self.current = None
+        self.guide = None
+        self._guide_rows = {}
+        self.styled = False
+
+        # Status changes come from worker threads; they are collected here
+        # and applied once per UI frame.
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._flush_posted = False
+
+        # Only the welcome page is built up front; the sidebar, dashboard
+        # and feeding pages are built the first time they are shown.
+        self.options_frame = None
+        self.dashboard_frame = None
+        self.device_table = None
+        self.clock = ClockService(root)
+        self.build_main_page()
+
+        for controller in controllers:
+            self.add_controller(controller)
+        if self.controllers:
+            self.current = next(iter(self.controllers))
+
+        self.ui.start()
+        self.clock.start()
+        timers.every(root, STATUS_REFRESH_MS, self.refresh_all_status)
+
+        if started is not None:
+            root.after_idle(self.report_first_paint, started)
+
+    def report_first_paint(self, started):
+        print(f"[UI] First paint {(time.perf_counter() - started) * 1000:.0f} ms after start")
+
+    def logo(self, factor):
+        """The app logo scaled down by factor."""
+        return assets.image(self.root, APP_ICON, factor)
+
+    # --- Shared by all panels ---
+    def feeding_guide(self):
+        if self.guide is None:
+            try:
+                self.guide = load_guide()
+            except (OSError, KeyError) as e:
+                print("[ERROR] Cannot load feeding guide:", e)
+                messagebox.showerror("Feeding Guide", "The feeding guide could not be loaded.")
+                self.guide = FeedingGuide([])
+        return self.guide
+
+    def guide_rows(self, fields):
+        """Guide rows reduced to the given fields, built once per field list."""
+        if fields not in self._guide_rows:
+            self._guide_rows[fields] = [tuple(row[f] for f in fields) for row in self.feeding_guide().rows]
+        return self._guide_rows[fields]
+
+    # --- Table Style ---
+    def configure_styles(self):
+        if self.styled:
+            return
+        self.styled = True
+        style = ttk.Style()
+        style.configure("Treeview.Heading",
+                        font=("Helvetica", 10, "bold"),
+                        background="#2A3A59",
+                        foreground="black",
+                        padding=10)
+
+        style.configure("Treeview",
+                        font=("Arial", 9),
+                        background="white",
+                        foreground="black",
+                        fieldbackground="white",
+                        rowheight=30)
+
+        style.map("Treeview",
+                  background=[("selected", "#508C9B"),
+                              ("!selected", "white")])
+
+    # --- Feeders ---
+    def add_controller(self, controller):
+        controller.on_change = self.status_changed
+        self.controllers[controller.device_id] = controller
+        if self.device_table is not None:
+            self.device_table.insert("", "end", iid=controller.device_id, values=self.status_row(controller))
+
+    def connect_device(self, controller):
+        """Connect in the background; the dashboard shows how it went."""
+        def run():
+            try:
+                controller.connect()
+            except ConnectionError as e:
+                print("[ERROR]", e)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def panel(self):
+        """The current feeder's panel, built on first use."""
+        device_id = self.current
+        if device_id in self.panels:
+            self.panels.move_to_end(device_id)
+            return self.panels[device_id]
+
+        slot_model = self.slot_models.setdefault(device_id, SlotModel())
+        panel = self.panels[device_id] = DevicePanel(self, self.controllers[device_id], slot_model)
+        while len(self.panels) > MAX_PANELS:
+            old_id, old_panel = self.panels.popitem(last=False)
+            old_panel.destroy()
+            print(f"[UI] Released the panel for {old_id}")
+        return panel
+
+    def select_device(self, device_id):
+        if device_id != self.current:
+            if self.current in self.panels:
+                self.panels[self.current].hide()
+            self.current = device_id
+            self.device_label.config(text=f"Feeder: {device_id}")
+        self.show_page(1)
+
+    def open_selected(self):
+        selection = self.device_table.selection()
+        if not selection:
+            messagebox.showinfo("Feeders", "Select a feeder first.")
+            return
+        self.select_device(selection[0])
+
+    def reconnect_selected(self):
+        selection = self.device_table.selection()
+        if not selection:
+            messagebox.showinfo("Feeders", "Select a feeder first.")
+            return
+        controller = self.controllers[selection[0]]
+        if controller.state not in (CONNECTED, CONNECTING):
+            self.connect_device(controller)
+
+    def add_feeder(self):
+        port = simpledialog.askstring("Add Feeder", "Serial port of the feeder (e.g. COM4):")
+        if not port or not port.strip():
+            return
+        port = port.strip()
+        if port in self.controllers:
+            messagebox.showinfo("Add Feeder", f"{port} is already on the list.")
+            return
+        add_device(port)
+        controller = FeederController(port)
+        self.add_controller(controller)
+        self.connect_device(controller)
+
+    # --- Feeder Status ---
+    def status_changed(self, controller):
+        """Called from any thread; the row is redrawn on the next UI frame."""
+        with self._dirty_lock:
+            self._dirty.add(controller.device_id)
+            if self._flush_posted:
+                return
+            self._flush_posted = True
+        self.ui.post(self.flush_status)
+
+    def flush_status(self):
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+            self._flush_posted = False
+        if self.device_table is None:
+            return
+        for device_id in dirty:
+            self.device_table.item(device_id, values=self.status_row(self.controllers[device_id]))
+
+    def refresh_all_status(self):
+        if self.device_table is not None:
+            for device_id, controller in self.controllers.items():
+                self.device_table.item(device_id, values=self.status_row(controller))
+
+    def status_row(self, controller):
+        status = controller.status()
+        next_feed, last = status["next_feed"], status["last_dispense"]
+        return (
+            status["device"],
+            STATE_TEXT[status["state"]],
+            next_feed.strftime("%a %I:%M %p") if next_feed else "-",
+            last.strftime("%b %d, %I:%M %p") if last else "-",
+        )
+
+    # --- Navigation ---
+    def start_feeding(self):
+        if self.options_frame is None:
+            self.build_sidebar()
+        self.main_page_frame.pack_forget()
+        self.options_frame.pack(side=tk.LEFT, fill="y", anchor="n")
+        self.options_frame.pack_propagate(False)
+        self.show_dashboard()
+
+    def show_dashboard(self):
+        if self.current in self.panels:
+            self.panels[self.current].hide()
+        if self.dashboard_frame is None:
+            self.build_dashboard()
+        self.dashboard_frame.pack(fill="both", expand=True)
+        self.clock.bind(*self.dashboard_clock)
+
+    def show_page(self, number):
+        """Show one feeding page of the current feeder."""
+        if self.current is None:
+            self.show_dashboard()
+            return
+        if self.dashboard_frame is not None:
+            self.dashboard_frame.pack_forget()
+        self.panel().show_page(number)
+
+    # Switch to page 1 (Automatic Feed)
+    def switch_to_page1(self):
+        self.show_page(1)
+
+    # Switch to page 2 (Custom Feed)
+    def switch_to_page2(self):
+        self.show_page(2)
+
+    # Switch to page 3 (Manual Feed)
+    def switch_to_page3(self):
+        self.show_page(3)
+
+    # Switch to page 4 (Feeding History)
+    def switch_to_page4(self):
+        self.show_page(4)
+
+    # Switch to back to main page
+    def switch_to_main(self):
+        if self.current in self.panels:
+            self.panels[self.current].hide()
+        if self.dashboard_frame is not None:
+            self.dashboard_frame.pack_forget()
+        self.options_frame.pack_forget()
+        self.main_page_frame.pack(fill="both", expand=True)
+        self.clock.bind()
+
+    def page_header(self, frame, title, subtitle):
+        """Clock, title and subtitle at the top of a page; returns the clock labels."""
+        tk.Label(frame, text=title, font=("Helvetica", 20), bg="white").place(x=30, y=90)
+        tk.Label(frame, text=subtitle, font=("Helvetica", 14), bg="white").place(x=30, y=125)
+
+        time_label = tk.Label(frame, font=("Arial", 20, "bold"), fg="black", anchor="nw", bg="white")
+        time_label.place(x=30, y=20)
+
+        date_label = tk.Label(frame, font=("Arial", 12), fg="black", anchor="nw", bg="white")
+        date_label.place(x=30, y=50)
+        return time_label, date_label
+
+    # --- Main Page Frame (Welcome page) ---
+    def build_main_page(self):
+        self.main_page_frame = tk.Frame(self.main_frame, bg=BACKGROUND_COLOR)
+        self.main_page_frame.pack(fill="both", expand=True)
+
+        # Logo frame
+        main_logo_frame = tk.Frame(self.main_page_frame, bg=BACKGROUND_COLOR)
+        main_logo_frame.pack(pady=10)
+        main_logo_frame.place(relx=0.5, rely=0.4, anchor="center")
+
+        # Logo image
+        main_logo_label = tk.Label(main_logo_frame, image=self.logo(2), bg=BACKGROUND_COLOR)
+        main_logo_label.pack(pady=20)
+
+        # Start Feeding Button
+        start_button = tk.Button(self.main_page_frame,
+                                 text="Start Feeding",
+                                 font=("Arial", 12, "bold"),
+                                 bg="#508C9B",
+                                 fg="white",
+                                 padx=15,
+                                 pady=5,
+                                 relief="flat",
+                                 activebackground="#508C9B",
+                                 activeforeground="white",
+                                 cursor="hand2",
+                                 command=self.start_feeding)
+        start_button.place(relx=0.5, rely=0.7, anchor="center")
+
+    # --- Side bar frame ---
+    def build_sidebar(self):
+        self.options_frame = tk.Frame(self.root, bg=BACKGROUND_COLOR, width=200, height=500)
+        self.options_frame.pack_propagate(False)
+
+        # Logo frame
+        logo_frame = tk.Frame(self.options_frame, bg=BACKGROUND_COLOR)
+        logo_frame.pack(padx=10, pady=10, side=tk.TOP, anchor="w")
+
+        # Logo image
+        logo_label = tk.Label(logo_frame, image=self.logo(3), bg=BACKGROUND_COLOR)
+        logo_label.pack(pady=(20, 5))
+
+        # The feeder the feeding pages control
+        self.device_label = tk.Label(logo_frame, text=f"Feeder: {self.current or '-'}", bg=BACKGROUND_COLOR,
+                                     fg=TEXT_COLOR, font=SMALL_FONT)
+        self.device_label.pack(anchor="w")
+
+        # Button frame
+        button_frame = tk.Frame(self.options_frame, bg=BACKGROUND_COLOR)
+        button_frame.pack(side=tk.TOP, fill="both", expand=True)
+
+        buttons = [
+            ("FEEDERS", self.show_dashboard),
+            ("AUTOMATIC FEED", self.switch_to_page1),
+            ("CUSTOM FEED", self.switch_to_page2),
+            ("MANUAL FEED", self.switch_to_page3),
+            ("HISTORY", self.switch_to_page4),
+        ]
+        for text, command in buttons:
+            tk.Button(
+                button_frame,
+                text=text,
+                bg=BACKGROUND_COLOR,
+                fg=WHITE,
+                font=BUTTON_FONT,
+                relief="flat",
+                bd=0,
+                padx=15,
+                pady=15,
+                activebackground=BUTTON_COLOR,
+                command=command
+            ).pack(pady=5, fill="x")
+
+        # Exit Feed Button
+        exit_feed_button = tk.Button(
+            button_frame,
+            text="Exit",
+            bg=BACKGROUND_COLOR,
+            fg=WHITE,
+            font=BUTTON_FONT,
+            relief="flat",
+            bd=0,
+            padx=15,
+            pady=15,
+            activebackground=BUTTON_COLOR,
+            command=self.switch_to_main
+        )
+        exit_feed_button.pack(side="bottom", fill="x")
+
+    # --- Feeders Dashboard ---
+    def build_dashboard(self):
+        frame = self.dashboard_frame = tk.Frame(self.main_frame, bg="white")
+        frame.pack_propagate(False)
+        self.dashboard_clock = self.page_header(frame, "Feeders", "Choose a feeder to control")
+
+        self.configure_styles()
+        self.device_table = ttk.Treeview(frame, columns=DEVICE_COLUMNS, show="headings", height=8,
+                                         selectmode="browse")
+        self.device_table.place(x=32, y=180)
+        for col, width in zip(DEVICE_COLUMNS, DEVICE_WIDTHS):
+            self.device_table.heading(col, text=col)
+            self.device_table.column(col, width=width, anchor="center")
+
+        for device_id, controller in self.controllers.items():
+            self.device_table.insert("", "end", iid=device_id, values=self.status_row(controller))
+        self.device_table.bind("<Double-1>", lambda event: self.open_selected())
+
+        button_frame = tk.Frame(frame, bg="white")
+        button_frame.place(relx=0.5, y=520, anchor="center")
+        for text, command, color in (("Open", self.open_selected, "#508C9B"),
+                                     ("Reconnect", self.reconnect_selected, "#508C9B"),
+                                     ("Add Feeder", self.add_feeder, "#4CAF50")):
+            tk.Button(
+                button_frame,
+                text=text,
+                font=("Arial", 10, "bold"),
+                bg=color,
+                fg="white",
+                relief="flat",
+                padx=15,
+                pady=5,
+                cursor="hand2",
+                command=command
+            ).pack(side="left", padx=10)
+
+
+def open_window(root, ports=None, started=None):
+    """Show the PawFeeder window in ``root`` and start connecting the feeders."""
+    controllers = [FeederController(port) for port in ports or load_devices()]
+    app = PawFeederApp(root, controllers, started)
+    for controller in controllers:
+        app.connect_device(controller)
+    return app
+
+
+def close_window(app, usage):
+    """Disconnect the feeders and print the session figures."""
+    app.ui.stop()   # wakes workers still waiting in ui.call()
+    for controller in app.controllers.values():
+        controller.close()
+    if not store.flush(timeout=10):
+        print("[UI] Some feeder data could not be saved; it is kept in the journal")
+    stats = store.stats()
+    print(f"[UI] Store: {stats['edits']} edit(s) saved in {stats['writes']} write(s)")
+    lag = app.ui.lag_stats()
+    if lag:
+        print(f"[UI] Event loop lag: mean {lag['mean_ms']:.1f} ms, p95 {lag['p95_ms']:.1f} ms, "
+              f"max {lag['max_ms']:.1f} ms over {lag['handled']} updates")
+    ticks = app.clock.stats()
+    if ticks:
+        print(f"[UI] Clock ticks after the second: mean {ticks['mean_ms']:.1f} ms, "
+              f"p95 {ticks['p95_ms']:.1f} ms, max {ticks['max_ms']:.1f} ms; "
+              f"{ticks['skipped']} of {ticks['ticks']} seconds skipped")
+    wheel = timers.stats()
+    if wheel["fired"]:
+        print(f"[UI] Timers: {wheel['live']} live, {wheel['fired']} fired, {wheel['cancelled']} cancelled; "
+              f"late by mean {wheel['mean_ms']:.1f} ms, p95 {wheel['p95_ms']:.1f} ms, max {wheel['max_ms']:.1f} ms")
+    # Same figures as the daemon's [DAEMON] lines, for comparison.
+    print("[UI] Process:", usage.report())
+    print("[UI] Assets:", assets.report())
+
+
+def main(ports=None):
+    """Run the window for the given serial ports (default: the saved feeders)."""
+    usage = ProcessUsage()
+    started = time.perf_counter()
+    root = tk.Tk()
+    app = open_window(root, ports, started)
+    try:
+        root.mainloop()
+    finally:
+        close_window(app, usage)
@@ -0,0 +1,58 @@
+import csv
+import time
+
+# Constants
+GUIDE_FILE = "data/feeding_guide.csv"
+FIELDS = ("breed", "type", "size", "age_size", "meals", "portion", "times")
+BREED, TYPE, SIZE, AGE_SIZE, MEALS, PORTION, TIMES = range(len(FIELDS))
+
+
+def load_guide(path=GUIDE_FILE):
+    """Read the feeding guide CSV (one row per breed and life stage)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [tuple(record[field] for field in FIELDS) for record in csv.DictReader(f)]
+    return FeedingGuide(rows)
+
+
+class FeedingGuide:
+    """Feeding-guide rows with incremental filtering.
+
+    ``filter()`` returns row indices. When the new search text extends the
+    previous one (the user kept typing) only the previous matches are
+    scanned again.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        # Lower-case text the search box matches against, one per row
+        self._search = [f"{row[BREED]} {row[TYPE]} {row[AGE_SIZE]}".lower() for row in rows]
+        self.types = sorted({row[TYPE] for row in rows})
+        self.sizes = list(dict.fromkeys(row[SIZE] for row in rows))
+        self._last = None
+        self.last_filter_ms = 0.0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def filter(self, text="", dog_type=None, size=None):
+        started = time.perf_counter()
+        text = text.strip().lower()
+        words = text.split()
+
+        last = self._last
+        if last and last[1:3] == (dog_type, size) and text.startswith(last[0]):
+            candidates = last[3]
+        else:
+            rows = self.rows
+            candidates = [i for i in range(len(rows))
+                          if (dog_type is None or rows[i][TYPE] == dog_type)
+                          and (size is None or rows[i][SIZE] == size)]
+
+        search = self._search
+        matches = candidates
+        for word in words:
+            matches = [i for i in matches if word in search[i]]
+
+        self._last = (text, dog_type, size, matches)
+        self.last_filter_ms = (time.perf_counter() - started) * 1000
+        return matches
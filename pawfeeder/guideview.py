@@ -0,0 +1,96 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(tk.Frame):
+    """A Treeview that only holds items for the visible rows.
+
+    The table owns ``height`` items and fills them with the rows at the
+    current scroll offset, so showing or scrolling through 50,000 rows
+    costs the same as showing eight. ``set_rows()`` takes the full row
+    list and ``set_view()`` the indices to show, in order.
+    """
+
+    def __init__(self, parent, columns, widths, height=8, on_select=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.height = height
+        self.on_select = on_select
+        self.rows = []
+        self.view = []
+        self.offset = 0
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height,
+                                 selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.tree.pack(side="left", fill="both")
+        self.scrollbar.pack(side="left", fill="y")
+
+        for col, width in zip(columns, widths):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor="center")
+
+        self.items = [self.tree.insert("", "end", values=()) for _ in range(height)]
+        self.attached = height
+
+        self.tree.bind("<<TreeviewSelect>>", self._selected)
+        self.tree.bind("<MouseWheel>", self._wheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.set_view(range(len(rows)))
+
+    def set_view(self, view):
+        self.view = view
+        self.offset = 0
+        self.refresh()
+
+    def refresh(self):
+        self.tree.selection_set(())
+        rows, view = self.rows, self.view
+        visible = min(self.height, len(view) - self.offset)
+        for i, item in enumerate(self.items):
+            if i < visible:
+                self.tree.item(item, values=rows[view[self.offset + i]])
+
+        # Items past the end of a short view are detached, not deleted.
+        if visible < self.attached:
+            self.tree.detach(*self.items[visible:self.attached])
+        elif visible > self.attached:
+            for item in self.items[self.attached:visible]:
+                self.tree.move(item, "", "end")
+        self.attached = visible
+
+        total = len(view)
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, rows):
+        offset = max(0, min(self.offset + rows, len(self.view) - self.height))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, what)."""
+        if args[0] == "moveto":
+            self.scroll(int(float(args[1]) * len(self.view)) - self.offset)
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def selected_row(self):
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return self.rows[self.view[self.offset + self.items.index(selection[0])]]
+
+    def _selected(self, event):
+        if self.on_select and self.tree.selection():
+            self.on_select(self.selected_row())
+
+    def _wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
@@ -0,0 +1,103 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from .calibration import ms_to_grams
+from .dispenselog import EPOCH
+from .downsample import lttb, min_max
+
+# Constants
+DAY = 86400
+WEEK = 7 * DAY
+MONDAY = 4 * DAY    # 1970-01-01 was a Thursday
+
+
+def to_seconds(when):
+    """Seconds since EPOCH for a naive local datetime, as the device logs it."""
+    return (when - EPOCH).total_seconds()
+
+
+def now_seconds():
+    """The current local time on the same scale as the event times."""
+    return to_seconds(datetime.now())
+
+
+def bucket_start(seconds, size):
+    """Start of the day (or Monday-based week) containing ``seconds``."""
+    offset = MONDAY if size == WEEK else 0
+    return (seconds - offset) // size * size + offset
+
+
+class DispenseHistory:
+    """Dispense events of one feeder, ready for range queries.
+
+    Times are kept sorted with a running total, so the events or the
+    daily/weekly totals of any time range cost a couple of bisects rather
+    than a scan of the whole history. Amounts are grams when the feeder is
+    calibrated and seconds of motor run time otherwise.
+    """
+
+    def __init__(self, events, model=None):
+        events = sorted(events, key=lambda event: event["time"])
+        self.unit = "g" if model else "s"
+        self.times = [to_seconds(event["time"]) for event in events]
+        if model:
+            self.amounts = [ms_to_grams(model, event["portion_ms"]) for event in events]
+        else:
+            self.amounts = [event["portion_ms"] / 1000 for event in events]
+
+        self._running = [0.0]
+        for amount in self.amounts:
+            self._running.append(self._running[-1] + amount)
+
+    def __len__(self):
+        return len(self.times)
+
+    def span(self):
+        """(first, last) event time in seconds, or None when empty."""
+        if not self.times:
+            return None
+        return self.times[0], self.times[-1]
+
+    def index_range(self, start, end):
+        return bisect_left(self.times, start), bisect_right(self.times, end)
+
+    def total(self, start, end):
+        lo, hi = self.index_range(start, end)
+        return self._running[hi] - self._running[lo], hi - lo
+
+    def events(self, start, end, max_points=None):
+        """(xs, ys) of the events in [start, end], reduced to about max_points.
+
+        Min/max bucketing keeps every unusually large or small portion
+        visible however far the chart is zoomed out.
+        """
+        lo, hi = self.index_range(start, end)
+        xs, ys = self.times[lo:hi], self.amounts[lo:hi]
+        if max_points and len(xs) > max_points:
+            keep = min_max(xs, ys, max_points // 2)
+            xs, ys = [xs[i] for i in keep], [ys[i] for i in keep]
+        return xs, ys
+
+    def totals(self, start, end, size=DAY, max_points=None):
+        """(xs, ys) of the total dispensed per day or week in [start, end].
+
+        Reduced with LTTB to about max_points when there are more buckets
+        than that, e.g. several years of daily totals.
+        """
+        xs, ys = [], []
+        if not self.times:
+            return xs, ys
+        first = bucket_start(max(start, self.times[0]), size)
+        last = min(end, self.times[-1])
+        lo = bisect_left(self.times, first)
+        t = first
+        while t <= last:
+            hi = bisect_left(self.times, t + size, lo)
+            xs.append(t)
+            ys.append(self._running[hi] - self._running[lo])
+            lo = hi
+            t += size
+        if max_points and len(xs) > max_points:
+            keep = lttb(xs, ys, max_points)
+            xs, ys = [xs[i] for i in keep], [ys[i] for i in keep]
+        return xs, ys
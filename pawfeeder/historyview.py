@@ -0,0 +1,158 @@
+import tkinter as tk
+import time
+from datetime import timedelta
+
+from .dispenselog import EPOCH
+from .history import DAY, WEEK
+
+# Chart modes
+DAILY = "daily"
+WEEKLY = "weekly"
+EVENTS = "events"
+
+# Plot margins (pixels) and limits
+MARGIN_LEFT = 55
+MARGIN_RIGHT = 15
+MARGIN_TOP = 15
+MARGIN_BOTTOM = 30
+MIN_RANGE = 3600            # zoom in no further than one hour
+REDRAW_BUDGET_MS = 50
+BAR_COLOR = "#508C9B"
+LINE_COLOR = "#134B70"
+AXIS_COLOR = "#777777"
+
+
+def format_time(seconds, span):
+    when = EPOCH + timedelta(seconds=seconds)
+    return when.strftime("%H:%M" if span <= 2 * DAY else "%b %d" if span <= 400 * DAY else "%b %Y")
+
+
+class HistoryChart(tk.Canvas):
+    """Dispense history on a Canvas: daily or weekly totals, or each event.
+
+    Only the visible range is queried from the DispenseHistory, and it is
+    reduced to about one point per pixel column, so redraw time depends on
+    the chart width rather than on how long the history is. The mouse
+    wheel zooms around the pointer and dragging pans.
+    """
+
+    def __init__(self, parent, width=700, height=300, on_range=None, **kwargs):
+        super().__init__(parent, width=width, height=height, bg="white", highlightthickness=0, **kwargs)
+        self.width, self.height = width, height
+        self.plot_width = width - MARGIN_LEFT - MARGIN_RIGHT
+        self.plot_height = height - MARGIN_TOP - MARGIN_BOTTOM
+        self.on_range = on_range
+        self.history = None
+        self.mode = DAILY
+        self.start = self.end = 0
+        self.limits = (0, DAY)
+        self.last_draw_ms = 0.0
+        self._pending = False
+        self._drag_x = None
+
+        self.bind("<MouseWheel>", lambda event: self.zoom(0.8 if event.delta > 0 else 1.25, event.x))
+        self.bind("<Button-4>", lambda event: self.zoom(0.8, event.x))
+        self.bind("<Button-5>", lambda event: self.zoom(1.25, event.x))
+        self.bind("<ButtonPress-1>", self._drag_start)
+        self.bind("<B1-Motion>", self._drag)
+
+    def set_history(self, history, start=None, end=None):
+        """Show a new history, over [start, end] or everything it holds."""
+        self.history = history
+        span = history.span() or (0, DAY)
+        self.limits = (span[0] - DAY, span[1] + DAY)
+        self.set_range(self.limits[0] if start is None else start, self.limits[1] if end is None else end)
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.request_redraw()
+
+    def set_range(self, start, end):
+        low, high = self.limits
+        width = min(max(end - start, MIN_RANGE), high - low)
+        start = max(low, min(start, high - width))
+        self.start, self.end = start, start + width
+        self.request_redraw()
+
+    def zoom(self, factor, x=None):
+        """Scale the visible range by factor, keeping the time under x in place."""
+        fraction = 0.5 if x is None else min(1.0, max(0.0, (x - MARGIN_LEFT) / self.plot_width))
+        pivot = self.start + (self.end - self.start) * fraction
+        width = (self.end - self.start) * factor
+        self.set_range(pivot - width * fraction, pivot - width * fraction + width)
+
+    def _drag_start(self, event):
+        self._drag_x = event.x
+
+    def _drag(self, event):
+        if self._drag_x is None:
+            return
+        shift = (self._drag_x - event.x) / self.plot_width * (self.end - self.start)
+        self._drag_x = event.x
+        self.set_range(self.start + shift, self.end + shift)
+
+    def request_redraw(self):
+        """Redraw once when Tk is idle, however many changes came in."""
+        if not self._pending:
+            self._pending = True
+            self.after_idle(self.redraw)
+
+    def x_of(self, seconds):
+        return MARGIN_LEFT + (seconds - self.start) / (self.end - self.start) * self.plot_width
+
+    def redraw(self):
+        self._pending = False
+        started = time.perf_counter()
+        self.delete("all")
+        if self.history is None:
+            return
+
+        if self.mode == EVENTS:
+            xs, ys = self.history.events(self.start, self.end, max_points=self.plot_width)
+        else:
+            size = DAY if self.mode == DAILY else WEEK
+            xs, ys = self.history.totals(self.start, self.end, size, max_points=self.plot_width // 2)
+        top = max(ys, default=0) or 1
+        bottom_y = MARGIN_TOP + self.plot_height
+        scale = self.plot_height / (top * 1.1)
+        self.draw_axes(top)
+
+        if self.mode == EVENTS:
+            for x, y in zip(xs, ys):
+                px = self.x_of(x)
+                self.create_line(px, bottom_y, px, bottom_y - y * scale, fill=BAR_COLOR, width=2)
+        elif len(xs) * 4 <= self.plot_width:
+            bar = max(2.0, (self.x_of(xs[0] + size) - self.x_of(xs[0])) * 0.8) if xs else 0
+            for x, y in zip(xs, ys):
+                px = self.x_of(x + size / 2)
+                self.create_rectangle(px - bar / 2, bottom_y - y * scale, px + bar / 2, bottom_y,
+                                      fill=BAR_COLOR, outline="")
+        elif len(xs) > 1:
+            # Too many buckets for bars: one line through the (reduced) totals.
+            coords = []
+            for x, y in zip(xs, ys):
+                coords.extend((self.x_of(x + size / 2), bottom_y - y * scale))
+            self.create_line(*coords, fill=LINE_COLOR, width=2)
+
+        self.last_draw_ms = (time.perf_counter() - started) * 1000
+        if self.last_draw_ms > REDRAW_BUDGET_MS:
+            print(f"[WARN] History chart redraw took {self.last_draw_ms:.1f} ms for {len(xs)} points")
+        if self.on_range:
+            self.on_range(self.start, self.end)
+
+    def draw_axes(self, top):
+        bottom_y = MARGIN_TOP + self.plot_height
+        right_x = MARGIN_LEFT + self.plot_width
+        self.create_line(MARGIN_LEFT, MARGIN_TOP, MARGIN_LEFT, bottom_y, right_x, bottom_y, fill=AXIS_COLOR)
+
+        unit = self.history.unit
+        self.create_text(MARGIN_LEFT - 6, MARGIN_TOP + self.plot_height * (1 - 1 / 1.1), anchor="e",
+                         text=f"{top:.0f} {unit}", font=("Arial", 8), fill=AXIS_COLOR)
+        self.create_text(MARGIN_LEFT - 6, bottom_y, anchor="e", text=f"0 {unit}", font=("Arial", 8),
+                         fill=AXIS_COLOR)
+
+        span = self.end - self.start
+        for i in range(5):
+            t = self.start + span * i / 4
+            self.create_text(self.x_of(t), bottom_y + 6, anchor="n", text=format_time(t, span),
+                             font=("Arial", 8), fill=AXIS_COLOR)
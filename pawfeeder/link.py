@@ -0,0 +1,166 @@
+import threading
+import time
+
+from .profiler import profiler
+
+# Constants
+READ_ERRORS_BEFORE_LOST = 3     # failed reads in a row that mean the device is gone
+
+
+class FeederLink:
+    """Serial connection to a feeder with a single background reader.
+
+    Every line the Arduino prints goes to ``on_line``. Lines that answer a
+    pending ``request()`` are also handed back to the caller, so commands
+    with replies (GETTIME, SETTIME, ...) can be used while the reader thread
+    keeps logging telemetry. When reads keep failing (the USB cable was
+    pulled) the port is closed and ``on_disconnect(error)`` is called from
+    the reader thread.
+    """
+
+    def __init__(self, port, baudrate=9600, on_line=None, on_disconnect=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.on_line = on_line or (lambda line: print("[ARDUINO]:", line))
+        self.on_disconnect = on_disconnect
+        self.serial = None
+        # Low-power firmware loses the byte that wakes it from power-down;
+        # when set, a newline is sent first and this many seconds awaited.
+        self.wake_delay = 0
+        self._write_lock = threading.Lock()
+        self._waiters_lock = threading.Lock()
+        self._waiters = []
+        self._reader = None
+        self._closed = False
+
+    @property
+    def device_id(self):
+        return self.port
+
+    def open(self, reset_wait=2):
+        """Open the port and wait for the Arduino to reset.
+
+        Raises ConnectionError if the port cannot be opened.
+        """
+        # pyserial is imported here so importing the package stays cheap.
+        with profiler.phase("serial import"):
+            import serial
+        try:
+            with profiler.phase("serial open", port=self.port):
+                self.serial = serial.Serial(self.port, self.baudrate, timeout=1)
+        except serial.SerialException as e:
+            raise ConnectionError(f"Cannot connect to Arduino on {self.port}") from e
+        self._closed = False
+        with profiler.phase("reset wait", port=self.port):
+            time.sleep(reset_wait)  # Allow Arduino to reset
+        self.serial.reset_input_buffer()
+
+    def start(self):
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def close(self):
+        self._closed = True
+        if self.serial:
+            self.serial.close()
+
+    def write(self, data):
+        """Write raw bytes to the Arduino."""
+        with self._write_lock:
+            self.serial.write(data)
+
+    def send(self, command):
+        """Send one text command terminated by a newline."""
+        with self._write_lock:
+            if self.wake_delay:
+                self.serial.write(b"\n")
+                time.sleep(self.wake_delay)
+            self.serial.write((command + "\n").encode())
+
+    def request(self, command, prefix, timeout=2.0):
+        """Send a command and wait for the first line starting with prefix.
+
+        ``prefix`` may be a tuple to also catch error replies. Returns
+        ``(line, sent_at, received_at)`` with wall-clock timestamps taken
+        right around the write and the read, or ``None`` on timeout.
+        """
+        waiter = self._add_waiter(prefix, None)
+        try:
+            sent_at = time.time()
+            self.send(command)
+            if not waiter["event"].wait(timeout):
+                return None
+            return waiter["lines"][0], sent_at, waiter["at"]
+        finally:
+            self._remove_waiter(waiter)
+
+    def collect(self, command, prefix, end, timeout=10.0):
+        """Send a command and gather reply lines until one starts with end.
+
+        Lines starting with ``prefix`` (a string or tuple) are collected in
+        order; the closing ``end`` line is included last. Returns ``None``
+        if the reply did not finish within timeout.
+        """
+        if isinstance(prefix, str):
+            prefix = (prefix,)
+        waiter = self._add_waiter(prefix + (end,), end)
+        try:
+            self.send(command)
+            if not waiter["event"].wait(timeout):
+                return None
+            return waiter["lines"]
+        finally:
+            self._remove_waiter(waiter)
+
+    def _add_waiter(self, prefix, end):
+        waiter = {"prefix": prefix, "end": end, "event": threading.Event(), "lines": [], "at": None}
+        with self._waiters_lock:
+            self._waiters.append(waiter)
+        return waiter
+
+    def _remove_waiter(self, waiter):
+        with self._waiters_lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _read_loop(self):
+        port = self.serial
+        errors = 0
+        # A reopened port gets its own reader; this one ends with its port.
+        while not self._closed and self.serial is port:
+            try:
+                raw = port.readline()
+            except Exception as e:
+                if self._closed or self.serial is not port:
+                    break
+                errors += 1
+                print("[ERROR Reading Arduino]:", e)
+                if errors >= READ_ERRORS_BEFORE_LOST:
+                    self._lost(e)
+                    break
+                time.sleep(1)
+                continue
+            errors = 0
+            received_at = time.time()
+            line = raw.decode(errors='ignore').strip()
+            if not line:
+                continue
+            self._deliver(line, received_at)
+            self.on_line(line)
+
+    def _lost(self, error):
+        print(f"[WARN] Lost the connection to {self.port}")
+        self.close()
+        if self.on_disconnect:
+            self.on_disconnect(error)
+
+    def _deliver(self, line, received_at):
+        with self._waiters_lock:
+            for waiter in self._waiters:
+                if line.startswith(waiter["prefix"]):
+                    waiter["lines"].append(line)
+                    waiter["at"] = received_at
+                    if waiter["end"] is None or line.startswith(waiter["end"]):
+                        waiter["event"].set()
+                        self._waiters.remove(waiter)
+                    return
@@ -0,0 +1,133 @@
+"""Send-latency benchmark for the mail outbox.
+
+    python -m pawfeeder.mailbench you@example.com [--count 5]
+    python -m pawfeeder.mailbench --loopback [--count 50] [--rtt-ms 20]
+
+sends test messages through the configured server and prints the send
+latencies. With --loopback the messages go to a stand-in server on
+127.0.0.1 that answers each command after --rtt-ms and the login after
+--login-ms, so the figures are repeatable. Kept out of pawfeeder.mailer,
+which the PIN screens import.
+"""
+import argparse
+import socketserver
+import sys
+import threading
+import time
+
+from .mailer import MailOutbox
+
+
+# --- Loopback Server ---
+class LoopbackHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, QUIT."""
+
+    def reply(self, *lines, delay=None):
+        time.sleep(self.server.rtt if delay is None else delay)
+        for i, line in enumerate(lines):
+            separator = "-" if i < len(lines) - 1 else " "
+            self.wfile.write(f"{line[:3]}{separator}{line[4:]}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 pawfeeder loopback")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.reply("250 pawfeeder", "250 AUTH PLAIN")
+            elif command == b"AUTH":
+                self.reply("235 accepted", delay=self.server.login_delay)
+            elif command == b"DATA":
+                self.reply("354 end with .")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.received += 1
+                self.reply("250 queued")
+            elif command == b"QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+class LoopbackServer(socketserver.ThreadingTCPServer):
+    """Local SMTP stand-in with a fixed delay per reply, for timing the outbox."""
+
+    daemon_threads = True
+
+    def __init__(self, rtt_ms=20, login_ms=100):
+        super().__init__(("127.0.0.1", 0), LoopbackHandler)
+        self.rtt = rtt_ms / 1000
+        self.login_delay = login_ms / 1000
+        self.received = 0
+        threading.Thread(target=self.serve_forever, name="smtp-loopback", daemon=True).start()
+
+    def settings(self):
+        return {"address": "pawfeeder@localhost", "password": "loopback",
+                "host": "127.0.0.1", "port": self.server_address[1], "starttls": False}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pawfeeder.mailbench",
+                                     description="Send test mails and print the send latency.")
+    parser.add_argument("to", nargs="?", help="recipient (not needed with --loopback)")
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--loopback", action="store_true",
+                        help="send to a local stand-in server instead of the configured one")
+    parser.add_argument("--rtt-ms", type=float, default=20,
+                        help="loopback delay before each reply")
+    parser.add_argument("--login-ms", type=float, default=100,
+                        help="loopback delay before accepting the login")
+    args = parser.parse_args(argv)
+    if args.to is None and not args.loopback:
+        parser.error("a recipient is needed unless --loopback is given")
+
+    server = None
+    settings = None
+    if args.loopback:
+        server = LoopbackServer(args.rtt_ms, args.login_ms)
+        settings = server.settings()
+        args.to = args.to or "owner@localhost"
+        print(f"[MAIL] Loopback server on port {server.server_address[1]}: "
+              f"{args.rtt_ms:g} ms per reply, {args.login_ms:g} ms login")
+
+    # One message at a time, like OTP mails; the first one pays for the login.
+    test = MailOutbox()
+    test.settings = settings
+    done = threading.Semaphore(0)
+    caller_ms = []
+    for i in range(args.count):
+        started = time.perf_counter()
+        test.send(args.to, f"PawFeeder: test {i + 1}", "Test message from PawFeeder.",
+                  on_done=lambda error: done.release())
+        caller_ms.append((time.perf_counter() - started) * 1000)
+        done.acquire()
+    test.close()
+    stats = test.stats()
+    if stats:
+        print(f"[MAIL] {stats['sent']} sent, {stats['failed']} failed over {stats['connects']} connection(s); "
+              f"p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms, max {stats['max_ms']:.0f} ms; "
+              f"send() took at most {max(caller_ms):.2f} ms of the caller's time")
+
+    if server is not None:
+        # For comparison: a new session per message, as before the outbox.
+        fresh_ms = []
+        for i in range(args.count):
+            single = MailOutbox()
+            single.settings = settings
+            started = time.perf_counter()
+            single.send(args.to, f"PawFeeder: test {i + 1}", "Test message from PawFeeder.")
+            single.close()
+            fresh_ms.append((time.perf_counter() - started) * 1000)
+        fresh_ms.sort()
+        print(f"[MAIL] A new session per message: p50 {fresh_ms[int(0.50 * (len(fresh_ms) - 1))]:.0f} ms, "
+              f"p95 {fresh_ms[int(0.95 * (len(fresh_ms) - 1))]:.0f} ms")
+        server.shutdown()
+        server.server_close()
+    return 0 if test.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Background mail delivery over one reused SMTP session.
+
+Settings come from the environment or .env: EMAIL_ADDRESS,
+EMAIL_PASSWORD, and optionally SMTP_HOST, SMTP_PORT and SMTP_STARTTLS
+(0 for a local test server without TLS). The latency benchmark is
+``python -m pawfeeder.mailbench``.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+# Constants
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+CONNECT_TIMEOUT = 15        # seconds
+IDLE_TIMEOUT = 60           # seconds an unused session is kept open
+RETRY_DELAYS = (2, 5)       # seconds before the second and third attempt
+LATENCY_SAMPLES = 200
+
+
+class MailError(Exception):
+    pass
+
+
+class MailOutbox:
+    """Queue of outgoing mail, sent by one worker thread.
+
+    ``send()`` returns at once. The worker keeps the authenticated
+    session open between messages, closes it after IDLE_TIMEOUT unused,
+    reconnects when the server has dropped it and retries failed sends.
+    ``on_done(error)`` is called on the worker thread with None or the
+    last error once a message is sent or given up; Tk callers pass it
+    through their UiDispatcher.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, retry_delays=RETRY_DELAYS):
+        self.idle_timeout = idle_timeout
+        self.retry_delays = retry_delays
+        self.settings = None
+        self.sent = 0
+        self.failed = 0
+        self.connects = 0
+        self.latency_ms = deque(maxlen=LATENCY_SAMPLES)
+        self._queue = queue.Queue()
+        self._session = None
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def send(self, to_email, subject, body, on_done=None):
+        """Queue a plain-text message. Safe from any thread."""
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="mail-outbox", daemon=True)
+                self._worker.start()
+        self._queue.put((time.perf_counter(), to_email, subject, body, on_done))
+
+    def close(self, timeout=5.0):
+        """Send what is queued (waiting at most timeout) and log out."""
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    # --- Worker ---
+    def _run(self):
+        # smtplib and email are imported here, off the Tk thread.
+        import smtplib
+        from email.message import EmailMessage
+        self._smtplib = smtplib
+        self._message_class = EmailMessage
+
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout if self._session else None)
+            except queue.Empty:
+                self._disconnect()
+                continue
+            if item is None:
+                break
+            queued, to_email, subject, body, on_done = item
+            error = self._deliver(to_email, subject, body)
+            if error is None:
+                self.sent += 1
+                self.latency_ms.append((time.perf_counter() - queued) * 1000)
+            else:
+                self.failed += 1
+                print(f"[MAIL] Could not send to {to_email}: {error}")
+            if on_done is not None:
+                try:
+                    on_done(error)
+                except Exception as e:
+                    print("[ERROR] Mail callback failed:", e)
+        self._disconnect()
+
+    def _deliver(self, to_email, subject, body):
+        """Send one message; returns None or the error it was given up on."""
+        smtplib = self._smtplib
+        try:
+            settings = self._load_settings()
+        except MailError as e:
+            return e
+        message = self._message_class()
+        message["Subject"] = subject
+        message["From"] = settings["address"]
+        message["To"] = to_email
+        message.set_content(body)
+
+        attempt = 0
+        while True:
+            reused = self._session is not None
+            try:
+                self._connect(settings).send_message(message)
+                return None
+            except (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused,
+                    smtplib.SMTPSenderRefused) as e:
+                # Retrying will not change the answer.
+                self._disconnect()
+                return e
+            except (smtplib.SMTPException, OSError) as e:
+                self._disconnect()
+                if reused:
+                    continue        # the server dropped the idle session; reconnect now
+                if attempt >= len(self.retry_delays):
+                    return e
+                print(f"[MAIL] Send failed ({e}); retrying in {self.retry_delays[attempt]} s")
+                time.sleep(self.retry_delays[attempt])
+                attempt += 1
+
+    def _connect(self, settings):
+        if self._session is None:
+            smtplib = self._smtplib
+            session = smtplib.SMTP(settings["host"], settings["port"], timeout=CONNECT_TIMEOUT)
+            try:
+                if settings["starttls"]:
+                    session.starttls()
+                session.login(settings["address"], settings["password"])
+            except BaseException:
+                session.close()
+                raise
+            self._session = session
+            self.connects += 1
+        return self._session
+
+    def _disconnect(self):
+        if self._session is None:
+            return
+        try:
+            self._session.quit()
+        except (self._smtplib.SMTPException, OSError):
+            self._session.close()
+        self._session = None
+
+    def _load_settings(self):
+        if self.settings is None:
+            self.settings = load_settings()
+        if not self.settings["address"] or not self.settings["password"]:
+            raise MailError("Email configuration not found.")
+        return self.settings
+
+    def stats(self):
+        """Queue-to-sent latency of the recent messages, in milliseconds."""
+        samples = sorted(self.latency_ms)
+        if not samples:
+            return None
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "connects": self.connects,
+            "p50_ms": samples[int(0.50 * (len(samples) - 1))],
+            "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+            "max_ms": samples[-1],
+        }
+
+
+def load_settings():
+    """Sending account and server, from the environment and .env."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    settings = {
+        "address": os.environ.get("EMAIL_ADDRESS"),
+        "password": os.environ.get("EMAIL_PASSWORD"),
+        "host": os.environ.get("SMTP_HOST", SMTP_HOST),
+        "port": int(os.environ.get("SMTP_PORT", SMTP_PORT)),
+        "starttls": os.environ.get("SMTP_STARTTLS", "1") != "0",
+    }
+    if not settings["address"] or not settings["password"]:
+        print("Error: EMAIL_ADDRESS and EMAIL_PASSWORD environment variables not set.")
+    return settings
+
+
+# One outbox per process
+outbox = MailOutbox()
+atexit.register(outbox.close)
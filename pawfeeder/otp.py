@@ -0,0 +1,181 @@
+import atexit
+import hashlib
+import heapq
+import hmac
+import os
+import secrets
+import threading
+import time
+
+from .writebehind import store
+
+# Constants
+OTP_FILE = "pkl/otp_codes.pkl"
+OTP_TTL = 120           # seconds a code is valid
+MAX_ATTEMPTS = 5        # wrong guesses before a code is dropped
+OTP_DIGITS = 6
+
+# verify() results
+VALID = "valid"
+WRONG = "wrong"
+EXPIRED = "expired"
+MISSING = "missing"
+LOCKED = "locked"
+
+
+class OtpService:
+    """Pending one-time codes, one per key ("register:<email>" and so on).
+
+    Codes are kept salted and hashed in a dict, with a min-heap of expiry
+    times that is purged lazily, so verify() is a dict lookup and a hash
+    with no file access. Each code allows MAX_ATTEMPTS wrong guesses.
+    Issued codes (hash, expiry as wall-clock time, attempts left) are
+    written behind to OTP_FILE, so pending codes survive a restart; used
+    codes are stored as None until the next load. Wrong guesses only
+    change the count in memory; the counts are saved with the next issue()
+    and at exit, so a crash can give back at most those attempts.
+    """
+
+    def __init__(self, filename=OTP_FILE, ttl=OTP_TTL, max_attempts=MAX_ATTEMPTS):
+        self.filename = filename
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.codes = None       # key -> record, loaded on first use
+        self.expiry = []        # heap of (expires, serial, key)
+        self.issued = 0
+        self.verified = 0
+        self.rejected = 0
+        self.purged = 0
+        self._serial = 0
+        self._unsaved = set()   # keys whose attempt count changed since it was saved
+        self._lock = threading.Lock()
+
+    def issue(self, key, data=None, ttl=None):
+        """New code for key, replacing any pending one. Returns the code."""
+        code = str(secrets.randbelow(10 ** OTP_DIGITS)).zfill(OTP_DIGITS)
+        salt = os.urandom(16)
+        with self._lock:
+            self._load()
+            self._serial += 1
+            expires = time.monotonic() + (ttl or self.ttl)
+            self.codes[key] = {
+                "salt": salt,
+                "hash": hash_code(salt, code),
+                "expires": expires,
+                "attempts": self.max_attempts,
+                "data": data,
+                "serial": self._serial,
+            }
+            heapq.heappush(self.expiry, (expires, self._serial, key))
+            self.issued += 1
+            self._save(key)
+            self._save_attempts()
+            self._purge()
+        return code
+
+    def verify(self, key, code):
+        """(result, data) for a guess; the code is used up when VALID or LOCKED."""
+        with self._lock:
+            self._load()
+            result, data = self._check(key, code)
+            self._purge()
+            return result, data
+
+    def _check(self, key, code):
+        record = self.codes.get(key)
+        if record is None:
+            return MISSING, None
+        if time.monotonic() >= record["expires"]:
+            self._remove(key)
+            return EXPIRED, None
+        if hmac.compare_digest(record["hash"], hash_code(record["salt"], code)):
+            self._remove(key)
+            self.verified += 1
+            return VALID, record["data"]
+        self.rejected += 1
+        record["attempts"] -= 1
+        if record["attempts"] <= 0:
+            self._remove(key)
+            return LOCKED, None
+        self._unsaved.add(key)
+        return WRONG, None
+
+    def attempts_left(self, key):
+        with self._lock:
+            self._load()
+            record = self.codes.get(key)
+            return record["attempts"] if record else 0
+
+    def discard(self, key):
+        with self._lock:
+            self._load()
+            if key in self.codes:
+                self._remove(key)
+
+    def flush(self):
+        """Save the attempt counts of wrong guesses made since the last save."""
+        with self._lock:
+            self._save_attempts()
+
+    def stats(self):
+        with self._lock:
+            pending = len(self.codes or {})
+        return {"pending": pending, "issued": self.issued, "verified": self.verified,
+                "rejected": self.rejected, "purged": self.purged}
+
+    # --- Internals (lock held) ---
+    def _purge(self):
+        """Drop codes whose time is up, oldest first; stops at the first live one."""
+        now = time.monotonic()
+        while self.expiry and self.expiry[0][0] <= now:
+            _, serial, key = heapq.heappop(self.expiry)
+            record = self.codes.get(key)
+            # Entries of replaced or used codes are left in the heap; skip them.
+            if record is not None and record["serial"] == serial:
+                self._remove(key)
+                self.purged += 1
+
+    def _remove(self, key):
+        del self.codes[key]
+        self._unsaved.discard(key)
+        store.update(self.filename, key, None)
+
+    def _save_attempts(self):
+        for key in list(self._unsaved):
+            if key in self.codes:
+                self._save(key)
+        self._unsaved.clear()
+
+    def _load(self):
+        if self.codes is not None:
+            return
+        self.codes = {}
+        # Stored expiry is wall-clock time; in memory it is monotonic.
+        offset = time.monotonic() - time.time()
+        saved = store.get(self.filename, {})
+        for key, record in saved.items():
+            if record is None:
+                continue
+            self._serial += 1
+            record = dict(record, expires=record["expires"] + offset, serial=self._serial)
+            self.codes[key] = record
+            heapq.heappush(self.expiry, (record["expires"], self._serial, key))
+        if None in saved.values():
+            store.put(self.filename, {key: value for key, value in saved.items() if value is not None})
+        self._purge()
+
+    def _save(self, key):
+        self._unsaved.discard(key)
+        record = dict(self.codes[key])
+        del record["serial"]
+        record["expires"] += time.time() - time.monotonic()
+        store.update(self.filename, key, record)
+
+
+def hash_code(salt, code):
+    return hashlib.sha256(salt + code.encode()).digest()
+
+
+# One service per process
+otps = OtpService()
+atexit.register(otps.flush)
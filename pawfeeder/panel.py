@@ -0,0 +1,531 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+import time
+import threading
+from datetime import datetime
+
+from .capabilities import has_feature
+from .controller import PORTION_OK, PORTION_FIXED, PORTION_UNCALIBRATED, convert_to_24h_format
+from .calibration import load_model, portion_to_grams
+from .guide import BREED, TYPE, AGE_SIZE, MEALS, PORTION, TIMES
+from .guideview import VirtualTable
+from .history import DAY, DispenseHistory, now_seconds
+from .historyview import HistoryChart, DAILY, WEEKLY, EVENTS
+from .slotview import SlotListView
+
+
+# Feeding guide table: headings, widths and the guide fields shown
+GUIDE_COLUMNS = ("Breed", "Dog Type", "Age/Size", "Meal Frequency", "Portion per Meal", "Time of Feeding")
+GUIDE_WIDTHS = (130, 80, 125, 95, 95, 205)
+GUIDE_SHOWN = (BREED, TYPE, AGE_SIZE, MEALS, PORTION, TIMES)
+GUIDE_ROWS = 8
+FILTER_BUDGET_MS = 16
+ALL = "All"
+
+VISIBLE_SLOTS = 5
+
+HISTORY_DAYS = 30   # range the History page opens on
+
+
+class DevicePanel:
+    """The Automatic, Custom and Manual Feed pages for one feeder.
+
+    Pages are built the first time they are shown. ``destroy()`` drops the
+    widgets; state that should outlive them (the custom slots) is kept by
+    the app, so an evicted panel comes back as it was.
+    """
+
+    def __init__(self, app, controller, slot_model):
+        self.app = app
+        self.controller = controller
+        self.slot_model = slot_model
+        self.pages = {}
+        self.page_builders = {1: self.build_page1, 2: self.build_page2, 3: self.build_page3,
+                              4: self.build_page4}
+        self.clock_labels = {}
+
+    def saved_schedule_text(self):
+        """The schedule the feeder was last given, as '7:00 AM, 6:00 PM'."""
+        times = [datetime.strptime(entry.split("@")[0], "%H:%M:%S") for entry in self.controller.schedule]
+        return ", ".join(t.strftime("%I:%M %p").lstrip("0") for t in times)
+
+    def show_page(self, number):
+        """Show one feeding page, building it on first use."""
+        for other, frame in self.pages.items():
+            if other != number:
+                frame.pack_forget()
+        if number not in self.pages:
+            self.pages[number] = self.page_builders[number]()
+        self.pages[number].pack(fill="both", expand=True)
+        self.app.clock.bind(*self.clock_labels[number])
+
+    def hide(self):
+        for frame in self.pages.values():
+            frame.pack_forget()
+
+    def destroy(self):
+        for frame in self.pages.values():
+            frame.destroy()
+        self.pages = {}
+        self.clock_labels = {}
+
+    # --- Schedule ---
+    def portion_note(self, portion_text):
+        """Tell the user how the guide portion will be applied."""
+        grams = portion_to_grams(portion_text)
+        if grams is None:
+            return ""
+        support = self.controller.portion_support()
+        if support == PORTION_FIXED:
+            return "\n(This feeder's firmware uses a fixed portion.)"
+        if support == PORTION_UNCALIBRATED:
+            return "\n(Feeder not calibrated yet: the default portion will be used.)"
+        return f" (about {grams:.0f} g)"
+
+    def send_schedule(self, entries):
+        """Send (time, portion_ms) entries and report the result. True on success."""
+        if not entries:
+            print("[WARN] No valid times to send.")
+            messagebox.showwarning("Invalid Times", "No valid feeding times found.")
+            return False
+        try:
+            dropped = self.controller.set_schedule_entries(entries)
+        except Exception as e:
+            print("[ERROR] Failed to send schedule:", e)
+            messagebox.showerror("Error", "Failed to send schedule to Arduino.")
+            return False
+        if dropped:
+            limit = self.controller.max_schedule
+            messagebox.showwarning("Schedule Too Long", f"This feeder stores up to {limit} feeding times. "
+                                   f"Only the first {limit} will be used.")
+        return True
+
+    # --- Confirm and Send Scheduled Times to Arduino ---
+    def confirm_schedule(self, values):
+        breed, dog_type, age_size, meal_frequency, portion_per_meal, times_str = values
+
+        response = messagebox.askyesno(
+            "Confirm Schedule",
+            f"Breed: {breed}\nDog Type: {dog_type}\nAge/Size: {age_size}\nMeal Frequency: {meal_frequency}\n"
+            f"Portion per Meal: {portion_per_meal}{self.portion_note(portion_per_meal)}\n"
+            f"Time of Feeding: {times_str}\n\n"
+            "Do you want to activate this schedule?"
+        )
+        if not response:
+            return
+
+        times_list = [t.strip() for t in times_str.split(',')]
+        formatted_times = []
+        for t in times_list:
+            converted = convert_to_24h_format(t)
+            if converted:
+                formatted_times.append(converted)
+            else:
+                print(f"[WARN] Skipping invalid time: {t}")
+
+        portion_ms = self.controller.portion_ms_for_text(portion_per_meal)
+        if self.send_schedule([(t, portion_ms) for t in formatted_times]):
+            self.schedule_label.config(text=", ".join(times_list))
+            messagebox.showinfo("Schedule Activated", "Schedule has been sent to Arduino.")
+
+    def reset_schedule(self):
+        confirm = messagebox.askyesno("Reset Schedule", "Are you sure you want to reset the feeding schedule?")
+        if not confirm:
+            return
+
+        try:
+            self.controller.reset_schedule()
+            self.schedule_label.config(text="")
+            messagebox.showinfo("Schedule Reset", "The feeding schedule has been reset.")
+        except Exception as e:
+            print("[ERROR] Failed to send reset command:", e)
+            messagebox.showerror("Error", "Failed to reset schedule. Make sure Arduino is connected.")
+
+    # Function to handle checkbox state changes
+    def on_checkbox_toggle(self, index):
+        slot = self.slot_model[index]
+        if slot["active"] and (not slot["hour"] or not slot["minute"] or not slot["ampm"]):
+            messagebox.showwarning("Time Selection Required", "Please set a time first!")
+            # Reset the checkbox state
+            self.slot_model.update(index, active=False)
+            self.slot_view.refresh()
+
+    def confirm_custom_schedule(self):
+        # Every change re-checks its own slot, so the list is already validated.
+        if not self.slot_model.valid:
+            messagebox.showwarning("Invalid Time", self.slot_model.first_error())
+            return
+
+        entries, duplicates = self.slot_model.entries()
+        if not entries:
+            messagebox.showwarning("No Times Selected", "Please select at least one feeding time!")
+            return
+
+        labels = [label + (f" ({grams:g} g)" if grams else "") for t, grams, label in entries]
+        notes = ""
+        if duplicates:
+            notes += f"\n({duplicates} repeated time(s) will be set once.)"
+        if any(grams for t, grams, label in entries) and self.controller.portion_support() != PORTION_OK:
+            notes += "\n(Portions need a calibrated feeder: the default portion will be used.)"
+
+        # Ask for confirmation
+        response = messagebox.askyesno(
+            "Confirm Custom Schedule",
+            f"Time of Feeding:\n{', '.join(labels)}{notes}\n\nDo you want to activate this custom schedule?"
+        )
+        if not response:
+            return
+
+        schedule = [(t, self.controller.portion_ms(grams)) for t, grams, label in entries]
+        if self.send_schedule(schedule):
+            schedule_text = "Scheduled times: " + ", ".join(labels)
+            self.custom_schedule_label.config(text=schedule_text, fg="#008000")
+            messagebox.showinfo("Schedule Activated", "Custom schedule has been sent to Arduino.")
+
+    def reset_custom_schedule(self):
+        # Check if any time slot has been set
+        has_schedule = not self.slot_model.is_empty()
+
+        # Reset all time selections
+        self.slot_model.clear()
+        self.slot_view.refresh()
+
+        # Reset the schedule display
+        self.custom_schedule_label.config(text="No times scheduled yet", fg="#777777")
+
+        if has_schedule:
+            messagebox.showinfo("Schedule Reset", "Your custom feeding schedule has been reset!")
+        else:
+            messagebox.showinfo("No Schedule", "You have no custom feeding schedule set recently.")
+
+    # --- Manual Feed Button Logic ---
+    def activate_manual_feed(self):
+        confirm = messagebox.askyesno("Confirm Dispensing", "Are you sure you want to dispense dog food?")
+        if not confirm:
+            return
+
+        # Disable the button until the dispense sequence is over
+        self.page3_button.config(state="disabled", disabledforeground="white")
+
+        def run():
+            try:
+                seconds = self.controller.dispense()
+            except Exception as e:
+                print("[ERROR] Failed to send dispense command:", e)
+                self.app.ui.post(messagebox.showerror, "Error", "Failed to dispense. Make sure Arduino is connected.")
+            else:
+                time.sleep(seconds)  # Wait for the dispense sequence
+                self.app.ui.post(messagebox.showinfo, "Manual Feed", "Your pet's food has been dispensed.")
+            self.app.ui.post(self.page3_button.config, {"text": "Dispense", "state": "normal"})
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # --- Portion Calibration ---
+    def ask_weight(self, ms):
+        """Ask on the Tk thread how many grams a test run dispensed."""
+        return self.app.ui.call(lambda: simpledialog.askfloat(
+            "Calibration",
+            f"Weigh the food from the {ms / 1000:g} second test run.\n\nGrams dispensed:",
+            minvalue=0
+        ))
+
+    def start_calibration(self):
+        if not has_feature(self.controller.caps, "portion"):
+            messagebox.showwarning("Calibration", "This feeder's firmware does not support portion control.")
+            return
+        confirm = messagebox.askyesno(
+            "Calibrate Portions",
+            "The feeder will dispense a few test portions.\n"
+            "Place a bowl on a kitchen scale, and weigh and empty it after each run.\n\n"
+            "Start calibration?"
+        )
+        if not confirm:
+            return
+
+        self.calibrate_button.config(state="disabled")
+
+        def run():
+            try:
+                model = self.controller.calibrate(self.ask_weight)
+            except Exception as e:
+                print("[ERROR] Calibration failed:", e)
+                self.app.ui.post(messagebox.showerror, "Calibration",
+                                 f"Calibration stopped with an error: {e}")
+            else:
+                if model:
+                    message = f"Calibrated: about {model['slope'] * 1000:.1f} g of food per second of dispensing."
+                    self.app.ui.post(messagebox.showinfo, "Calibration", message)
+                else:
+                    self.app.ui.post(messagebox.showwarning, "Calibration", "Calibration was cancelled or failed.")
+            finally:
+                self.app.ui.post(self.calibrate_button.config, {"state": "normal"})
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # --- Feeding History ---
+    def load_history(self):
+        history = DispenseHistory(self.controller.history(), load_model(self.controller.device_id))
+        self.history = history
+        if history.span():
+            self.chart.set_history(history, now_seconds() - HISTORY_DAYS * DAY, now_seconds())
+        else:
+            self.chart.set_history(history)
+
+    def show_history_range(self, start, end):
+        """Summary of what the chart shows; called after every redraw."""
+        total, feeds = self.history.total(start, end)
+        self.history_summary_label.config(
+            text=f"{feeds:,} feeds, {total:,.0f} {self.history.unit} dispensed in view "
+                 f"({self.chart.last_draw_ms:.0f} ms)")
+
+    def show_all_history(self):
+        self.chart.set_range(*self.chart.limits)
+
+    def refresh_history(self):
+        """Pull new dispense records from the feeder, then redraw."""
+        if not (self.controller.connected and has_feature(self.controller.caps, "log")):
+            self.load_history()
+            return
+        self.history_refresh_button.config(state="disabled")
+
+        def run():
+            try:
+                self.controller.sync_log()
+            except Exception as e:
+                print("[ERROR] Failed to sync the dispense log:", e)
+                self.app.ui.post(messagebox.showerror, "Feeding History",
+                                 "Could not read the feeder's log. Make sure Arduino is connected.")
+            else:
+                self.app.ui.post(self.load_history)
+            finally:
+                self.app.ui.post(self.history_refresh_button.config, {"state": "normal"})
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def filter_guide(self):
+        dog_type = self.guide_type.get()
+        size = self.guide_size.get()
+        view = self.guide.filter(self.guide_search.get(),
+                                 None if dog_type == ALL else dog_type,
+                                 None if size == ALL else size)
+        self.table.set_view(view)
+        self.guide_count_label.config(text=f"{len(view):,} of {len(self.guide):,}")
+        if self.guide.last_filter_ms > FILTER_BUDGET_MS:
+            print(f"[WARN] Feeding guide filter took {self.guide.last_filter_ms:.1f} ms")
+
+    # --- Page 1 Frame (Automatic Feed) ---
+    def build_page1(self):
+        frame = tk.Frame(self.app.main_frame, bg="white")
+        frame.pack_propagate(False)
+        self.clock_labels[1] = self.app.page_header(frame, "Automatic Feed Setup", "Choose schedule")
+
+        # --- Schedule Feedback ---
+        schedule_set = tk.Label(frame, text=" Schedule Set:", font=("Arial", 10, "bold", "italic"),
+                                bg="white", fg="green")
+        schedule_set.place(x=30, y=460)
+
+        self.schedule_label = tk.Label(frame, text=self.saved_schedule_text(), font=("Arial", 10, "bold", "italic"),
+                                       bg="white", fg="green")
+        self.schedule_label.place(x=125, y=460)
+
+        self.app.configure_styles()
+
+        # --- Guide Filters ---
+        # One guide for the whole window, loaded by the first panel that needs it.
+        self.guide = self.app.feeding_guide()
+
+        filter_frame = tk.Frame(frame, bg="white")
+        filter_frame.place(x=230, y=130)
+
+        self.guide_search = tk.StringVar()
+        self.guide_type = tk.StringVar(value=ALL)
+        self.guide_size = tk.StringVar(value=ALL)
+
+        tk.Label(filter_frame, text="Search:", bg="white").pack(side="left", padx=(0, 5))
+        search_entry = tk.Entry(filter_frame, textvariable=self.guide_search, width=18)
+        search_entry.pack(side="left", padx=(0, 10))
+
+        tk.Label(filter_frame, text="Type:", bg="white").pack(side="left", padx=(0, 5))
+        type_menu = ttk.Combobox(filter_frame, textvariable=self.guide_type, state="readonly", width=10,
+                                 values=[ALL] + self.guide.types)
+        type_menu.pack(side="left", padx=(0, 10))
+
+        tk.Label(filter_frame, text="Size:", bg="white").pack(side="left", padx=(0, 5))
+        size_menu = ttk.Combobox(filter_frame, textvariable=self.guide_size, state="readonly", width=8,
+                                 values=[ALL] + self.guide.sizes)
+        size_menu.pack(side="left", padx=(0, 10))
+
+        self.guide_count_label = tk.Label(filter_frame, text="", bg="white", fg="#777777")
+        self.guide_count_label.pack(side="left")
+
+        self.guide_search.trace_add("write", lambda *args: self.filter_guide())
+        type_menu.bind("<<ComboboxSelected>>", lambda event: self.filter_guide())
+        size_menu.bind("<<ComboboxSelected>>", lambda event: self.filter_guide())
+
+        # --- Table Widget ---
+        # Only the visible rows exist as Treeview items; see VirtualTable.
+        self.table = VirtualTable(frame, GUIDE_COLUMNS, GUIDE_WIDTHS, height=GUIDE_ROWS,
+                                  on_select=self.confirm_schedule, bg="white")
+        self.table.place(x=32, y=180)
+        self.table.set_rows(self.app.guide_rows(GUIDE_SHOWN))
+        self.filter_guide()
+
+        page1_reset_button = tk.Button(
+            frame,
+            text="Reset Schedule",
+            font=("Arial", 10, "bold"),
+            bg="#f44336",
+            fg="white",
+            relief="flat",
+            activebackground="#d32f2f",
+            padx=15,
+            pady=5,
+            command=self.reset_schedule
+        )
+        page1_reset_button.place(relx=0.5, y=540, anchor="center")
+        return frame
+
+    # --- Page 2 Frame (Custom Feed) ---
+    def build_page2(self):
+        frame = tk.Frame(self.app.main_frame, bg="white")
+        frame.pack_propagate(False)
+        self.clock_labels[2] = self.app.page_header(frame, "Custom Feed Setup", "Set your feeding times and portions")
+
+        # Create a centered main content frame
+        content_width = 340  # Adjust as needed
+        main_content = tk.Frame(frame, bg="white", width=content_width)
+        main_content.place(relx=0.5, y=170, anchor="n")
+
+        # Slots live in the model; the view reuses VISIBLE_SLOTS rows of widgets.
+        self.slot_view = SlotListView(main_content, self.slot_model, visible=VISIBLE_SLOTS,
+                                      on_toggle=self.on_checkbox_toggle, bg="white", padx=20, pady=10)
+        self.slot_view.pack(fill="x", padx=20, pady=(0, 20))
+
+        # Current Schedule Display
+        schedule_frame = tk.LabelFrame(main_content, text="Current Custom Schedule", bg="white", bd=2, fg="#333333",
+                                       font=("Helvetica", 10, "bold"))
+        schedule_frame.pack(fill="x", padx=20, pady=(0, 20))
+
+        self.custom_schedule_label = tk.Label(schedule_frame, text="No times scheduled yet", font=("Arial", 12),
+                                              bg="white", fg="#777777", wraplength=480)
+        self.custom_schedule_label.pack(pady=15, padx=10)
+
+        # Buttons for Custom Feed - centered
+        button_frame = tk.Frame(main_content, bg="white")
+        button_frame.pack(pady=15)
+
+        set_schedule_button = tk.Button(
+            button_frame,
+            text="Set Schedule",
+            font=("Arial", 10, "bold"),
+            bg="#4CAF50",
+            fg="white",
+            relief="flat",
+            activebackground="#45a049",
+            padx=15,
+            pady=5,
+            bd=0,
+            cursor="hand2",
+            command=self.confirm_custom_schedule
+        )
+        set_schedule_button.pack(side="left", padx=15)
+
+        add_time_button = tk.Button(
+            button_frame,
+            text="+ Add Time",
+            font=("Arial", 10, "bold"),
+            bg="white",
+            fg="#508C9B",
+            relief="flat",
+            padx=15,
+            pady=5,
+            bd=0,
+            cursor="hand2",
+            command=self.slot_view.add_slot
+        )
+        add_time_button.pack(side="left", padx=15)
+
+        reset_schedule_button = tk.Button(
+            button_frame,
+            text="Reset Schedule",
+            font=("Arial", 10, "bold"),
+            bg="#f44336",
+            fg="white",
+            relief="flat",
+            activebackground="#d32f2f",
+            padx=15,
+            pady=5,
+            bd=0,
+            cursor="hand2",
+            command=self.reset_custom_schedule
+        )
+        reset_schedule_button.pack(side="left", padx=15)
+        return frame
+
+    # --- Page 3 Frame (Manual Feed) ---
+    def build_page3(self):
+        frame = tk.Frame(self.app.main_frame, bg="white")
+        frame.pack_propagate(False)
+        self.clock_labels[3] = self.app.page_header(frame, "Manual Feed Setup", "Click button to dispense dog foods")
+
+        # Dispense Button
+        self.page3_button = tk.Button(
+            frame,
+            text="Dispense",
+            font=("Arial", 10, "bold"),
+            bg="#508C9B",
+            fg="white",
+            disabledforeground="white",
+            padx=15,
+            pady=5,
+            relief="flat",
+            activebackground="white",
+            command=self.activate_manual_feed
+        )
+        self.page3_button.place(relx=0.5, y=450, anchor="center")
+
+        # Calibrate Button
+        self.calibrate_button = tk.Button(
+            frame,
+            text="Calibrate Portions",
+            font=("Arial", 10, "bold"),
+            bg="white",
+            fg="#508C9B",
+            padx=15,
+            pady=5,
+            relief="flat",
+            cursor="hand2",
+            command=self.start_calibration
+        )
+        self.calibrate_button.place(relx=0.5, y=500, anchor="center")
+        return frame
+
+    # --- Page 4 Frame (Feeding History) ---
+    def build_page4(self):
+        frame = tk.Frame(self.app.main_frame, bg="white")
+        frame.pack_propagate(False)
+        self.clock_labels[4] = self.app.page_header(frame, "Feeding History", "Food dispensed over time")
+
+        # Mode and range buttons
+        button_frame = tk.Frame(frame, bg="white")
+        button_frame.place(x=30, y=165)
+        self.history_mode = tk.StringVar(value=DAILY)
+        for text, mode in (("Daily", DAILY), ("Weekly", WEEKLY), ("Each Feed", EVENTS)):
+            tk.Radiobutton(button_frame, text=text, value=mode, variable=self.history_mode, bg="white",
+                           command=lambda: self.chart.set_mode(self.history_mode.get())).pack(side="left", padx=5)
+
+        tk.Button(button_frame, text="All Time", font=("Arial", 9, "bold"), bg="white", fg="#508C9B",
+                  relief="flat", cursor="hand2", command=self.show_all_history).pack(side="left", padx=(20, 5))
+        self.history_refresh_button = tk.Button(button_frame, text="Refresh", font=("Arial", 9, "bold"),
+                                                bg="#508C9B", fg="white", relief="flat", cursor="hand2",
+                                                command=self.refresh_history)
+        self.history_refresh_button.pack(side="left", padx=5)
+
+        self.history_summary_label = tk.Label(frame, text="", font=("Arial", 10), bg="white", fg="#777777")
+        self.history_summary_label.place(x=30, y=500)
+
+        # Wheel to zoom, drag to pan
+        self.chart = HistoryChart(frame, width=720, height=300, on_range=self.show_history_range)
+        self.chart.place(x=30, y=200)
+        self.load_history()
+        return frame
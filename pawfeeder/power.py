@@ -0,0 +1,25 @@
+# Constants
+POWER_TIMEOUT = 2.0
+WAKE_DELAY = 0.02    # oscillator start-up after a pin-change wake, with margin
+
+
+def parse_power(line):
+    """Parse '[POWER] mode=on idle=12 pdown=3 ...' into a dict."""
+    stats = {}
+    for part in line.split()[1:]:
+        if "=" in part:
+            key, value = part.split("=", 1)
+            stats[key] = int(value) if value.isdigit() else value
+    return stats
+
+
+def query_power(link):
+    """Read the sleep counters of a device, or None if it does not answer."""
+    reply = link.request("POWER", "[POWER]", POWER_TIMEOUT)
+    if reply is None:
+        return None
+    stats = parse_power(reply[0])
+    asleep = stats.get("asleep_ms", 0)
+    awake = stats.get("awake_ms", 0)
+    stats["asleep_ratio"] = asleep / (asleep + awake) if asleep + awake else 0.0
+    return stats
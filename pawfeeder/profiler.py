@@ -0,0 +1,297 @@
+"""Startup profiling: named phases, import times and budgets.
+
+    python Pawfeeder.py --profile-startup      writes profile/startup.txt
+                                               and profile/startup_trace.json
+    python -m pawfeeder.profiler [--trace profile/startup_trace.json] [--strict]
+
+The second form is the regression check: it times the startup imports in
+fresh interpreters and the phases of the recorded trace, and exits with 1
+when any of them is over its budget or an import fails. Without a trace
+the phases are skipped; --strict makes that a failure too.
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# json, subprocess, datetime and argparse are imported by the report and
+# check functions: the profiler itself is on every startup path.
+
+# Constants
+PROFILE_DIR = "profile"
+REPORT_FILE = "startup.txt"
+TRACE_FILE = "startup_trace.json"
+STARTUP_MODULES = ("tkinter", "dotenv", "serial", "pawfeeder.gui", "accesspin", "terms")
+
+# Longest acceptable single run of each phase or import, in ms
+PHASE_BUDGETS_MS = {
+    "imports": 500,
+    "tk root": 300,
+    "first screen": 300,
+    "image decode": 50,
+    "dashboard": 300,
+    "serial import": 200,
+    "serial open": 500,
+    "reset wait": 2100,
+    "GETTIME": 500,
+    "capabilities": 2500,
+}
+IMPORT_BUDGETS_MS = {
+    "tkinter": 150,
+    "dotenv": 100,
+    "serial": 200,
+    "pawfeeder.gui": 300,
+    "accesspin": 100,   # no mail stack on the PIN login path
+    "terms": 100,
+}
+
+
+class StartupProfiler:
+    """Records named phases with perf_counter_ns while enabled.
+
+    Disabled (the default) ``phase()`` does nothing, so the calls can stay
+    in the startup path. Phases may run on any thread.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.origin_ns = 0
+        self.events = []
+        self._lock = threading.Lock()
+
+    def enable(self, origin_ns=None):
+        self.enabled = True
+        self.origin_ns = origin_ns or time.perf_counter_ns()
+
+    @contextmanager
+    def phase(self, name, **args):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, started, time.perf_counter_ns(), **args)
+
+    def add(self, name, start_ns, end_ns, **args):
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        with self._lock:
+            self.events.append({"name": name, "start_ns": start_ns, "end_ns": end_ns,
+                                "thread": thread.name, "tid": thread.ident, "args": args})
+
+    def summary(self):
+        """{phase: (count, total_ms, max_ms)}, in order of first appearance."""
+        phases = {}
+        for event in self.events:
+            ms = (event["end_ns"] - event["start_ns"]) / 1e6
+            count, total, longest = phases.get(event["name"], (0, 0.0, 0.0))
+            phases[event["name"]] = (count + 1, total + ms, max(longest, ms))
+        return phases
+
+    def trace_events(self):
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "PawFeeder"}}]
+        for event in self.events:
+            events.append({
+                "name": event["name"],
+                "cat": "phase",
+                "ph": "X",
+                "ts": (event["start_ns"] - self.origin_ns) / 1000,
+                "dur": (event["end_ns"] - event["start_ns"]) / 1000,
+                "pid": 1,
+                "tid": event["tid"],
+                "args": dict(event["args"], thread=event["thread"]),
+            })
+        return events
+
+    def write_report(self, directory=PROFILE_DIR, modules=STARTUP_MODULES):
+        """Write the text report and Chrome trace; returns their paths."""
+        import json
+        imports = {module: capture_importtime(module) for module in modules}
+        os.makedirs(directory, exist_ok=True)
+
+        trace = self.trace_events()
+        for pid, (module, entries) in enumerate(imports.items(), start=2):
+            trace.append({"name": "process_name", "ph": "M", "pid": pid,
+                          "args": {"name": f"import {module} (separate run)"}})
+            trace.extend(import_trace_events(entries, pid))
+        trace_path = os.path.join(directory, TRACE_FILE)
+        with open(trace_path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+        report_path = os.path.join(directory, REPORT_FILE)
+        with open(report_path, "w") as f:
+            f.write(self.report_text(imports))
+        return report_path, trace_path
+
+    def report_text(self, imports):
+        from datetime import datetime
+        lines = [f"PawFeeder startup profile, {datetime.now():%Y-%m-%d %H:%M:%S}", "",
+                 "Phases (ms since process start)",
+                 f"{'start':>9} {'took':>9}  phase"]
+        for event in sorted(self.events, key=lambda event: event["start_ns"]):
+            args = " ".join(f"{key}={value}" for key, value in event["args"].items())
+            lines.append(f"{(event['start_ns'] - self.origin_ns) / 1e6:9.1f} "
+                         f"{(event['end_ns'] - event['start_ns']) / 1e6:9.1f}  {event['name']} {args}".rstrip())
+
+        lines += ["", "Phase totals", f"{'count':>5} {'total':>9} {'longest':>9} {'budget':>7}  phase"]
+        for name, (count, total, longest) in self.summary().items():
+            budget = PHASE_BUDGETS_MS.get(name)
+            flag = "  OVER" if budget is not None and longest > budget else ""
+            lines.append(f"{count:5d} {total:9.1f} {longest:9.1f} {budget if budget else '-':>7}  {name}{flag}")
+
+        lines += ["", "Imports (each module in a fresh interpreter, -X importtime)",
+                  f"{'took':>9} {'budget':>7}  module"]
+        for module, entries in imports.items():
+            took = module_import_ms(entries, module)
+            budget = IMPORT_BUDGETS_MS.get(module)
+            flag = "  OVER" if budget is not None and took is not None and took > budget else ""
+            shown = "cannot import" if took is None else f"{took:9.1f}"
+            lines.append(f"{shown:>9} {budget if budget else '-':>7}  {module}{flag}")
+
+        # Shared modules are imported in every run; keep each once.
+        own = {}
+        for entries in imports.values():
+            for entry in entries:
+                own[entry["name"]] = max(own.get(entry["name"], 0), entry["self_us"])
+        slowest = sorted(own.items(), key=lambda item: item[1], reverse=True)[:15]
+        lines += ["", "Slowest modules by own time", f"{'self':>9}  module"]
+        lines += [f"{us / 1000:9.1f}  {name}" for name, us in slowest]
+        return "\n".join(lines) + "\n"
+
+
+# --- Import Times ---
+def capture_importtime(module):
+    """Parsed ``-X importtime`` output for importing module in a fresh interpreter.
+
+    Empty if the module cannot be imported (importtime lists failed
+    imports too).
+    """
+    import subprocess
+    code = f"try:\n    import {module}\nexcept ImportError:\n    pass\nelse:\n    print('imported')"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=os.getcwd())
+    if "imported" not in result.stdout:
+        return []
+    return parse_importtime(result.stderr)
+
+
+def parse_importtime(text):
+    """Entries {name, self_us, cumulative_us, depth} in the order Python printed them."""
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue    # the header line
+        name = parts[2][1:]
+        entries.append({
+            "name": name.strip(),
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+        })
+    return entries
+
+
+def module_import_ms(entries, module):
+    """Cumulative ms of the top-level import of module, or None if it failed."""
+    for entry in entries:
+        if entry["depth"] == 0 and entry["name"] == module:
+            return entry["cumulative_us"] / 1000
+    return None
+
+
+def import_trace_events(entries, pid):
+    """Lay the import tree out as trace events.
+
+    importtime prints each module after its imports, so the tree is
+    rebuilt from the depths; children are placed one after another from
+    the start of their parent.
+    """
+    pending = {}
+    for entry in entries:
+        node = dict(entry, children=pending.pop(entry["depth"] + 1, []))
+        pending.setdefault(entry["depth"], []).append(node)
+
+    events = []
+
+    def place(node, start):
+        events.append({"name": node["name"], "cat": "import", "ph": "X", "ts": start,
+                       "dur": node["cumulative_us"], "pid": pid, "tid": 1,
+                       "args": {"self_us": node["self_us"]}})
+        t = start
+        for child in node["children"]:
+            place(child, t)
+            t += child["cumulative_us"]
+
+    t = 0
+    for node in pending.get(0, []):
+        place(node, t)
+        t += node["cumulative_us"]
+    return events
+
+
+# --- Budget Check ---
+def trace_phase_max(path):
+    """{phase: longest ms} from a trace written by write_report()."""
+    import json
+    with open(path) as f:
+        trace = json.load(f)
+    longest = {}
+    for event in trace["traceEvents"]:
+        if event.get("cat") == "phase":
+            longest[event["name"]] = max(longest.get(event["name"], 0.0), event["dur"] / 1000)
+    return longest
+
+
+def over_budget(measured, budgets):
+    """(name, ms, budget) for each measurement over its budget."""
+    return [(name, ms, budgets[name]) for name, ms in measured.items()
+            if name in budgets and ms is not None and ms > budgets[name]]
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m pawfeeder.profiler",
+                                     description="Fail when startup imports or phases are over budget.")
+    parser.add_argument("--trace", default=os.path.join(PROFILE_DIR, TRACE_FILE),
+                        help="trace from --profile-startup whose phases to check (default: %(default)s)")
+    parser.add_argument("--modules", nargs="+", default=STARTUP_MODULES, help="modules to time")
+    parser.add_argument("--strict", action="store_true", help="fail when the trace is missing")
+    args = parser.parse_args(argv)
+
+    imports = {}
+    for module in args.modules:
+        imports[module] = module_import_ms(capture_importtime(module), module)
+        took = "cannot import" if imports[module] is None else f"{imports[module]:.1f} ms"
+        print(f"[PROFILE] import {module}: {took} (budget {IMPORT_BUDGETS_MS.get(module, '-')} ms)")
+    failed = [f"import {module} failed" for module, ms in imports.items() if ms is None]
+    failures = over_budget(imports, IMPORT_BUDGETS_MS)
+
+    if os.path.exists(args.trace):
+        phases = trace_phase_max(args.trace)
+        for name, ms in phases.items():
+            print(f"[PROFILE] {name}: {ms:.1f} ms (budget {PHASE_BUDGETS_MS.get(name, '-')} ms)")
+        failures += over_budget(phases, PHASE_BUDGETS_MS)
+    elif args.strict:
+        failed.append(f"no trace at {args.trace}; run Pawfeeder.py --profile-startup")
+    else:
+        print(f"[PROFILE] SKIPPED: phases, no trace at {args.trace}")
+
+    for name, ms, budget in failures:
+        print(f"[PROFILE] OVER BUDGET: {name} took {ms:.1f} ms, budget {budget} ms")
+    for reason in failed:
+        print(f"[PROFILE] FAILED: {reason}")
+    return 1 if failures or failed else 0
+
+
+# One profiler per process; enabled by --profile-startup
+profiler = StartupProfiler()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import math
+import threading
+import time
+from datetime import datetime
+
+from .writebehind import store
+
+# Constants
+RTC_SYNC_FILE = "pkl/rtc_sync.pkl"
+SAMPLE_COUNT = 7
+REPLY_TIMEOUT = 3.0
+DRIFT_TOLERANCE = 1.0                   # seconds of clock error allowed between syncs
+DEFAULT_RESYNC_INTERVAL = 24 * 3600     # until the drift of a device is known
+MIN_RESYNC_INTERVAL = 3600
+MAX_RESYNC_INTERVAL = 14 * 24 * 3600
+MIN_DRIFT_WINDOW = 600                  # shorter windows are dominated by read error
+DRIFT_SMOOTHING = 0.5                   # weight of the newest ppm estimate
+HISTORY_LENGTH = 20
+
+
+def parse_device_time(line):
+    """Parse '[GETTIME] YYYY-MM-DD HH:MM:SS' into a POSIX timestamp."""
+    try:
+        stamp = line.split("]", 1)[1].strip()
+        return datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S").timestamp()
+    except (IndexError, ValueError):
+        return None
+
+
+def measure_offset(link, samples=SAMPLE_COUNT):
+    """Estimate device clock minus host clock from a few GETTIME samples.
+
+    The DS1302 only reports whole seconds, so a reply showing second ``s``
+    sent between host times ``t0`` and ``t1`` means the offset lies in
+    ``[s - t1, s + 1 - t0]``. Samples are spread over one second and their
+    bounds intersected, NTP-style. If the bounds disagree (e.g. a tick was
+    missed) the sample with the shortest round trip is used on its own.
+    """
+    low, high = -math.inf, math.inf
+    best = None
+    for i in range(samples):
+        if i:
+            time.sleep(1.0 / samples)
+        reply = link.request("GETTIME", "[GETTIME]", REPLY_TIMEOUT)
+        if reply is None:
+            continue
+        line, sent_at, received_at = reply
+        device_time = parse_device_time(line)
+        if device_time is None:
+            continue
+        rtt = received_at - sent_at
+        low = max(low, device_time - received_at)
+        high = min(high, device_time + 1 - sent_at)
+        if best is None or rtt < best[0]:
+            best = (rtt, device_time, sent_at, received_at)
+
+    if best is None:
+        return None
+
+    rtt, device_time, sent_at, received_at = best
+    if low <= high:
+        offset = (low + high) / 2
+        error = (high - low) / 2
+    else:
+        offset = device_time + 0.5 - (sent_at + received_at) / 2
+        error = 0.5 + rtt / 2
+    return {"offset": offset, "error": error, "rtt": rtt}
+
+
+def set_device_time(link, rtt, correction=0):
+    """Send SETTIME so that it lands on a whole host second.
+
+    ``correction`` (whole seconds) is subtracted from the value sent, to
+    compensate for a device that applies the command late.
+    """
+    now = time.time()
+    target = math.floor(now) + 1
+    if target - rtt / 2 - now < 0.05:
+        target += 1
+    time.sleep(max(0.0, target - rtt / 2 - time.time()))
+
+    stamp = datetime.fromtimestamp(target - correction)
+    dow = stamp.isoweekday() % 7 + 1  # DS1302: 1=Sunday ... 7=Saturday
+    command = f"SETTIME:{stamp:%Y-%m-%d %H:%M:%S},{dow}"
+    reply = link.request(command, ("[SETTIME]", "[ERROR] Invalid SETTIME"), REPLY_TIMEOUT)
+    return reply is not None and reply[0].startswith("[SETTIME] OK")
+
+
+def sync_device(link, device_id):
+    """Measure the clock offset, set the device clock and record its drift."""
+    before = measure_offset(link)
+    if before is None:
+        print(f"[RTC SYNC] No GETTIME reply from {device_id}")
+        return None
+
+    if not set_device_time(link, before["rtt"]):
+        print(f"[RTC SYNC] SETTIME rejected or not supported by {device_id}")
+        return None
+
+    after = measure_offset(link)
+    if after is not None and abs(after["offset"]) >= 0.5:
+        # The sketch applied SETTIME late (it only reads serial once per
+        # loop); shift the value by the whole seconds it lost and re-check.
+        set_device_time(link, before["rtt"], correction=round(after["offset"]))
+        after = measure_offset(link) or after
+
+    now = time.time()
+    record = dict(store.get(RTC_SYNC_FILE, {}).get(device_id, {"drift_ppm": None, "history": []}))
+    drift_ppm = record["drift_ppm"]
+
+    if "synced_at" in record:
+        elapsed = now - record["synced_at"]
+        if elapsed >= MIN_DRIFT_WINDOW:
+            measured = (before["offset"] - record["residual"]) / elapsed * 1e6
+            if drift_ppm is None:
+                drift_ppm = measured
+            else:
+                drift_ppm = (1 - DRIFT_SMOOTHING) * drift_ppm + DRIFT_SMOOTHING * measured
+
+    residual = after["offset"] if after else 0.0
+    record.update({
+        "synced_at": now,
+        "residual": residual,
+        "drift_ppm": drift_ppm,
+    })
+    record["history"] = (record["history"] + [(now, before["offset"], drift_ppm)])[-HISTORY_LENGTH:]
+    store.update(RTC_SYNC_FILE, device_id, record)
+
+    drift_text = "unknown" if drift_ppm is None else f"{drift_ppm:+.1f} ppm"
+    print(f"[RTC SYNC] {device_id}: offset {before['offset']:+.2f}s "
+          f"(±{before['error']:.2f}s), residual {residual:+.2f}s, drift {drift_text}")
+    return record
+
+
+def resync_interval(drift_ppm):
+    """Seconds until a clock drifting at drift_ppm exceeds DRIFT_TOLERANCE."""
+    if not drift_ppm:
+        return DEFAULT_RESYNC_INTERVAL
+    interval = DRIFT_TOLERANCE / (abs(drift_ppm) * 1e-6)
+    return min(MAX_RESYNC_INTERVAL, max(MIN_RESYNC_INTERVAL, interval))
+
+
+def next_sync_delay(device_id):
+    """Seconds until the device should be re-synced (0 if it is overdue)."""
+    record = store.get(RTC_SYNC_FILE, {}).get(device_id)
+    if not record or "synced_at" not in record:
+        return 0
+    due = record["synced_at"] + resync_interval(record["drift_ppm"])
+    return max(0, due - time.time())
+
+
+class RtcSyncScheduler:
+    """Keeps one device's RTC in sync from a background thread."""
+
+    def __init__(self, link, device_id=None):
+        self.link = link
+        self.device_id = device_id or link.device_id
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        # A fresh event, so a restart after stop() is not stopped already.
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, stop):
+        while not stop.wait(next_sync_delay(self.device_id)):
+            try:
+                record = sync_device(self.link, self.device_id)
+            except Exception as e:
+                print("[ERROR] RTC sync failed:", e)
+                record = None
+            if record is None:
+                # Device busy or not answering; retry later.
+                stop.wait(MIN_RESYNC_INTERVAL)
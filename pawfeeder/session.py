@@ -0,0 +1,118 @@
+import hashlib
+import hmac
+import os
+import pickle
+import time
+
+from .credentials import credentials
+from .state import state
+
+# Constants
+SESSION_KEY = "session"
+# Outside pkl/, so a copy of the app's data folder cannot forge a login.
+KEY_FILE = os.path.join(os.path.expanduser("~"), ".pawfeeder", "session.key")
+LEGACY_KEY_FILE = "pkl/session.key"
+SESSION_LIFETIME = 0            # seconds a login is remembered; 0 asks every time
+CLOCK_SKEW = 300                # seconds a token may seem to come from the future
+
+
+class SessionTokens:
+    """Remembers a PIN login across relaunches for ``lifetime`` seconds.
+
+    Off by default (lifetime 0); ``--session-hours`` turns it on. After a login, ``issue()`` saves a token (issue and expiry time)
+    signed with HMAC-SHA256. The key is in KEY_FILE, readable by this
+    user only, and the signature also covers when the PIN was set, so
+    changing the PIN ends every session. ``resume()`` checks the token
+    at startup: a dict read and one HMAC, no scrypt.
+    """
+
+    def __init__(self, lifetime=SESSION_LIFETIME, key_file=KEY_FILE):
+        self.lifetime = lifetime
+        self.key_file = key_file
+        self.issued = 0
+        self.resumed = 0
+        self.expired = 0
+        self.rejected = 0
+        self.check_us = None
+        self._key = None
+
+    def issue(self):
+        """Remember the login that just happened."""
+        if self.lifetime <= 0:
+            return
+        now = time.time()
+        payload = {"issued": now, "expires": now + self.lifetime, "nonce": os.urandom(8)}
+        state.set(SESSION_KEY, {"payload": payload, "signature": self._sign(payload)})
+        self.issued += 1
+        print(f"[SESSION] Login remembered for {self.lifetime / 3600:g} h")
+
+    def resume(self):
+        """True if a valid, unexpired token is saved; a bad one is removed."""
+        started = time.perf_counter()
+        try:
+            return self._check()
+        finally:
+            self.check_us = (time.perf_counter() - started) * 1e6
+
+    def _check(self):
+        token = state.get(SESSION_KEY)
+        if token is None or not credentials.is_set():
+            return False
+        if self.lifetime <= 0:
+            self.end()      # remembered before sessions were turned off
+            return False
+        payload = token["payload"]
+        if not hmac.compare_digest(self._sign(payload), token["signature"]):
+            self.rejected += 1
+            print("[SESSION] Ignoring a session token signed for another key or PIN")
+            self.end()
+            return False
+        now = time.time()
+        # A clock set back could otherwise stretch the session.
+        if not payload["issued"] - CLOCK_SKEW <= now < min(payload["expires"], payload["issued"] + self.lifetime):
+            self.expired += 1
+            print("[SESSION] Session expired; PIN needed")
+            self.end()
+            return False
+        self.resumed += 1
+        print(f"[SESSION] Resumed the login from {time.strftime('%Y-%m-%d %H:%M', time.localtime(payload['issued']))}")
+        return True
+
+    def end(self):
+        state.delete(SESSION_KEY)
+
+    def _sign(self, payload):
+        message = pickle.dumps((payload["issued"], payload["expires"], payload["nonce"],
+                                credentials.generation()))
+        return hmac.new(self._signing_key(), message, hashlib.sha256).digest()
+
+    def _signing_key(self):
+        if self._key is None:
+            try:
+                with open(self.key_file, "rb") as f:
+                    self._key = f.read()
+            except FileNotFoundError:
+                self._key = create_key(self.key_file)
+        return self._key
+
+    def stats(self):
+        return {"issued": self.issued, "resumed": self.resumed, "expired": self.expired,
+                "rejected": self.rejected, "check_us": self.check_us}
+
+
+def create_key(path):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+    key = os.urandom(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    # Tokens signed with the old key in the data folder fail their check.
+    if os.path.exists(LEGACY_KEY_FILE):
+        os.remove(LEGACY_KEY_FILE)
+    return key
+
+
+# One session per app
+sessions = SessionTokens()
@@ -0,0 +1,120 @@
+import math
+
+from .controller import convert_to_24h_format
+
+# Constants
+DEFAULT_SLOTS = 5
+FIELDS = ("active", "hour", "minute", "ampm", "grams")
+
+
+def empty_slot():
+    return {"active": False, "hour": "", "minute": "", "ampm": "", "grams": ""}
+
+
+def slot_error(index, slot):
+    """Why an active slot cannot be scheduled, or None if it can."""
+    if not slot["active"]:
+        return None
+    if not slot["hour"] or not slot["minute"] or not slot["ampm"]:
+        return f"Please set a complete time for Time {index + 1}!"
+    if slot_time(slot) is None:
+        return f"Time {index + 1} is not a valid time."
+    if slot["grams"]:
+        try:
+            grams = float(slot["grams"])
+        except ValueError:
+            grams = 0
+        # float() also accepts "nan" and "inf".
+        if not math.isfinite(grams) or grams <= 0:
+            return f"The portion for Time {index + 1} must be a number of grams."
+    return None
+
+
+def slot_label(slot):
+    return f"{slot['hour']}:{slot['minute']} {slot['ampm']}"
+
+
+def slot_time(slot):
+    """24-hour 'HH:MM:SS' for a slot, or None."""
+    if not (slot["hour"].isdigit() and slot["minute"].isdigit()):
+        return None
+    if not (1 <= int(slot["hour"]) <= 12 and 0 <= int(slot["minute"]) <= 59):
+        return None
+    return convert_to_24h_format(f"{int(slot['hour'])}:{int(slot['minute']):02d} {slot['ampm']}")
+
+
+class SlotModel:
+    """The custom feeding times, any number of them.
+
+    Each change re-checks only the slot it touches; ``errors`` always
+    holds the current problem of every invalid active slot, so checking
+    the whole list costs nothing.
+    """
+
+    def __init__(self, count=DEFAULT_SLOTS):
+        self.slots = [empty_slot() for _ in range(count)]
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __getitem__(self, index):
+        return self.slots[index]
+
+    def add(self):
+        self.slots.append(empty_slot())
+        return len(self.slots) - 1
+
+    def remove(self, index):
+        del self.slots[index]
+        # Later slots move up one place, and their messages name the slot.
+        self.errors = {}
+        for i in range(len(self.slots)):
+            self._check(i)
+
+    def update(self, index, **fields):
+        self.slots[index].update(fields)
+        self._check(index)
+
+    def clear(self, count=DEFAULT_SLOTS):
+        self.slots = [empty_slot() for _ in range(count)]
+        self.errors = {}
+
+    def _check(self, index):
+        error = slot_error(index, self.slots[index])
+        if error:
+            self.errors[index] = error
+        else:
+            self.errors.pop(index, None)
+
+    @property
+    def valid(self):
+        return not self.errors
+
+    def first_error(self):
+        return self.errors[min(self.errors)] if self.errors else None
+
+    def is_empty(self):
+        return not any(slot["active"] or slot["hour"] or slot["minute"] or slot["ampm"] or slot["grams"]
+                       for slot in self.slots)
+
+    def entries(self):
+        """Active slots as (time_24h, grams or None, label), sorted by time.
+
+        A time set twice is kept once (the first slot wins). Returns the
+        entries and the number of duplicates dropped.
+        """
+        by_time = {}
+        duplicates = 0
+        for slot in self.slots:
+            if not slot["active"]:
+                continue
+            t = slot_time(slot)
+            if t is None:
+                continue
+            if t in by_time:
+                duplicates += 1
+                continue
+            grams = float(slot["grams"]) if slot["grams"] else None
+            by_time[t] = (t, grams, slot_label(slot))
+        return [by_time[t] for t in sorted(by_time)], duplicates
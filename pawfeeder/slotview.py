@@ -0,0 +1,141 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Value lists shared by every slot row
+HOURS_12H = [f"{i}" for i in range(1, 13)]
+MINUTES = [f"{i:02d}" for i in range(60)]
+AMPM = ["AM", "PM"]
+
+
+class SlotRow:
+    """One row of slot widgets; shows whichever slot it is bound to."""
+
+    def __init__(self, parent, view):
+        self.view = view
+        self.index = None
+        self._loading = False
+
+        self.active = tk.BooleanVar()
+        self.vars = {field: tk.StringVar() for field in ("hour", "minute", "ampm", "grams")}
+
+        self.frame = tk.Frame(parent, bg="white")
+        self.checkbox = tk.Checkbutton(self.frame, variable=self.active, bg="white", width=7, anchor="w",
+                                       font=("Helvetica", 10, "bold"), command=self.on_toggle)
+        self.checkbox.pack(side="left", padx=(0, 10))
+
+        widgets = [self.checkbox]
+        for text, field, values in (("Hour:", "hour", HOURS_12H), ("Minute:", "minute", MINUTES),
+                                    ("AM/PM:", "ampm", AMPM)):
+            tk.Label(self.frame, text=text, bg="white").pack(side="left", padx=5)
+            menu = ttk.Combobox(self.frame, textvariable=self.vars[field], values=values, width=3)
+            menu.pack(side="left", padx=5)
+            widgets.append(menu)
+
+        tk.Label(self.frame, text="Portion:", bg="white").pack(side="left", padx=5)
+        grams_entry = tk.Entry(self.frame, textvariable=self.vars["grams"], width=5)
+        grams_entry.pack(side="left")
+        tk.Label(self.frame, text="g", bg="white").pack(side="left", padx=(2, 5))
+        widgets.append(grams_entry)
+
+        remove_button = tk.Button(self.frame, text="✕", bg="white", fg="#f44336", relief="flat", bd=0,
+                                  cursor="hand2", command=lambda: view.remove_slot(self.index))
+        remove_button.pack(side="left", padx=5)
+        widgets.append(remove_button)
+
+        for field, var in self.vars.items():
+            var.trace_add("write", lambda *args, field=field: self.on_edit(field))
+        for widget in widgets + [self.frame]:
+            view.bind_wheel(widget)
+
+    def bind(self, index):
+        """Load slot ``index`` into the widgets without writing it back."""
+        self.index = index
+        slot = self.view.model[index]
+        self._loading = True
+        self.checkbox.config(text=f"Time {index + 1}:")
+        self.active.set(slot["active"])
+        for field, var in self.vars.items():
+            var.set(slot[field])
+        self._loading = False
+
+    def on_edit(self, field):
+        if not self._loading and self.index is not None:
+            self.view.model.update(self.index, **{field: self.vars[field].get()})
+
+    def on_toggle(self):
+        self.view.model.update(self.index, active=self.active.get())
+        self.view.on_toggle(self.index)
+
+
+class SlotListView(tk.Frame):
+    """Scrolling list of custom time slots over a SlotModel.
+
+    Only ``visible`` rows of widgets exist. Scrolling or adding slots
+    rebinds the pooled rows to other slots instead of creating widgets,
+    so 48 slots cost the same to show as 5.
+    """
+
+    def __init__(self, parent, model, visible=5, on_toggle=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.model = model
+        self.offset = 0
+        self.on_toggle = on_toggle or (lambda index: None)
+
+        rows_frame = tk.Frame(self, bg=kwargs.get("bg", "white"))
+        rows_frame.pack(side="left", fill="x")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="left", fill="y")
+
+        self.rows = []
+        for _ in range(visible):
+            row = SlotRow(rows_frame, self)
+            self.rows.append(row)
+
+        self.refresh()
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda event: self.scroll(-1))
+        widget.bind("<Button-5>", lambda event: self.scroll(1))
+
+    def refresh(self):
+        count = len(self.model)
+        self.offset = max(0, min(self.offset, count - len(self.rows)))
+        for i, row in enumerate(self.rows):
+            index = self.offset + i
+            if index < count:
+                row.bind(index)
+                row.frame.pack(pady=5, fill="x")
+            else:
+                row.index = None
+                row.frame.pack_forget()
+        if count:
+            self.scrollbar.set(self.offset / count, min(1.0, (self.offset + len(self.rows)) / count))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, rows):
+        offset = max(0, min(self.offset + rows, len(self.model) - len(self.rows)))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, what)."""
+        if args[0] == "moveto":
+            self.scroll(int(float(args[1]) * len(self.model)) - self.offset)
+        elif args[0] == "scroll":
+            step = len(self.rows) if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def add_slot(self):
+        index = self.model.add()
+        self.offset = max(0, index - len(self.rows) + 1)    # show the new slot
+        self.refresh()
+        return index
+
+    def remove_slot(self, index):
+        if index is None:
+            return
+        self.model.remove(index)
+        self.refresh()
@@ -0,0 +1,124 @@
+import os
+import pickle
+import threading
+
+from .storage import load_data, save_data
+
+# Constants
+STATE_FILE = "pkl/state.pkl"
+STATE_VERSION = 1
+# Files the state used to be spread over, migrated on first load
+LEGACY_FILES = {
+    "pin_code": "pkl/pin_code.pkl",
+    "email": "pkl/email.pkl",
+    "terms_accepted": "pkl/terms_accepted.pkl",
+}
+# Left by older versions and no longer read; the OTP in it is plain text
+STALE_FILES = ("pkl/otp.pkl",)
+
+
+class StateStore:
+    """The app's small state (PIN, email, terms) in one file.
+
+    The file is a versioned pickle, replaced atomically on every change.
+    Values are served from memory; the file is only read again when its
+    mtime shows another process changed it, so repeated checks cost a
+    stat() and no read. The old per-value files are deleted once their
+    values are in the state file, so no plain-text PIN is left behind.
+    """
+
+    def __init__(self, path=STATE_FILE, legacy_files=LEGACY_FILES, stale_files=STALE_FILES):
+        self.path = path
+        self.legacy_files = legacy_files
+        self.stale_files = stale_files
+        self.loads = 0
+        self._legacy_removed = False
+        self._data = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _current(self):
+        """The state dict, read from disk only if the file changed."""
+        stamp = self._stat()
+        if self._data is not None and stamp == self._stamp:
+            return self._data
+        if stamp is None:
+            self._data = self._migrate()
+        else:
+            try:
+                stored = load_data(self.path, {})
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                print("[STATE] Cannot read", self.path, e)
+                stored = {}
+            if stored.get("version", 0) > STATE_VERSION:
+                print(f"[STATE] {self.path} is from a newer version; reading what is known")
+            self._data = stored.get("data", {})
+            self.loads += 1
+        self._stamp = self._stat()
+        if not self._legacy_removed:
+            self._legacy_removed = True
+            self._remove_legacy(self._data)
+        return self._data
+
+    def _migrate(self):
+        """Gather the old one-pickle-per-value files into the new file."""
+        data = {}
+        for key, filename in self.legacy_files.items():
+            try:
+                value = load_data(filename)
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                print("[STATE] Skipping unreadable", filename, e)
+                continue
+            if value is not None:
+                data[key] = value
+        if data:
+            self._save(data)
+            print(f"[STATE] Migrated {', '.join(sorted(data))} into {self.path}")
+        return data
+
+    def _remove_legacy(self, data):
+        """Delete old files whose values are now kept in the state file."""
+        filenames = [filename for key, filename in self.legacy_files.items() if key in data]
+        for filename in filenames + list(self.stale_files):
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print("[STATE] Cannot remove", filename, e)
+                continue
+            print("[STATE] Removed the old", filename)
+
+    def _save(self, data):
+        save_data({"version": STATE_VERSION, "data": data}, self.path)
+        self._data = data
+        self._stamp = self._stat()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._current().get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            data = dict(self._current())
+            data[key] = value
+            self._save(data)
+
+    def delete(self, key):
+        with self._lock:
+            data = self._current()
+            if key in data:
+                data = dict(data)
+                del data[key]
+                self._save(data)
+
+
+# One store per process
+state = StateStore()
@@ -0,0 +1,29 @@
+import os
+import pickle
+
+
+# --- Data Handling ---
+def load_data(filename, default=None):
+    """Load a pickled value, or return default if the file does not exist."""
+    if os.path.exists(filename):
+        with open(filename, "rb") as file:
+            return pickle.load(file)
+    return default
+
+def save_data(data, filename, fsync=False):
+    """Pickle a value to filename, creating its folder if needed.
+
+    With fsync the data is on disk, not just handed to the OS, on return.
+    """
+    folder = os.path.dirname(filename)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    # Write a temporary file and swap it in, so a reader (or a crash
+    # mid-write) never sees a half-written pickle.
+    temp = f"{filename}.tmp"
+    with open(temp, "wb") as file:
+        pickle.dump(data, file)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(temp, filename)
@@ -0,0 +1,57 @@
+"""Benchmark for the write-behind store.
+
+    python -m pawfeeder.storebench [--edits 2000]
+
+times the caller's cost per edit against a synchronous save, in a
+temporary folder. Kept out of pawfeeder.writebehind so the runtime
+import stays small.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from .storage import save_data
+from .writebehind import WriteBehindStore
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pawfeeder.storebench",
+                                     description="Time an edit through the store against a direct save.")
+    parser.add_argument("--edits", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "schedules.pkl")
+        value = {f"COM{i}": ["08:00:00", "18:00:00"] for i in range(4)}
+
+        bench = WriteBehindStore(folder)
+        started = time.perf_counter()
+        for i in range(args.edits):
+            bench.update(filename, f"COM{i % 4}", ["08:00:00", f"18:{i % 60:02d}:00"])
+        edit_us = (time.perf_counter() - started) / args.edits * 1e6
+        started = time.perf_counter()
+        bench.flush()
+        flush_ms = (time.perf_counter() - started) * 1000
+        stats = bench.stats()
+        bench.close()
+
+        direct = {}
+        for fsync in (False, True):
+            runs = max(args.edits // 10, 1)
+            started = time.perf_counter()
+            for i in range(runs):
+                value["COM0"] = ["08:00:00", f"18:{i % 60:02d}:00"]
+                save_data(value, filename, fsync=fsync)
+            direct[fsync] = (time.perf_counter() - started) / runs * 1e6
+
+    print(f"[STORE] update(): {edit_us:.1f} us per edit on the calling thread; "
+          f"{stats['edits']} edit(s) saved in {stats['writes']} write(s) and {stats['syncs']} journal fsync(s), "
+          f"final flush {flush_ms:.1f} ms")
+    print(f"[STORE] save_data(): {direct[False]:.0f} us per edit, {direct[True]:.0f} us with fsync")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
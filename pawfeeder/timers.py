@@ -0,0 +1,203 @@
+import time
+from collections import deque
+
+# Constants
+TICK_MS = 10            # timer resolution
+WHEEL_SLOTS = 512       # one revolution is about 5 s; longer timers wait rounds
+LATENESS_SAMPLES = 600
+
+
+class Timer:
+    """A scheduled call; ``cancel()`` it or let its owner's destruction do it."""
+
+    __slots__ = ("wheel", "func", "args", "due_ms", "interval_ms", "tick", "owner", "active")
+
+    def __init__(self, wheel, func, args, due_ms, interval_ms, owner):
+        self.wheel = wheel
+        self.func = func
+        self.args = args
+        self.due_ms = due_ms
+        self.interval_ms = interval_ms
+        self.owner = owner
+        self.tick = None
+        self.active = True
+
+    def cancel(self):
+        self.wheel.cancel(self)
+
+
+class TimerWheel:
+    """Every one-shot and periodic UI timer, on one ``after`` chain.
+
+    Timers hash into WHEEL_SLOTS buckets by their due tick, so adding and
+    cancelling are O(1). The chain sleeps until the next bucket holding a
+    due timer instead of waking every tick, and stops when none are live.
+    A timer belongs to a widget and is cancelled when that widget is
+    destroyed, so a screen cannot leave a countdown running behind it.
+
+    Like the asset cache, the wheel follows the current Tk root: a new
+    root (the old one was destroyed) starts an empty wheel.
+    """
+
+    def __init__(self, tick_ms=TICK_MS, slots=WHEEL_SLOTS):
+        self.tick_ms = tick_ms
+        self.slots = [{} for _ in range(slots)]
+        self.root = None
+        self.live = 0
+        self.fired = 0
+        self.cancelled = 0
+        self.skipped = 0
+        self.lateness_ms = deque(maxlen=LATENESS_SAMPLES)
+        self._origin = time.monotonic()
+        self._tick = 0              # last tick processed
+        self._owners = {}           # widget path -> its live timers
+        self._after_id = None
+        self._wake_tick = None
+
+    def after(self, owner, delay_ms, func, *args):
+        """Call func(*args) once in delay_ms, unless owner is destroyed first."""
+        return self._add(owner, delay_ms, None, func, args)
+
+    def every(self, owner, interval_ms, func, *args):
+        """Call func(*args) every interval_ms while owner exists.
+
+        Runs are scheduled from the first due time, not from when the last
+        run ended, so they do not drift; runs missed while the loop was
+        blocked are skipped, not bunched up.
+        """
+        return self._add(owner, interval_ms, interval_ms, func, args)
+
+    def cancel(self, timer):
+        # Timers of an earlier root were already dropped by _attach().
+        if timer is None or not timer.active:
+            return
+        timer.active = False
+        self.slots[timer.tick % len(self.slots)].pop(timer, None)
+        owned = self._owners.get(str(timer.owner))
+        if owned is not None:
+            owned.discard(timer)
+        self.live -= 1
+        self.cancelled += 1
+
+    # --- Scheduling ---
+    def _add(self, owner, delay_ms, interval_ms, func, args):
+        self._attach(owner._root())
+        timer = Timer(self, func, args, self._now_ms() + delay_ms, interval_ms, owner)
+        key = str(owner)
+        if key not in self._owners:
+            self._owners[key] = set()
+            owner.bind("<Destroy>", lambda event, key=key, root=self.root: self._destroyed(event, key, root),
+                       add="+")
+        self._owners[key].add(timer)
+        self.live += 1
+        self._place(timer)
+        return timer
+
+    def _attach(self, root):
+        if root is self.root:
+            return
+        # Timers of a destroyed root cannot run any more; marking them
+        # inactive keeps a late cancel() off the new root's counts.
+        for slot in self.slots:
+            for timer in slot:
+                timer.active = False
+            slot.clear()
+        self._owners = {}
+        self._after_id = None
+        self._wake_tick = None
+        self.live = 0
+        self.root = root
+
+    def _place(self, timer):
+        # Round up: a timer never fires before its time.
+        timer.tick = max(-(-int(timer.due_ms) // self.tick_ms), self._tick + 1)
+        self.slots[timer.tick % len(self.slots)][timer] = None
+        self._arm(timer.tick)
+
+    def _arm(self, tick):
+        """Make sure the chain wakes at tick or earlier."""
+        if self._after_id is not None:
+            if self._wake_tick <= tick:
+                return
+            self.root.after_cancel(self._after_id)
+        delay_ms = max(int(tick * self.tick_ms - self._now_ms()) + 1, 0)
+        self._wake_tick = tick
+        self._after_id = self.root.after(delay_ms, self._run)
+
+    def _destroyed(self, event, key, root):
+        if str(event.widget) != key:
+            return      # a child's Destroy, seen through the toplevel's tags
+        if root is not self.root:
+            return      # a widget of an earlier root with the same path
+        for timer in list(self._owners.pop(key, ())):
+            self.cancel(timer)
+
+    def _now_ms(self):
+        return (time.monotonic() - self._origin) * 1000
+
+    # --- Firing ---
+    def _run(self):
+        self._after_id = None
+        now_tick = int(self._now_ms() // self.tick_ms)
+        first = self._tick + 1
+        ticks = range(first, first + min(now_tick - self._tick, len(self.slots)))
+        # Set first: timers placed by the callbacks go after now_tick.
+        self._tick = max(self._tick, now_tick)
+        # Each slot once, in tick order; after a long stall that covers the wheel.
+        for tick in ticks:
+            slot = self.slots[tick % len(self.slots)]
+            due = [timer for timer in slot if timer.tick <= now_tick]
+            for timer in due:
+                del slot[timer]
+                self._fire(timer)
+        self._arm_next()
+
+    def _fire(self, timer):
+        now_ms = self._now_ms()
+        self.lateness_ms.append(now_ms - timer.due_ms)
+        self.fired += 1
+        if timer.interval_ms is None:
+            timer.active = False
+            self.live -= 1
+            self._owners.get(str(timer.owner), set()).discard(timer)
+        try:
+            timer.func(*timer.args)
+        except Exception as e:
+            print("[ERROR] Timer callback failed:", e)
+        if timer.interval_ms is not None and timer.active:
+            timer.due_ms += timer.interval_ms
+            if timer.due_ms <= now_ms:
+                missed = int((now_ms - timer.due_ms) // timer.interval_ms) + 1
+                self.skipped += missed
+                timer.due_ms += missed * timer.interval_ms
+            self._place(timer)
+
+    def _arm_next(self):
+        """Wake at the next slot with a timer due this revolution."""
+        if self.live == 0:
+            return
+        count = len(self.slots)
+        for tick in range(self._tick + 1, self._tick + count + 1):
+            slot = self.slots[tick % count]
+            if slot and min(timer.tick for timer in slot) <= tick:
+                self._arm(tick)
+                return
+        # Every timer is a revolution or more away.
+        self._arm(self._tick + count)
+
+    def stats(self):
+        """Live timers and how late they fired, in milliseconds."""
+        samples = sorted(self.lateness_ms)
+        return {
+            "live": self.live,
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "skipped": self.skipped,
+            "mean_ms": sum(samples) / len(samples) if samples else None,
+            "p95_ms": samples[int(0.95 * (len(samples) - 1))] if samples else None,
+            "max_ms": samples[-1] if samples else None,
+        }
+
+
+# One wheel per process
+timers = TimerWheel()
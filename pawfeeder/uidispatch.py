@@ -0,0 +1,147 @@
+import queue
+import threading
+import time
+from collections import deque
+
+# Constants
+PUMP_INTERVAL_MS = 16     # about one frame
+FRAME_BUDGET_MS = 8       # time the pump may spend on callbacks per run
+LAG_SAMPLES = 600
+
+
+class DispatcherStopped(RuntimeError):
+    """The Tk side is gone; a ``call()`` can no longer be answered."""
+
+
+class UiDispatcher:
+    """Runs callables posted from worker threads on the Tk thread.
+
+    Tk widgets may only be touched from the thread running mainloop().
+    Workers call ``post()``; a single ``root.after`` pump drains the queue
+    in batches, stopping when the frame budget is used up so a burst of
+    updates cannot stall the window.
+
+    The pump also measures event-loop lag: how late each run starts
+    compared to when it was scheduled. It stops with ``stop()`` or when
+    the root is destroyed; workers waiting in ``call()`` are then woken.
+    """
+
+    def __init__(self, root, interval_ms=PUMP_INTERVAL_MS, budget_ms=FRAME_BUDGET_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.get_ident()
+        self._after_id = None
+        self._due = None
+        self._stopped = False
+        self._waiting = set()       # events of call()s not answered yet
+        self._waiting_lock = threading.Lock()
+        self.lag_ms = deque(maxlen=LAG_SAMPLES)
+        self.handled = 0
+
+    def start(self):
+        self._stopped = False
+        self._due = time.perf_counter()
+        self._after_id = self.root.after(0, self._pump)
+        self.root.bind("<Destroy>", self._destroyed, add="+")
+
+    def stop(self):
+        self._stopped = True
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass    # the root is already gone
+            self._after_id = None
+        with self._waiting_lock:
+            for done in self._waiting:
+                done.set()
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    def _destroyed(self, event):
+        if event.widget is self.root:
+            self._after_id = None
+            self.stop()
+
+    def post(self, func, *args):
+        """Run func(*args) on the Tk thread soon. Safe from any thread."""
+        self._queue.put((func, args))
+
+    def call(self, func, *args, timeout=None):
+        """Run func(*args) on the Tk thread and return its result.
+
+        Blocks the calling worker until done; called on the Tk thread it
+        just runs func. An exception from func is raised here. Raises
+        DispatcherStopped if the pump stops first and TimeoutError after
+        ``timeout`` seconds.
+        """
+        if threading.get_ident() == self._thread:
+            return func(*args)
+        if self._stopped:
+            raise DispatcherStopped("the window is closed")
+        result = {}
+        done = threading.Event()
+
+        def run():
+            try:
+                result["value"] = func(*args)
+            except Exception as e:
+                result["error"] = e
+            finally:
+                done.set()
+
+        with self._waiting_lock:
+            self._waiting.add(done)
+        try:
+            self.post(run)
+            if not done.wait(timeout):
+                raise TimeoutError(f"no answer from the Tk thread within {timeout} s")
+        finally:
+            with self._waiting_lock:
+                self._waiting.discard(done)
+        if "error" in result:
+            raise result["error"]
+        if "value" not in result:
+            raise DispatcherStopped("the window was closed before the call ran")
+        return result["value"]
+
+    def _pump(self):
+        started = time.perf_counter()
+        self.lag_ms.append(max(0.0, (started - self._due) * 1000))
+
+        # Always run at least one callback, then stop at the budget.
+        deadline = started + self.budget
+        while True:
+            try:
+                func, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print("[ERROR] UI callback failed:", e)
+            self.handled += 1
+            if time.perf_counter() >= deadline:
+                break
+
+        if self._stopped:     # a callback closed the window
+            return
+        self._due = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._pump)
+
+    def lag_stats(self):
+        """Event-loop lag over the recent pump runs, in milliseconds."""
+        samples = sorted(self.lag_ms)
+        if not samples:
+            return None
+        return {
+            "mean_ms": sum(samples) / len(samples),
+            "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+            "max_ms": samples[-1],
+            "pending": self._queue.qsize(),
+            "handled": self.handled,
+        }
@@ -0,0 +1,40 @@
+import os
+import time
+
+
+def rss_mb():
+    """Resident memory of this process in MB, or None where unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current; ru_maxrss is KB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if os.uname().sysname == "Darwin" else peak / 1e3
+
+
+class ProcessUsage:
+    """CPU and memory of this process, for comparing the GUI and the daemon."""
+
+    def __init__(self):
+        self.started_wall = self.last_wall = time.monotonic()
+        self.started_cpu = self.last_cpu = time.process_time()
+
+    def sample(self):
+        """CPU % since the previous sample and since start, and current memory."""
+        wall, cpu = time.monotonic(), time.process_time()
+        recent = (cpu - self.last_cpu) / max(wall - self.last_wall, 1e-9) * 100
+        overall = (cpu - self.started_cpu) / max(wall - self.started_wall, 1e-9) * 100
+        self.last_wall, self.last_cpu = wall, cpu
+        return {"cpu_percent": recent, "avg_cpu_percent": overall, "rss_mb": rss_mb()}
+
+    def report(self):
+        usage = self.sample()
+        memory = "unknown" if usage["rss_mb"] is None else f"{usage['rss_mb']:.1f} MB"
+        return (f"cpu {usage['cpu_percent']:.2f}% (avg {usage['avg_cpu_percent']:.2f}%), "
+                f"memory {memory}")
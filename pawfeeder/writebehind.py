@@ -0,0 +1,441 @@
+"""Write-behind persistence for the controller's pickles.
+
+What survives what: a change is in the OS once ``update()`` returns, so
+it survives the process dying. The writer thread fsyncs the journal
+right behind the edits, so a power cut loses at most the changes of the
+last few milliseconds; saved files are always fsync'd. The benchmark is
+``python -m pawfeeder.storebench``.
+"""
+import atexit
+import glob
+import itertools
+import os
+import pickle
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+from .storage import load_data, save_data
+
+# Constants
+STORE_DIR = "pkl"
+JOURNAL_PATTERN = "journal.{pid}-{n}.log"  # one per store, locked by journal.<pid>-<n>.lock
+STORE_LOCK = "store.lock"               # held while merging and saving files
+FLUSH_DELAY = 1.0                       # seconds changes are gathered before a write
+MAX_PENDING_BYTES = 256 * 1024          # journal size that forces a write right away
+
+
+class WriteBehindStore:
+    """The controller's pickles, cached in memory and written in the background.
+
+    ``update()`` changes the cached value and appends the change to this
+    process's journal, which is all the calling thread pays for. A writer
+    thread saves the changed files (atomically, fsync'd) once changes
+    have settled for FLUSH_DELAY or the journal passes MAX_PENDING_BYTES.
+    ``flush()`` waits until everything changed so far is on disk.
+
+    Several processes (the GUI and a CLI one-shot, say) can share the
+    files. Each keeps its own journal and holds a lock on it while
+    running; only journals whose lock is free, left by a process that
+    died, are replayed. Before saving, a file another process changed
+    meanwhile is read again and this process's changed keys applied on
+    top; a whole value replaced by ``put()`` is not saved over another
+    process's newer write.
+
+    Values returned by ``get()`` are shared; pass changed copies to
+    ``update()`` instead of editing them in place.
+    """
+
+    def __init__(self, folder=STORE_DIR, delay=FLUSH_DELAY, max_pending=MAX_PENDING_BYTES):
+        self.folder = folder
+        self.journal_file = os.path.join(folder, JOURNAL_PATTERN.format(pid=os.getpid(), n=next(_instances)))
+        self.store_lock = os.path.join(folder, STORE_LOCK)
+        self.delay = delay
+        self.max_pending = max_pending
+        self.files = {}         # filename -> cached value
+        self.stamps = {}        # filename -> (mtime, size) last read or written
+        self.dirty = {}         # filename -> keys changed, or None if replaced whole
+        self.shared = set()     # files whose current value is out (get, writer)
+        self.pending_bytes = 0
+        self.edits = 0
+        self.writes = 0
+        self.syncs = 0
+        self.merges = 0
+        self.refused = 0
+        self._journal = None
+        self._journal_lock = None
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._changed_at = 0.0
+        self._version = 0       # bumped by every update
+        self._synced = 0        # version whose journal record is fsync'd
+        self._saved = 0         # version known to be on disk
+        self._saved_cond = threading.Condition(self._lock)
+        self._writer = None
+        self._closed = False
+        self._recovered = False
+
+    # --- Reading ---
+    def get(self, filename, default=None):
+        """The file's value, or default if it does not exist (not cached)."""
+        with self._lock:
+            self._recover()
+            if filename in self.dirty:
+                self._merge(filename)
+            elif self._stale(filename) and not self._load(filename):
+                return default
+            self.shared.add(filename)
+            return self.files[filename]
+
+    def _stale(self, filename):
+        # Another process (a CLI one-shot, say) may have written the file.
+        return filename not in self.files or stamp(filename) != self.stamps.get(filename)
+
+    def _load(self, filename):
+        """Read a file into the cache. False, with nothing cached, if it does not exist."""
+        file_stamp = stamp(filename)
+        if file_stamp is None:
+            self.files.pop(filename, None)
+            self.stamps.pop(filename, None)
+            return False
+        self.files[filename] = load_data(filename)
+        self.stamps[filename] = file_stamp
+        return True
+
+    # --- Writing ---
+    def update(self, filename, key, value):
+        """Set ``value[key]`` in a dict-valued file."""
+        self._change(filename, key, value)
+
+    def put(self, filename, value):
+        """Replace the whole value of a file."""
+        self._change(filename, None, value)
+
+    def _change(self, filename, key, value):
+        record = pickle.dumps((filename, key, value))
+        with self._lock:
+            self._recover()
+            if filename in self.dirty:
+                self._merge(filename)
+            elif self._stale(filename) and not self._load(filename):
+                # A new file; the stamp None is what the disk has until it is saved.
+                self.files[filename] = {} if key is not None else None
+                self.stamps[filename] = None
+            self._apply(filename, key, value)
+            if self._journal is None:
+                self._open_journal()
+            self._journal.write(record)
+            # Into the OS now: survives the process dying. The writer
+            # thread fsyncs it against power loss.
+            self._journal.flush()
+            self.pending_bytes += len(record)
+            self.edits += 1
+            self._version += 1
+            self._changed_at = time.monotonic()
+            self._start_writer()
+            self._wake.notify()
+
+    def _apply(self, filename, key, value):
+        if key is None:
+            self.files[filename] = value
+            self.shared.add(filename)
+            self.dirty[filename] = None
+            return
+        # Copy only a value someone else may hold; otherwise edit in place.
+        if filename in self.shared or self.files.get(filename) is None:
+            self.files[filename] = dict(self.files.get(filename) or {})
+            self.shared.discard(filename)
+        self.files[filename][key] = value
+        keys = self.dirty.setdefault(filename, set())
+        if keys is not None:
+            keys.add(key)
+
+    def _merge(self, filename):
+        """Bring a changed file up to date with the disk. Lock held.
+
+        Returns False if a whole-value change must not be saved because
+        another process wrote the file after this one read it.
+        """
+        disk_stamp = stamp(filename)
+        if disk_stamp == self.stamps.get(filename):
+            return True
+        keys = self.dirty[filename]
+        if keys is None:
+            print(f"[STORE] {filename} was changed by another process; not saving over it")
+            self.files[filename] = load_data(filename)
+            self.stamps[filename] = disk_stamp
+            self.shared.add(filename)
+            del self.dirty[filename]
+            self.refused += 1
+            return False
+        merged = dict(load_data(filename, None) or {})
+        for key in keys:
+            merged[key] = self.files[filename][key]
+        self.files[filename] = merged
+        self.stamps[filename] = disk_stamp
+        self.shared.discard(filename)
+        self.merges += 1
+        return True
+
+    def _open_journal(self):
+        os.makedirs(self.folder, exist_ok=True)
+        if self._journal_lock is None:
+            # Taken before the journal exists: a journal whose lock is free
+            # belongs to a process that is gone.
+            self._journal_lock = open(self.journal_file[:-len(".log")] + ".lock", "a+b")
+            lock_file(self._journal_lock)
+        self._journal = open(self.journal_file, "ab")
+
+    # --- Background writer ---
+    def _start_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="write-behind", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        with self._lock:
+            while not self._closed:
+                if self._journal is not None and self._synced < self._version:
+                    self._sync_journal()
+                    continue
+                if not self.dirty:
+                    self._wake.wait()
+                    continue
+                wait = self._changed_at + self.delay - time.monotonic()
+                if wait > 0 and self.pending_bytes < self.max_pending:
+                    self._wake.wait(wait)
+                    continue
+                self._write_dirty()
+
+    def _sync_journal(self):
+        """fsync the journal without holding up edits. Called with the lock held."""
+        version = self._version
+        # A duplicate descriptor stays valid if the journal is rotated meanwhile.
+        fd = os.dup(self._journal.fileno())
+        self._lock.release()
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            print("[STORE] Cannot sync the journal:", e)
+        finally:
+            os.close(fd)
+            self._lock.acquire()
+        self._synced = max(self._synced, version)
+        self.syncs += 1
+
+    def _write_dirty(self):
+        """Save the changed files. Called with the lock held; drops it while writing."""
+        # Other processes merge and save under the same file lock; wait for
+        # it without holding up this process's edits.
+        self._lock.release()
+        try:
+            shared_lock = open(self.store_lock, "a+b")
+            lock_file(shared_lock, wait=True)
+        finally:
+            self._lock.acquire()
+        try:
+            self._save_dirty()
+        finally:
+            unlock_file(shared_lock)
+            shared_lock.close()
+
+    def _save_dirty(self):
+        """Merge, snapshot and save the dirty files. Both locks held."""
+        version = self._version
+        keys = {filename: self.dirty[filename] for filename in list(self.dirty)
+                if self._merge(filename)}
+        snapshot = {filename: self.files[filename] for filename in keys}
+        self.shared.update(snapshot)    # pickled below without the lock
+        self.dirty = {}
+        self.pending_bytes = 0
+        # Later changes go to a fresh journal; the old one is removed once
+        # the files it covers are safely written.
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            rotate_journal(self.journal_file)
+
+        self._lock.release()
+        try:
+            for filename, value in snapshot.items():
+                save_data(value, filename, fsync=True)
+            stamps = {filename: stamp(filename) for filename in snapshot}
+            if os.path.exists(self.journal_file + ".old"):
+                os.remove(self.journal_file + ".old")
+        except OSError as e:
+            print("[STORE] Cannot save, will retry:", e)
+            stamps = None
+        finally:
+            self._lock.acquire()
+
+        if stamps is None:
+            # The old journal stays until a later write succeeds.
+            for filename, changed in keys.items():
+                current = self.dirty.get(filename, set())
+                if changed is None or current is None:
+                    self.dirty[filename] = None
+                else:
+                    self.dirty[filename] = current | changed
+            self._changed_at = time.monotonic()
+            return
+        for filename, value in stamps.items():
+            # A file changed again meanwhile is merged against this stamp.
+            self.stamps[filename] = value
+        self.writes += 1
+        self._saved = max(self._saved, version)
+        self._saved_cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until every change made before the call is on disk."""
+        with self._lock:
+            target = self._version
+            if self._saved >= target:
+                return True
+            self._changed_at = 0.0      # no more gathering
+            self._wake.notify()
+            return self._saved_cond.wait_for(lambda: self._saved >= target, timeout)
+
+    def close(self, timeout=10.0):
+        saved = self.flush(timeout)
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if saved and self._journal_lock is not None:
+                # Everything is saved: nothing left for a later run to replay.
+                for path in (self.journal_file, self.journal_file + ".old"):
+                    if os.path.exists(path):
+                        os.remove(path)
+                release_journal_lock(self._journal_lock)
+                self._journal_lock = None
+
+    # --- Recovery ---
+    def _recover(self):
+        """Apply changes that processes which died left in their journals. Lock held."""
+        if self._recovered:
+            return
+        self._recovered = True
+        orphans = []
+        for base in sorted({path.split(".log")[0] for path in
+                            glob.glob(os.path.join(self.folder, "journal*.log*"))}):
+            owner = open(base + ".lock", "a+b")
+            try:
+                lock_file(owner)
+            except OSError:
+                owner.close()       # its process is still running
+                continue
+            orphans.append((base, owner))
+        if not orphans:
+            return
+
+        shared_lock = open(self.store_lock, "a+b")
+        lock_file(shared_lock, wait=True)
+        try:
+            replayed = 0
+            for base, _ in orphans:
+                for path in (base + ".log.old", base + ".log"):
+                    for filename, key, value in read_journal(path):
+                        if filename not in self.files:
+                            self.files[filename] = load_data(filename, {} if key is not None else None)
+                        self._apply(filename, key, value)
+                        replayed += 1
+            if replayed:
+                print(f"[STORE] Recovered {replayed} unsaved change(s) from the journal")
+                for filename in self.dirty:
+                    save_data(self.files[filename], filename, fsync=True)
+                    self.stamps[filename] = stamp(filename)
+                self.dirty = {}
+            for base, owner in orphans:
+                for path in (base + ".log.old", base + ".log"):
+                    if os.path.exists(path):
+                        os.remove(path)
+                release_journal_lock(owner)
+        finally:
+            unlock_file(shared_lock)
+            shared_lock.close()
+
+    def stats(self):
+        return {"edits": self.edits, "writes": self.writes, "syncs": self.syncs,
+                "pending": len(self.dirty), "merges": self.merges, "refused": self.refused}
+
+
+def stamp(filename):
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+_instances = itertools.count()
+
+
+# --- File Locks ---
+def lock_file(file, wait=False):
+    """Exclusive lock on an open file; OSError if another process has it and not wait."""
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK if wait else msvcrt.LK_NBLCK, 1)
+
+
+def unlock_file(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def release_journal_lock(file):
+    """Unlock, close and remove a journal's lock file."""
+    path = file.name
+    unlock_file(file)
+    file.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass    # another process has it open (Windows); it is removed later
+
+
+# --- Journal Files ---
+def rotate_journal(path):
+    """Move the journal to <path>.old, appending if an earlier one is still there."""
+    old = path + ".old"
+    if not os.path.exists(old):
+        os.replace(path, old)
+        return
+    with open(old, "ab") as target, open(path, "rb") as source:
+        target.write(source.read())
+    os.remove(path)
+
+
+def read_journal(path):
+    """Records in a journal file; a torn last record (crash mid-append) is skipped."""
+    records = []
+    try:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    records.append(pickle.load(f))
+                except EOFError:
+                    break
+                except (pickle.UnpicklingError, ValueError, AttributeError):
+                    print(f"[STORE] Ignoring a damaged record at the end of {path}")
+                    break
+    except FileNotFoundError:
+        pass
+    return records
+
+
+# One store per process, saved on exit
+store = WriteBehindStore()
+atexit.register(store.close)
@@ -1,11 +1,8 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, PhotoImage
-import pickle
-import os
+from tkinter import ttk, messagebox
 from accesspin import App  # Import App from accesspin.py
-
-# Constants
-TERMS_FILE = "pkl/terms_accepted.pkl"
+from pawfeeder.assets import assets
+from pawfeeder.state import state
 
 # Styles
 APP_WIDTH, APP_HEIGHT = 500, 600
@@ -20,41 +17,37 @@ SMALL_FONT = ("Segoe UI", 10)
 # Load and Save Terms Functions
 def load_terms():
     """Load the terms accepted status."""
-    if os.path.exists(TERMS_FILE):
-        with open(TERMS_FILE, "rb") as file:
-            return pickle.load(file)
-    return False
+    return state.get("terms_accepted", False)
 
 def save_terms():
     """Save that the terms were accepted."""
-    with open(TERMS_FILE, "wb") as file:
-        pickle.dump(True, file)
+    state.set("terms_accepted", True)
 
 # Terms and Conditions Screen
-class TermsApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
+class TermsFrame(tk.Frame):
+    """The terms screen, shown in the given root window.
+
+    ``on_accept()`` is called once the terms are accepted and saved.
+    """
+
+    def __init__(self, master, on_accept):
+        super().__init__(master, bg=BACKGROUND_COLOR)
+        self.on_accept = on_accept
 
         #  Window settings
-        self.geometry(f"{APP_WIDTH}x{APP_HEIGHT}")
-        self.title("PawFeeder: Terms and Conditions")
-        self.configure(bg=BACKGROUND_COLOR)
-        self.resizable(False, False)
-
-        # Fix: Set icon properly
-        try:
-            img = tk.PhotoImage(file='icons/pawfeeder.png')
-            self.iconphoto(False, img)  # Correct usage
-        except Exception as e:
-            print("Icon not found:", e)
+        master.title("PawFeeder: Terms and Conditions")
+        master.configure(bg=BACKGROUND_COLOR)
+        master.resizable(False, False)
+
+        assets.set_window_icon(master)
 
         # Center the window
-        self.update_idletasks()
-        screen_width = self.winfo_screenwidth()
-        screen_height = self.winfo_screenheight()
+        screen_width = master.winfo_screenwidth()
+        screen_height = master.winfo_screenheight()
         x = (screen_width - APP_WIDTH) // 2
         y = (screen_height - APP_HEIGHT) // 2
-        self.geometry(f"{APP_WIDTH}x{APP_HEIGHT}+{x}+{y}")
+        master.geometry(f"{APP_WIDTH}x{APP_HEIGHT}+{x}+{y}")
+        self.pack(expand=True, fill="both")
 
         # Terms Title
         tk.Label(self, text="Terms and Conditions", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=HEADER_FONT).pack(pady=30)
@@ -128,7 +121,7 @@ class TermsApp(tk.Tk):
         self.accept_var.trace("w", self.toggle_accept_button)
 
         
-        # Inside the TermsApp, apply bold tags to specific sections
+        # Inside the TermsFrame, apply bold tags to specific sections
         self.text.tag_configure("bold", font=("Segui UI", 14, "bold"))
 
         # Insert the terms text
@@ -197,20 +190,12 @@ class TermsApp(tk.Tk):
     def accept_terms(self):
         save_terms()
         self.destroy()
-        root = tk.Tk()
-        app = App(root)
-        root.mainloop()
-
-
-    def show_pin_screen(self):
-        """Launch PIN app."""
-        app = App()  # Create an instance of the App class from accesspin.py
-        app.mainloop()  # Start the PIN application
+        self.on_accept()
 
 if __name__ == "__main__":
+    root = tk.Tk()
     if load_terms():
-        root = tk.Tk()
         app = App(root)  # Pass root as master
-        root.mainloop()
     else:
-        TermsApp().mainloop()
+        TermsFrame(root, on_accept=lambda: App(root))
+    root.mainloop()
@@ -0,0 +1,11 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test in an empty folder with a pkl/ in it, like the app's."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("pkl")
+    return tmp_path
@@ -0,0 +1,37 @@
+import pytest
+
+from pawfeeder.calibration import fit_line, grams_to_ms, ms_to_grams
+
+
+def test_exact_line():
+    model = fit_line([(1000, 12.0), (2000, 22.0), (3000, 32.0)])
+    assert model["slope"] == pytest.approx(0.01)
+    assert model["intercept"] == pytest.approx(2.0)
+    assert model["r2"] == pytest.approx(1.0)
+
+
+def test_noisy_samples():
+    model = fit_line([(1000, 11.0), (2000, 23.0), (3000, 31.0)])
+    assert model["slope"] == pytest.approx(0.01)
+    assert model["intercept"] == pytest.approx(5 / 3)
+    assert 0.9 < model["r2"] < 1.0
+
+
+def test_one_run_time_goes_through_the_origin():
+    assert fit_line([(2000, 20.0)]) == {"slope": 0.01, "intercept": 0.0, "r2": None}
+    model = fit_line([(2000, 19.0), (2000, 21.0)])
+    assert model["slope"] == pytest.approx(0.01)
+    assert model["intercept"] == 0.0
+
+
+def test_no_samples():
+    assert fit_line([]) is None
+
+
+def test_grams_and_ms_round_trip():
+    model = {"slope": 0.01, "intercept": 2.0}
+    assert grams_to_ms(model, 22.0) == 2000
+    assert ms_to_grams(model, 2000) == pytest.approx(22.0)
+    # Clamped to the device limits.
+    assert grams_to_ms(model, 0.5, {"min_portion_ms": 100}) == 100
+    assert grams_to_ms(model, 1000.0, {"max_portion_ms": 5000}) == 5000
@@ -0,0 +1,90 @@
+import os
+import time
+
+import pytest
+
+import pawfeeder.credentials as credentials_module
+from pawfeeder.credentials import PIN_KEY, PinCredentials
+from pawfeeder.state import STATE_FILE, StateStore
+from pawfeeder.storage import save_data
+
+PIN = "482913"
+
+
+def fast_params(target_ms=None):
+    # Real calibration aims at 200 ms per check; the tests need many.
+    return {"n": 2 ** 10, "r": 8, "p": 1, "verify_ms": 1.0, "calibrated_at": time.time()}
+
+
+@pytest.fixture
+def state(workdir, monkeypatch):
+    state = StateStore()
+    monkeypatch.setattr(credentials_module, "state", state)
+    monkeypatch.setattr(credentials_module, "calibrate", fast_params)
+    return state
+
+
+def state_bytes():
+    with open(STATE_FILE, "rb") as f:
+        return f.read()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_pin_is_stored_as_a_hash(state):
+    credentials = PinCredentials()
+    credentials.set_pin(PIN)
+    record = state.get(PIN_KEY)
+    assert record["kdf"] == "scrypt"
+    assert PIN.encode() not in state_bytes()
+
+
+def test_check(state):
+    credentials = PinCredentials()
+    assert not credentials.check(PIN)
+    credentials.set_pin(PIN)
+    assert credentials.check(PIN)
+    assert not credentials.check("000000")
+
+
+def test_failed_checks_are_not_cached(state):
+    credentials = PinCredentials()
+    credentials.set_pin(PIN)
+    assert not credentials.check("000000")
+    assert not credentials.check("000000")
+    assert credentials.check(PIN)
+    assert credentials.check(PIN)
+    assert credentials.cache_hits == 1
+
+
+def test_new_pin_ends_the_old_one(state):
+    credentials = PinCredentials()
+    credentials.set_pin(PIN)
+    assert credentials.check(PIN)
+    first = credentials.generation()
+    time.sleep(0.01)
+    credentials.set_pin("111111")
+    assert not credentials.check(PIN)
+    assert credentials.generation() != first
+
+
+def test_legacy_plain_pin_is_migrated_and_rehashed(state):
+    save_data(PIN, "pkl/pin_code.pkl")
+    save_data("123456", "pkl/otp.pkl")
+    credentials = PinCredentials()
+
+    assert state.get(PIN_KEY) == PIN
+    # The old files are gone once the value is in the state file.
+    assert not os.path.exists("pkl/pin_code.pkl")
+    assert not os.path.exists("pkl/otp.pkl")
+
+    credentials.upgrade_plain()
+    wait_for(lambda: isinstance(state.get(PIN_KEY), dict))
+    assert PIN.encode() not in state_bytes()
+    assert credentials.check(PIN)
+    assert not credentials.check("000000")
@@ -0,0 +1,54 @@
+import struct
+from datetime import datetime
+
+from pawfeeder.dispenselog import CHECK_SEED, RECORD_FORMAT, RECORD_SIZE, parse_record
+
+
+def record_line(seq=7, timestamp=1700000000, trigger=1, amount=1500, check=None):
+    """A '[LOG] <hex>' line as the firmware prints it (see dispense_log.h)."""
+    raw = bytearray(struct.pack(RECORD_FORMAT, seq, timestamp, trigger, 0, amount))
+    if check is None:
+        check = CHECK_SEED
+        for i, byte in enumerate(raw):
+            if i != 9:
+                check ^= byte
+    raw[9] = check
+    return "[LOG] " + raw.hex()
+
+
+def test_valid_record():
+    assert parse_record(record_line()) == {
+        "seq": 7,
+        "time": datetime(2023, 11, 14, 22, 13, 20),
+        "trigger": "manual",
+        "portion_ms": 1500,
+    }
+
+
+def test_unknown_trigger_is_kept_as_a_number():
+    assert parse_record(record_line(trigger=9))["trigger"] == "9"
+
+
+def test_flipped_byte_is_rejected():
+    line = record_line()
+    damaged = line[:-2] + ("00" if line[-2:] != "00" else "01")
+    assert parse_record(damaged) is None
+
+
+def test_erased_slot_is_rejected():
+    # An all-zero slot would pass a plain XOR; the seed makes it fail.
+    assert parse_record("[LOG] " + "00" * RECORD_SIZE) is None
+    assert parse_record("[LOG] " + "ff" * RECORD_SIZE) is None
+
+
+def test_unseeded_check_is_rejected():
+    line = record_line()
+    check = int(line[6 + 18:6 + 20], 16)
+    assert parse_record(record_line(check=check ^ CHECK_SEED)) is None
+
+
+def test_malformed_lines():
+    assert parse_record("[LOG]") is None
+    assert parse_record("[LOG] zz") is None
+    assert parse_record(record_line()[:-2]) is None
+    assert parse_record("no bracket") is None
@@ -0,0 +1,52 @@
+import math
+
+from pawfeeder.downsample import lttb, min_max
+
+
+def series(n):
+    xs = list(range(n))
+    ys = [math.sin(x / 10) for x in xs]
+    return xs, ys
+
+
+def test_lttb_keeps_everything_when_short():
+    xs, ys = series(10)
+    assert lttb(xs, ys, 10) == list(range(10))
+    assert lttb(xs, ys, 50) == list(range(10))
+    assert lttb(xs, ys, 2) == list(range(10))
+
+
+def test_lttb_keeps_threshold_points_in_order():
+    xs, ys = series(1000)
+    keep = lttb(xs, ys, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 999
+    assert keep == sorted(set(keep))
+
+
+def test_lttb_keeps_a_spike():
+    xs, ys = series(1000)
+    ys[500] = 50.0
+    assert 500 in lttb(xs, ys, 50)
+
+
+def test_min_max_keeps_everything_when_short():
+    xs, ys = series(10)
+    assert min_max(xs, ys, 5) == list(range(10))
+    assert min_max(xs, ys, 0) == list(range(10))
+
+
+def test_min_max_keeps_extremes_of_each_bucket():
+    xs, ys = series(1000)
+    ys[123], ys[777] = 50.0, -50.0
+    keep = min_max(xs, ys, 20)
+    assert len(keep) <= 40
+    assert keep == sorted(set(keep))
+    assert 123 in keep and 777 in keep
+
+
+def test_min_max_with_uneven_spacing():
+    xs = [0, 1, 2, 3, 100, 101, 102, 103]
+    ys = [0, 5, 1, 2, 7, 3, 9, 4]
+    keep = min_max(xs, ys, 2)
+    assert keep == [0, 1, 5, 6]
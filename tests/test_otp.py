@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from pawfeeder import otp
+from pawfeeder.otp import EXPIRED, LOCKED, MISSING, VALID, WRONG, OtpService
+from pawfeeder.writebehind import WriteBehindStore
+
+
+@pytest.fixture
+def store(workdir, monkeypatch):
+    store = WriteBehindStore("pkl")
+    monkeypatch.setattr(otp, "store", store)
+    yield store
+    store.close()
+
+
+def wrong(code):
+    return str((int(code) + 1) % 10 ** len(code)).zfill(len(code))
+
+
+def test_valid_code_is_used_up(store):
+    service = OtpService()
+    code = service.issue("register:a@example.com", data="a@example.com")
+    assert service.verify("register:a@example.com", code) == (VALID, "a@example.com")
+    assert service.verify("register:a@example.com", code) == (MISSING, None)
+
+
+def test_code_is_not_stored_in_plain_text(store):
+    service = OtpService()
+    code = service.issue("reset")
+    assert store.flush(timeout=5)
+    with open(otp.OTP_FILE, "rb") as f:
+        assert code.encode() not in f.read()
+
+
+def test_wrong_guesses_lock_the_code(store):
+    service = OtpService(max_attempts=3)
+    code = service.issue("reset")
+    assert service.verify("reset", wrong(code)) == (WRONG, None)
+    assert service.verify("reset", wrong(code)) == (WRONG, None)
+    assert service.attempts_left("reset") == 1
+    assert service.verify("reset", wrong(code)) == (LOCKED, None)
+    assert service.verify("reset", code) == (MISSING, None)
+
+
+def test_expired_code_is_refused(store):
+    service = OtpService()
+    code = service.issue("reset", ttl=0.01)
+    time.sleep(0.02)
+    assert service.verify("reset", code) == (EXPIRED, None)
+
+
+def test_expired_codes_are_purged(store):
+    service = OtpService()
+    service.issue("old", ttl=0.01)
+    code = service.issue("new")
+    time.sleep(0.02)
+    service.verify("new", wrong(code))
+    assert service.stats()["purged"] == 1
+    assert service.stats()["pending"] == 1
+
+
+def test_replaced_code_leaves_no_stale_expiry(store):
+    service = OtpService()
+    service.issue("reset", ttl=0.01)
+    code = service.issue("reset")
+    time.sleep(0.02)
+    assert service.verify("reset", code)[0] == VALID
+    assert service.stats()["purged"] == 0
+
+
+def test_pending_code_survives_a_restart(store):
+    code = OtpService().issue("reset", data="payload")
+    assert OtpService().verify("reset", code) == (VALID, "payload")
+
+
+def test_attempts_are_saved_lazily(store):
+    service = OtpService()
+    code = service.issue("reset")
+    service.verify("reset", wrong(code))
+    # A wrong guess changes only the count in memory...
+    assert OtpService().attempts_left("reset") == otp.MAX_ATTEMPTS
+    # ...until the next flush (at exit) or issue().
+    service.flush()
+    assert OtpService().attempts_left("reset") == otp.MAX_ATTEMPTS - 1
@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+import pawfeeder.credentials as credentials_module
+import pawfeeder.session as session_module
+from pawfeeder.session import SESSION_KEY, SessionTokens
+from pawfeeder.state import StateStore
+
+HOUR = 3600
+
+
+@pytest.fixture
+def state(workdir, monkeypatch):
+    state = StateStore()
+    monkeypatch.setattr(credentials_module, "state", state)
+    monkeypatch.setattr(session_module, "state", state)
+    # A stored PIN is all resume() needs from the credentials.
+    state.set(credentials_module.PIN_KEY, {"hash": b"x", "set_at": time.time()})
+    return state
+
+
+def tokens(workdir, lifetime):
+    return SessionTokens(lifetime=lifetime, key_file=str(workdir / "home" / "session.key"))
+
+
+def test_sessions_are_off_by_default():
+    assert session_module.SESSION_LIFETIME == 0
+    assert not session_module.KEY_FILE.startswith("pkl")
+
+
+def test_no_token_is_saved_when_off(state, workdir):
+    tokens(workdir, 0).issue()
+    assert state.get(SESSION_KEY) is None
+
+
+def test_token_resumes_the_login(state, workdir):
+    tokens(workdir, HOUR).issue()
+    assert tokens(workdir, HOUR).resume()
+    assert os.stat(workdir / "home" / "session.key").st_mode & 0o077 == 0
+
+
+def test_token_is_dropped_once_sessions_are_off(state, workdir):
+    tokens(workdir, HOUR).issue()
+    assert not tokens(workdir, 0).resume()
+    assert state.get(SESSION_KEY) is None
+
+
+def test_token_from_another_key_is_rejected(state, workdir):
+    tokens(workdir, HOUR).issue()
+    other = SessionTokens(lifetime=HOUR, key_file=str(workdir / "other.key"))
+    assert not other.resume()
+    assert other.rejected == 1
+    assert state.get(SESSION_KEY) is None
+
+
+def test_new_pin_ends_the_session(state, workdir):
+    tokens(workdir, HOUR).issue()
+    state.set(credentials_module.PIN_KEY, {"hash": b"y", "set_at": time.time() + 1})
+    assert not tokens(workdir, HOUR).resume()
+
+
+def test_expired_token_is_removed(state, workdir):
+    session = tokens(workdir, HOUR)
+    session.issue()
+    session.lifetime = 0.01
+    time.sleep(0.02)
+    assert not session.resume()
+    assert session.expired == 1
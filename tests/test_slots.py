@@ -0,0 +1,68 @@
+import pytest
+
+from pawfeeder.slots import DEFAULT_SLOTS, SlotModel
+
+
+def set_slot(model, index, time, grams=""):
+    hm, ampm = time.split()
+    hour, minute = hm.split(":")
+    model.update(index, active=True, hour=hour, minute=minute, ampm=ampm, grams=grams)
+
+
+def test_new_model_is_empty_and_valid():
+    model = SlotModel()
+    assert len(model) == DEFAULT_SLOTS
+    assert model.is_empty()
+    assert model.valid
+
+
+def test_incomplete_time_is_an_error():
+    model = SlotModel()
+    model.update(1, active=True, hour="7")
+    assert model.first_error() == "Please set a complete time for Time 2!"
+    model.update(1, minute="30", ampm="AM")
+    assert model.valid
+
+
+def test_invalid_time_is_an_error():
+    model = SlotModel()
+    set_slot(model, 0, "13:00 PM")
+    assert model.first_error() == "Time 1 is not a valid time."
+
+
+@pytest.mark.parametrize("grams", ["0", "-5", "lots", "nan", "inf", "-inf"])
+def test_bad_portion_is_an_error(grams):
+    model = SlotModel()
+    set_slot(model, 0, "7:00 AM", grams)
+    assert model.first_error() == "The portion for Time 1 must be a number of grams."
+
+
+def test_inactive_slots_are_not_checked():
+    model = SlotModel()
+    model.update(0, hour="7")
+    assert model.valid
+    assert not model.is_empty()
+
+
+def test_removing_a_slot_renumbers_the_errors():
+    model = SlotModel()
+    set_slot(model, 0, "7:00 AM")
+    model.update(2, active=True, hour="9")
+    model.remove(0)
+    assert model.errors == {1: "Please set a complete time for Time 2!"}
+
+
+def test_entries_are_sorted_and_deduplicated():
+    model = SlotModel()
+    set_slot(model, 0, "6:30 PM", "40")
+    set_slot(model, 1, "7:05 AM")
+    set_slot(model, 2, "6:30 PM", "10")
+    index = model.add()
+    set_slot(model, index, "12:00 AM", "25.5")
+    entries, duplicates = model.entries()
+    assert entries == [
+        ("00:00:00", 25.5, "12:00 AM"),
+        ("07:05:00", None, "7:05 AM"),
+        ("18:30:00", 40.0, "6:30 PM"),
+    ]
+    assert duplicates == 1
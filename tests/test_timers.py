@@ -0,0 +1,115 @@
+import pytest
+
+from pawfeeder.timers import TimerWheel
+
+
+class FakeRoot:
+    """Just enough of a Tk widget for the wheel: after chains and bindings."""
+
+    def __init__(self, path="."):
+        self.path = path
+        self.pending = {}
+        self.bindings = []
+        self._ids = 0
+
+    def _root(self):
+        return self
+
+    def __str__(self):
+        return self.path
+
+    def after(self, delay_ms, func):
+        self._ids += 1
+        self.pending[self._ids] = func
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def bind(self, sequence, func, add=None):
+        self.bindings.append(func)
+
+    def destroy(self):
+        event = type("Event", (), {"widget": self.path})()
+        for func in self.bindings:
+            func(event)
+
+
+@pytest.fixture
+def wheel():
+    return TimerWheel(tick_ms=10, slots=8)
+
+
+def advance(wheel, root, ms):
+    """Move the wheel's clock on by ms and run the pending wake-up."""
+    wheel._origin -= ms / 1000
+    for after_id in list(root.pending):
+        root.pending.pop(after_id)()
+
+
+def test_one_shot_fires_once(wheel):
+    root, calls = FakeRoot(), []
+    wheel.after(root, 30, calls.append, "x")
+    advance(wheel, root, 10)
+    assert calls == []
+    advance(wheel, root, 30)
+    assert calls == ["x"]
+    advance(wheel, root, 100)
+    assert calls == ["x"]
+    assert wheel.stats()["live"] == 0
+
+
+def test_timer_waits_its_rounds(wheel):
+    # 8 slots of 10 ms: a 250 ms timer shares a slot with earlier ticks.
+    root, calls = FakeRoot(), []
+    wheel.after(root, 250, calls.append, "late")
+    for _ in range(4):
+        advance(wheel, root, 50)
+        assert calls == []
+    advance(wheel, root, 60)
+    assert calls == ["late"]
+
+
+def test_periodic_skips_missed_runs(wheel):
+    root, calls = FakeRoot(), []
+    wheel.every(root, 50, calls.append, "tick")
+    advance(wheel, root, 55)
+    assert calls == ["tick"]
+    # A stall of four intervals runs once and counts the rest as skipped.
+    advance(wheel, root, 200)
+    assert calls == ["tick"] * 2
+    assert wheel.stats()["skipped"] == 3
+
+
+def test_cancel(wheel):
+    root, calls = FakeRoot(), []
+    timer = wheel.after(root, 20, calls.append, "x")
+    timer.cancel()
+    timer.cancel()
+    advance(wheel, root, 50)
+    assert calls == []
+    assert wheel.stats()["live"] == 0
+    assert wheel.stats()["cancelled"] == 1
+
+
+def test_destroying_the_owner_cancels_its_timers(wheel):
+    root, calls = FakeRoot(), []
+    wheel.every(root, 20, calls.append, "x")
+    root.destroy()
+    advance(wheel, root, 50)
+    assert calls == []
+    assert wheel.stats()["live"] == 0
+
+
+def test_timers_of_an_old_root_are_dropped(wheel):
+    old, new = FakeRoot(), FakeRoot()
+    stale = [wheel.after(old, 20, print), wheel.every(old, 20, print)]
+    current = wheel.after(new, 20, print)
+    for timer in stale:
+        timer.cancel()
+    assert wheel.stats()["live"] == 1
+    # The old root's Destroy, for a widget with the same path, is ignored.
+    old.destroy()
+    assert current.active
+    new.destroy()
+    assert wheel.stats()["live"] == 0
@@ -0,0 +1,117 @@
+import os
+
+import pytest
+
+from pawfeeder.storage import load_data, save_data
+from pawfeeder.writebehind import WriteBehindStore, read_journal
+
+HOUR = 3600
+
+
+@pytest.fixture
+def stores(workdir):
+    """Opens stores on pkl/ and closes them after the test."""
+    opened = []
+
+    def open_store(delay=HOUR):
+        store = WriteBehindStore("pkl", delay=delay)
+        opened.append(store)
+        return store
+
+    yield open_store
+    for store in opened:
+        if not store._closed:   # crash() already stopped it
+            store.close()
+
+
+def crash(store):
+    """Leave the store's journal behind as a process that died would."""
+    with store._lock:
+        store._closed = True
+        store._wake.notify()
+        store._journal.close()
+        store._journal = None
+    store._writer.join()
+    # Dropping the journal lock is what the OS does when a process dies.
+    store._journal_lock.close()
+    store._journal_lock = None
+
+
+def test_update_is_saved_on_flush(stores):
+    store = stores()
+    store.update("pkl/a.pkl", "x", 1)
+    assert not os.path.exists("pkl/a.pkl")
+    assert store.flush(timeout=5)
+    assert load_data("pkl/a.pkl") == {"x": 1}
+
+
+def test_get_does_not_cache_the_default(stores):
+    store = stores()
+    assert store.get("pkl/a.pkl", {}) == {}
+    save_data({"x": 1}, "pkl/a.pkl")
+    assert store.get("pkl/a.pkl", {}) == {"x": 1}
+
+
+def test_journal_of_a_dead_store_is_replayed(stores):
+    first = stores()
+    first.update("pkl/a.pkl", "x", 1)
+    first.update("pkl/a.pkl", "y", 2)
+    first.put("pkl/b.pkl", [1, 2, 3])
+    crash(first)
+    assert not os.path.exists("pkl/a.pkl")
+
+    second = stores()
+    assert second.get("pkl/a.pkl") == {"x": 1, "y": 2}
+    assert second.get("pkl/b.pkl") == [1, 2, 3]
+    # Recovered changes are saved right away and the journal removed.
+    assert load_data("pkl/a.pkl") == {"x": 1, "y": 2}
+    assert not os.path.exists(first.journal_file)
+
+
+def test_torn_last_record_is_skipped(stores):
+    first = stores()
+    first.update("pkl/a.pkl", "x", 1)
+    crash(first)
+    with open(first.journal_file, "ab") as f:
+        f.write(b"\x80\x04\x95")    # a record cut off mid-append
+    assert len(read_journal(first.journal_file)) == 1
+
+    assert stores().get("pkl/a.pkl") == {"x": 1}
+
+
+def test_journal_of_a_running_store_is_left_alone(stores):
+    first = stores()
+    first.update("pkl/a.pkl", "x", 1)
+    second = stores()
+    assert second.get("pkl/a.pkl") is None
+    assert os.path.exists(first.journal_file)
+
+
+def test_key_updates_of_two_stores_are_merged(stores):
+    first, second = stores(), stores()
+    second.update("pkl/a.pkl", "b", 2)
+    first.update("pkl/a.pkl", "a", 1)
+    assert first.flush(timeout=5)
+    assert second.flush(timeout=5)
+    assert load_data("pkl/a.pkl") == {"a": 1, "b": 2}
+    assert second.stats()["merges"] == 1
+
+
+def test_put_does_not_overwrite_a_newer_write(stores):
+    first, second = stores(), stores()
+    second.put("pkl/a.pkl", {"old": True})
+    first.update("pkl/a.pkl", "new", True)
+    assert first.flush(timeout=5)
+    assert second.flush(timeout=5)
+    assert load_data("pkl/a.pkl") == {"new": True}
+    assert second.stats()["refused"] == 1
+    assert second.get("pkl/a.pkl") == {"new": True}
+
+
+def test_close_removes_the_journal(stores):
+    store = stores()
+    store.update("pkl/a.pkl", "x", 1)
+    journal = store.journal_file
+    store.close()
+    assert not os.path.exists(journal)
+    assert load_data("pkl/a.pkl") == {"x": 1}